@@ -22,7 +22,8 @@ WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEM
 COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
-from queue import PriorityQueue as QueueP
+import functools
+import itertools
 
 
 def is_in(elt, seq):
@@ -30,6 +31,26 @@ def is_in(elt, seq):
     return any(x is elt for x in seq)
 
 
+def memoize(fn, slot=None, maxsize=32):
+    """Memoize fn: make it remember the computed value for any argument list.
+    If slot is specified, store result in that slot of first argument.
+    If slot is false, use lru_cache for caching the values."""
+    if slot:
+        def memoized_fn(obj, *args):
+            if hasattr(obj, slot):
+                return getattr(obj, slot)
+            else:
+                val = fn(obj, *args)
+                setattr(obj, slot, val)
+                return val
+    else:
+        @functools.lru_cache(maxsize=maxsize)
+        def memoized_fn(*args):
+            return fn(*args)
+
+    return memoized_fn
+
+
 class Problem:
     """The abstract class for a formal problem. You should subclass
     this and implement the methods actions and result, and possibly
@@ -155,10 +176,18 @@ class PriorityQueue:
     order) is returned first.
     If order is 'min', the item with minimum f(x) is
     returned first; if order is 'max', then it is the item with maximum f(x).
-    Also supports dict-like lookup."""
+    Also supports dict-like lookup.
+
+    Implemented as an indexed binary heap: a dict maps every queued item to its
+    position in the heap, so membership and lookup are O(1) and removal and
+    decrease-key are O(log n). Items that compare equal (nodes with the same
+    state) share one entry, ties in f are popped in insertion order and there
+    is no locking, so a queue must not be shared between threads."""
 
     def __init__(self, order='min', f=lambda x: x):
-        self.heap = QueueP()
+        self.heap = []  # entries [(f(item), insertion count), item]
+        self.index = {}
+        self.counter = itertools.count()
         if order == 'min':
             self.f = f
         elif order == 'max':  # now item with max f(x)
@@ -166,49 +195,171 @@ class PriorityQueue:
         else:
             raise ValueError("Order must be either 'min' or 'max'.")
 
+    def _sift_up(self, position):
+        """Move the entry at position towards the root until its parent is not larger."""
+        heap, index = self.heap, self.index
+        entry = heap[position]
+        while position:
+            parent = (position - 1) >> 1
+            parent_entry = heap[parent]
+            if not entry[0] < parent_entry[0]:
+                break
+            heap[position] = parent_entry
+            index[parent_entry[1]] = position
+            position = parent
+        heap[position] = entry
+        index[entry[1]] = position
+        return position
+
+    def _sift_down(self, position):
+        """Move the entry at position towards the leaves until no child is smaller."""
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[position]
+        child = 2 * position + 1
+        while child < size:
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            child_entry = heap[child]
+            if not child_entry[0] < entry[0]:
+                break
+            heap[position] = child_entry
+            index[child_entry[1]] = position
+            position = child
+            child = 2 * position + 1
+        heap[position] = entry
+        index[entry[1]] = position
+
+    def _replace(self, position, item, value):
+        """Put item with a new value in the entry at position and restore the heap order."""
+        entry = self.heap[position]
+        del self.index[entry[1]]
+        entry[0] = (value, next(self.counter))
+        entry[1] = item
+        self.index[item] = position
+        self._sift_down(self._sift_up(position))
+
+    def _remove(self, position):
+        """Remove the entry at position, filling the gap with the last entry."""
+        heap = self.heap
+        del self.index[heap[position][1]]
+        last = heap.pop()
+        if position < len(heap):
+            heap[position] = last
+            self._sift_down(self._sift_up(position))
+
     def append(self, item):
-        """Insert item at its correct position."""
-        self.heap.put((self.f(item), item))
+        """Insert item at its correct position. If an equal item is already
+        queued, it is replaced by item with the new f value."""
+        value = self.f(item)
+        position = self.index.get(item)
+        if position is not None:
+            self._replace(position, item, value)
+            return
+        self.heap.append([(value, next(self.counter)), item])
+        self._sift_up(len(self.heap) - 1)
 
     def extend(self, items):
         """Insert each item in items at its correct position."""
         for item in items:
             self.append(item)
 
+    def decrease_key(self, item):
+        """Replace the queued item equal to item if item has a better f value.
+        Return True if it was replaced. Raises KeyError if no equal item is queued."""
+        position = self.index.get(item)
+        if position is None:
+            raise KeyError(str(item) + " is not in the priority queue")
+        value = self.f(item)
+        if not value < self.heap[position][0][0]:
+            return False
+        self._replace(position, item, value)
+        return True
+
     def pop(self):
         """Pop and return the item (with min or max f(x) value)
-        depending on the order."""
-        if self.heap:
-            return self.heap.get()
-        else:
+        depending on the order, as a tuple (f(x), x)."""
+        if not self.heap:
             raise Exception('Trying to pop from empty PriorityQueue.')
+        entry = self.heap[0]
+        self._remove(0)
+        return entry[0][0], entry[1]
 
     def peek(self):
-        """Peek the next item (with min or max f(x) value)"""
+        """Peek the next item (with min or max f(x) value), as a tuple (f(x), x)."""
         if self.heap:
-            return self.heap.queue[0]
+            entry = self.heap[0]
+            return entry[0][0], entry[1]
         else:
             raise Exception('Trying to peek from empty PriorityQueue.')
 
     def __len__(self):
         """Return current capacity of PriorityQueue."""
-        return self.heap.qsize()
+        return len(self.heap)
 
     def __contains__(self, key):
         """Return True if the key is in PriorityQueue."""
-        return any([item == key for _, item in self.heap.queue])
+        return key in self.index
 
     def __getitem__(self, key):
-        """Returns the first value associated with key in PriorityQueue.
+        """Returns the value associated with key in PriorityQueue.
         Raises KeyError if key is not present."""
-        for value, item in self.heap.queue:
-            if item == key:
-                return value
-        raise KeyError(str(key) + " is not in the priority queue")
+        position = self.index.get(key)
+        if position is None:
+            raise KeyError(str(key) + " is not in the priority queue")
+        return self.heap[position][0][0]
 
     def __delitem__(self, key):
-        """Delete the first occurrence of key."""
-        try:
-            del self.heap.queue[[item == key for _, item in self.heap.queue].index(True)]
-        except ValueError:
+        """Delete the item equal to key."""
+        position = self.index.get(key)
+        if position is None:
             raise KeyError(str(key) + " is not in the priority queue")
+        self._remove(position)
+
+
+# ______________________________________________________________________________
+# Informed (Heuristic) Search
+
+
+def best_first_graph_search(problem, f, display=False, node=None, explored=None):
+    """Search the nodes with the lowest f scores first.
+    You specify the function f(node) that you want to minimize; for example,
+    if f is a heuristic estimate to the goal, then we have greedy best
+    first search; if f is node.depth then we have breadth-first search.
+    There is a subtlety: the line "f = memoize(f, 'f')" means that the f
+    values will be cached on the nodes as they are computed. So after doing
+    a best first search you can examine the f values of the path returned.
+    The root node can be given to search with a Node subclass (its children
+    are built by its own child_node), and the expanded states are recorded in
+    explored when a set is given."""
+    f = memoize(f, 'f')
+    node = node or Node(problem.initial)
+    frontier = PriorityQueue('min', f)
+    frontier.append(node)
+    explored = set() if explored is None else explored
+    while frontier:
+        _, node = frontier.pop()
+        if problem.goal_test(node.state):
+            if display:
+                print(len(explored), "paths have been expanded and", len(frontier), "paths remain in the frontier")
+            return node
+        explored.add(node.state)
+        for child in node.expand(problem):
+            if child in frontier:
+                frontier.decrease_key(child)
+            elif child.state not in explored:
+                frontier.append(child)
+    return None
+
+
+def uniform_cost_search(problem, display=False, node=None, explored=None):
+    """[Figure 3.14]"""
+    return best_first_graph_search(problem, lambda n: n.path_cost, display, node, explored)
+
+
+def astar_search(problem, h=None, display=False, node=None, explored=None):
+    """A* search is best-first graph search with f(n) = g(n)+h(n).
+    You need to specify the h function when you call astar_search, or
+    else in your Problem subclass."""
+    h = memoize(h or problem.h, 'h')
+    return best_first_graph_search(problem, lambda n: n.path_cost + h(n), display, node, explored)
@@ -0,0 +1,198 @@
+"""
+Resultados cerrados para la Torre de Hanoi clásica de tres varillas: distancias óptimas y generación de secuencias
+óptimas de movimientos sin búsqueda.
+
+Los estados se describen con la varilla de cada disco (la posición i corresponde al disco i + 1), como la devuelve
+`StatesHanoi.get_disk_pegs`. En una solución óptima un disco que ya está en su varilla final y no tiene discos más
+grandes por mover nunca se mueve, y el disco más grande que debe moverse lo hace una o dos veces.
+"""
+
+
+def distance_to_tower(disk_pegs: list, number_of_disks: int, peg: int) -> int:
+    """
+    Calcula la cantidad mínima de movimientos para juntar los discos 1..m en una torre sobre una varilla.
+
+    Si el disco más grande ya está en la varilla se sigue con el siguiente. Si no, los discos más chicos tienen que
+    formar una torre en la varilla auxiliar antes de moverlo, y luego volver encima de él con 2^(m-1) - 1
+    movimientos más.
+
+    Args:
+        disk_pegs (list): Varilla de cada disco.
+        number_of_disks (int): Cantidad m de discos a juntar, empezando por el disco 1.
+        peg (int): Varilla destino.
+
+    Returns:
+        int: Cantidad mínima de movimientos.
+    """
+    distance = 0
+    for disk in range(number_of_disks, 0, -1):
+        current = disk_pegs[disk - 1]
+        if current != peg:
+            distance += 1 << (disk - 1)
+            peg = 3 - current - peg
+    return distance
+
+
+def largest_disk_to_move(start_pegs: list, goal_pegs: list) -> int:
+    """
+    Obtiene el disco más grande que no está en su varilla objetivo.
+
+    Args:
+        start_pegs (list): Varilla de cada disco en el estado inicial.
+        goal_pegs (list): Varilla de cada disco en el estado objetivo.
+
+    Returns:
+        int: Número del disco, o 0 si los estados son iguales.
+    """
+    for disk in range(len(start_pegs), 0, -1):
+        if start_pegs[disk - 1] != goal_pegs[disk - 1]:
+            return disk
+    return 0
+
+
+def _route_costs(start_pegs: list, goal_pegs: list, disk: int) -> tuple:
+    """
+    Calcula el costo de los dos caminos posibles para el disco más grande que debe moverse.
+
+    Args:
+        start_pegs (list): Varilla de cada disco en el estado inicial.
+        goal_pegs (list): Varilla de cada disco en el estado objetivo.
+        disk (int): Disco más grande que debe moverse.
+
+    Returns:
+        tuple: Movimientos si el disco se mueve una vez y si se mueve dos veces.
+    """
+    source, target = start_pegs[disk - 1], goal_pegs[disk - 1]
+    other = 3 - source - target
+    smaller = disk - 1
+    one_move = distance_to_tower(start_pegs, smaller, other) + 1 + distance_to_tower(goal_pegs, smaller, other)
+    two_moves = (distance_to_tower(start_pegs, smaller, target) + 1 + (1 << smaller) - 1 + 1 +
+                 distance_to_tower(goal_pegs, smaller, source))
+    return one_move, two_moves
+
+
+def optimal_distance(start_pegs: list, goal_pegs: list) -> int:
+    """
+    Calcula la distancia óptima entre dos estados legales.
+
+    Sea k el disco más grande que debe moverse, de la varilla s a la t, y r la tercera varilla. O bien k se mueve
+    una vez (los discos chicos pasan por r), o bien dos veces pasando por r (los discos chicos pasan primero por t
+    y luego por s). La distancia es el mínimo de los dos casos.
+
+    Args:
+        start_pegs (list): Varilla de cada disco en el estado inicial.
+        goal_pegs (list): Varilla de cada disco en el estado objetivo.
+
+    Returns:
+        int: Cantidad mínima de movimientos.
+    """
+    disk = largest_disk_to_move(start_pegs, goal_pegs)
+    if not disk:
+        return 0
+    return min(_route_costs(start_pegs, goal_pegs, disk))
+
+
+def tower_moves(number_of_disks: int, source: int, target: int):
+    """
+    Genera los movimientos clásicos para pasar una torre de discos 1..m de una varilla a otra.
+
+    El movimiento t (empezando en 1) mueve el disco d = (ceros finales de t) + 1, que en ese momento hace su
+    movimiento número t >> d. Cada disco recorre las varillas siempre en el mismo sentido, que depende de la
+    paridad de m - d, por lo que los movimientos se generan sin recursión y con memoria constante.
+
+    Args:
+        number_of_disks (int): Cantidad m de discos de la torre.
+        source (int): Varilla donde está la torre.
+        target (int): Varilla destino.
+
+    Yields:
+        tuple: (disco, varilla de entrada, varilla de salida).
+    """
+    other = 3 - source - target
+    cycles = ((source, target, other), (source, other, target))
+    for move in range(1, 1 << number_of_disks):
+        disk = (move & -move).bit_length()
+        cycle = cycles[(number_of_disks - disk) & 1]
+        turn = (move >> disk) % 3
+        yield disk, cycle[turn], cycle[(turn + 1) % 3]
+
+
+def gather_moves(disk_pegs: list, number_of_disks: int, peg: int):
+    """
+    Genera los movimientos óptimos para juntar los discos 1..m en una torre sobre una varilla.
+
+    Sigue la misma recursión que `distance_to_tower`, pero la desarma en una lista de a lo sumo m discos pivote:
+    primero se juntan los discos más chicos y al final se mueve el pivote más grande.
+
+    Args:
+        disk_pegs (list): Varilla de cada disco.
+        number_of_disks (int): Cantidad m de discos a juntar.
+        peg (int): Varilla destino.
+
+    Yields:
+        tuple: (disco, varilla de entrada, varilla de salida).
+    """
+    pivots = []
+    for disk in range(number_of_disks, 0, -1):
+        current = disk_pegs[disk - 1]
+        if current != peg:
+            other = 3 - current - peg
+            pivots.append((disk, current, peg, other))
+            peg = other
+    for disk, current, target, other in reversed(pivots):
+        yield disk, current, target
+        yield from tower_moves(disk - 1, other, target)
+
+
+def spread_moves(number_of_disks: int, peg: int, goal_pegs: list):
+    """
+    Genera los movimientos óptimos para llevar una torre de discos 1..m a la ubicación de un estado objetivo.
+
+    Args:
+        number_of_disks (int): Cantidad m de discos de la torre.
+        peg (int): Varilla donde está la torre.
+        goal_pegs (list): Varilla de cada disco en el estado objetivo.
+
+    Yields:
+        tuple: (disco, varilla de entrada, varilla de salida).
+    """
+    for disk in range(number_of_disks, 0, -1):
+        target = goal_pegs[disk - 1]
+        if target != peg:
+            other = 3 - peg - target
+            yield from tower_moves(disk - 1, peg, other)
+            yield disk, peg, target
+            peg = other
+
+
+def optimal_moves(start_pegs: list, goal_pegs: list):
+    """
+    Genera una secuencia óptima de movimientos entre dos estados legales sin hacer ninguna búsqueda.
+
+    Elige el caso de `optimal_distance` con menos movimientos y lo arma con `gather_moves`, `tower_moves` y
+    `spread_moves`. La memoria usada es O(n) sin importar la longitud de la secuencia.
+
+    Args:
+        start_pegs (list): Varilla de cada disco en el estado inicial.
+        goal_pegs (list): Varilla de cada disco en el estado objetivo.
+
+    Yields:
+        tuple: (disco, varilla de entrada, varilla de salida).
+    """
+    disk = largest_disk_to_move(start_pegs, goal_pegs)
+    if not disk:
+        return
+    source, target = start_pegs[disk - 1], goal_pegs[disk - 1]
+    other = 3 - source - target
+    smaller = disk - 1
+    one_move, two_moves = _route_costs(start_pegs, goal_pegs, disk)
+    if one_move <= two_moves:
+        yield from gather_moves(start_pegs, smaller, other)
+        yield disk, source, target
+        yield from spread_moves(smaller, other, goal_pegs)
+    else:
+        yield from gather_moves(start_pegs, smaller, target)
+        yield disk, source, other
+        yield from tower_moves(smaller, target, source)
+        yield disk, other, target
+        yield from spread_moves(smaller, source, goal_pegs)
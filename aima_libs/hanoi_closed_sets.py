@@ -0,0 +1,321 @@
+"""
+Estructuras alternativas para la lista cerrada y los mejores costos de las búsquedas.
+
+Un estado de n discos y k varillas tiene un código entre 0 y k^n - 1, así que cuando k^n es chico la lista cerrada
+puede ser un arreglo de bits y los mejores costos un arreglo de enteros, ambos indexados por código. Así se usa un
+bit y cuatro bytes por estado del espacio, en lugar de una entrada de tabla hash con un `StatesHanoi` por estado
+visitado.
+
+Cuando el espacio es demasiado grande incluso para eso, la lista cerrada puede ser un filtro de Bloom de tamaño fijo.
+El filtro nunca olvida un estado visitado, pero puede dar por visitado a uno nuevo y dejarlo sin explorar (una
+omisión), por lo que la búsqueda deja de ser completa y óptima a cambio de usar una cantidad fija de memoria. Los
+mejores costos se guardan entonces en una tabla de tamaño fijo que olvida estados cuando se llena, así que la lista
+abierta puede tener duplicados de los estados olvidados: su tamaño no está acotado por el de las tablas, aunque crece
+como el de una búsqueda con tabla hash mientras los estados pendientes entren en la tabla de costos.
+"""
+import math
+from array import array
+
+from aima_libs.hanoi_states import StatesHanoi
+
+# Memoria máxima de las estructuras densas; con más discos se usan conjuntos y diccionarios
+DENSE_MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Modos de almacenamiento que aceptan los motores de búsqueda
+MODES = ("hash", "dense", "bloom")
+
+# Tamaño por defecto del filtro de Bloom: 2^26 bits (8 MB) y 4 funciones de hash
+DEFAULT_BLOOM_BITS = 1 << 26
+DEFAULT_BLOOM_HASHES = 4
+
+# Casillas por defecto de la tabla de costos que acompaña al filtro de Bloom: 2^19 (8 MB)
+DEFAULT_BOUNDED_COST_SLOTS = 1 << 19
+
+_NO_COST = 0xFFFFFFFF
+
+
+def dense_fits(number_of_disks: int, number_of_pegs: int = 3) -> bool:
+    """
+    Indica si la lista cerrada y la tabla de costos densas de un problema entran en `DENSE_MEMORY_LIMIT`.
+
+    Args:
+        number_of_disks (int): Cantidad de discos.
+        number_of_pegs (int): Cantidad de varillas.
+
+    Returns:
+        bool: True si se pueden usar las estructuras densas.
+    """
+    size = number_of_pegs ** number_of_disks
+    return size // 8 + 1 + size * array("I").itemsize <= DENSE_MEMORY_LIMIT
+
+
+class CodeClosedSet(set):
+    """
+    Lista cerrada de tabla hash que guarda el código de cada estado en lugar del `StatesHanoi`.
+
+    Un entero ocupa mucho menos que un estado con sus varillas, y guardar solo el código deja liberar cada estado
+    cuando sale de la lista abierta.
+    """
+
+    def add(self, state: StatesHanoi):
+        set.add(self, state.code)
+
+    def __contains__(self, state: StatesHanoi):
+        return set.__contains__(self, state.code)
+
+
+class CodeCostTable(dict):
+    """
+    Tabla de mejores costos de tabla hash indexada por el código de cada estado, como `CodeClosedSet`.
+    """
+
+    def __contains__(self, state: StatesHanoi):
+        return dict.__contains__(self, state.code)
+
+    def __getitem__(self, state: StatesHanoi):
+        return dict.__getitem__(self, state.code)
+
+    def __setitem__(self, state: StatesHanoi, cost):
+        dict.__setitem__(self, state.code, cost)
+
+    def get(self, state: StatesHanoi, default=None):
+        return dict.get(self, state.code, default)
+
+
+class BitsetClosedSet:
+    """
+    Lista cerrada con un bit por estado, indexada por código.
+    """
+
+    def __init__(self, number_of_disks: int, number_of_pegs: int = 3):
+        self.bits = bytearray(number_of_pegs ** number_of_disks // 8 + 1)
+        self._size = 0
+
+    def add(self, state: StatesHanoi):
+        """
+        Agrega un estado al conjunto.
+        """
+        code = state.code
+        mask = 1 << (code & 7)
+        if not self.bits[code >> 3] & mask:
+            self.bits[code >> 3] |= mask
+            self._size += 1
+
+    def __contains__(self, state: StatesHanoi):
+        code = state.code
+        return bool(self.bits[code >> 3] & (1 << (code & 7)))
+
+    def __len__(self):
+        return self._size
+
+
+class DenseCostTable:
+    """
+    Mejores costos de camino con un entero sin signo de 32 bits por estado, indexados por código.
+
+    Los movimientos de la Torre de Hanoi cuestan 1, así que los costos son enteros.
+    """
+
+    def __init__(self, number_of_disks: int, number_of_pegs: int = 3):
+        self.costs = array("I", [_NO_COST]) * number_of_pegs ** number_of_disks
+        self._size = 0
+
+    def __contains__(self, state: StatesHanoi):
+        return self.costs[state.code] != _NO_COST
+
+    def __getitem__(self, state: StatesHanoi):
+        cost = self.costs[state.code]
+        if cost == _NO_COST:
+            raise KeyError(state)
+        return cost
+
+    def __setitem__(self, state: StatesHanoi, cost):
+        code = state.code
+        if self.costs[code] == _NO_COST:
+            self._size += 1
+        self.costs[code] = int(cost)
+
+    def get(self, state: StatesHanoi, default=None):
+        """
+        Obtiene el mejor costo de un estado, o `default` si todavía no se alcanzó.
+        """
+        cost = self.costs[state.code]
+        return default if cost == _NO_COST else cost
+
+    def __len__(self):
+        return self._size
+
+
+class BloomClosedSet:
+    """
+    Lista cerrada aproximada con un filtro de Bloom de tamaño fijo.
+
+    Las k posiciones de cada estado se obtienen por doble hash a partir de su hash de Zobrist, que ya está calculado
+    y no depende de la cantidad de discos.
+
+    Attributes:
+        number_of_bits (int): Cantidad m de bits del filtro.
+        number_of_hashes (int): Cantidad k de funciones de hash.
+        expected_omissions (float): Suma, sobre los estados agregados, de la probabilidad de falso positivo que
+            tenía el filtro al agregarlos. Aproxima la cantidad de estados nuevos que se dieron por visitados.
+    """
+
+    def __init__(self, number_of_bits: int = DEFAULT_BLOOM_BITS, number_of_hashes: int = DEFAULT_BLOOM_HASHES):
+        if number_of_bits < 1 or number_of_hashes < 1:
+            raise ValueError('El filtro de Bloom necesita al menos un bit y una función de hash')
+        self.number_of_bits = number_of_bits
+        self.number_of_hashes = number_of_hashes
+        self.bits = bytearray((number_of_bits + 7) // 8)
+        self.expected_omissions = 0.0
+        self._bits_set = 0
+        self._size = 0
+
+    def _positions(self, state: StatesHanoi):
+        """
+        Genera las posiciones de un estado en el filtro, por doble hashing: la primera posición y el paso salen de
+        partes distintas del hash completo, así que dos estados solo comparten todas sus posiciones si coinciden
+        en ambas.
+        """
+        number_of_bits = self.number_of_bits
+        hash_value = hash(state)
+        position = hash_value % number_of_bits
+        # Paso impar, que con m potencia de dos recorre k posiciones distintas; con m impar `| 1` puede dar m
+        step = ((hash_value // number_of_bits) % number_of_bits | 1) % number_of_bits or 1
+        for _ in range(self.number_of_hashes):
+            yield position
+            position = (position + step) % number_of_bits
+
+    def add(self, state: StatesHanoi):
+        """
+        Agrega un estado al filtro.
+        """
+        bits = self.bits
+        changed = False
+        for position in self._positions(state):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                self._bits_set += 1
+                changed = True
+        if changed:
+            self._size += 1
+            self.expected_omissions += self.false_positive_rate()
+
+    def __contains__(self, state: StatesHanoi):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(state))
+
+    def __len__(self):
+        return self._size
+
+    def false_positive_rate(self) -> float:
+        """
+        Estima la probabilidad de que el filtro dé por visitado a un estado nuevo.
+
+        Returns:
+            float: (bits en uno / m)^k.
+        """
+        return (self._bits_set / self.number_of_bits) ** self.number_of_hashes
+
+    def omission_probability(self) -> float:
+        """
+        Estima la probabilidad de que la búsqueda haya omitido al menos un estado.
+
+        Returns:
+            float: 1 - exp(-omisiones esperadas).
+        """
+        return -math.expm1(-self.expected_omissions)
+
+
+class BoundedCostTable:
+    """
+    Tabla de mejores costos de tamaño fijo, que acompaña a la lista cerrada de Bloom.
+
+    Es una tabla de acceso directo: cada estado va a la casilla que indica su hash de Zobrist y, si estaba ocupada
+    por otro estado, lo reemplaza. Un estado reemplazado se olvida y vuelve a entrar en la lista abierta si se lo
+    alcanza de nuevo, lo que cuesta una entrada de más pero no cambia el resultado. Mientras los estados alcanzados y
+    no expandidos entren en la tabla, cada uno entra una sola vez en la lista abierta por cada mejora de costo.
+
+    Cada casilla guarda el hash completo del estado para distinguirlo de los otros que caen en ella, así que dos
+    estados solo se confunden si tienen el mismo hash de 60 bits.
+    """
+
+    def __init__(self, number_of_slots: int = DEFAULT_BOUNDED_COST_SLOTS):
+        if number_of_slots < 1:
+            raise ValueError('La tabla de costos necesita al menos una casilla')
+        self.number_of_slots = number_of_slots
+        # Hash + 1 del estado de cada casilla, 0 si está vacía
+        self.keys = array('Q', bytes(8 * number_of_slots))
+        self.costs = array('d', bytes(8 * number_of_slots))
+        self._size = 0
+
+    def __contains__(self, state: StatesHanoi):
+        key = hash(state) + 1
+        return self.keys[key % self.number_of_slots] == key
+
+    def __getitem__(self, state: StatesHanoi):
+        key = hash(state) + 1
+        slot = key % self.number_of_slots
+        if self.keys[slot] != key:
+            raise KeyError(state)
+        return self.costs[slot]
+
+    def __setitem__(self, state: StatesHanoi, cost):
+        key = hash(state) + 1
+        slot = key % self.number_of_slots
+        if not self.keys[slot]:
+            self._size += 1
+        self.keys[slot] = key
+        self.costs[slot] = cost
+
+    def __len__(self):
+        return self._size
+
+
+def closed_set_for(number_of_disks: int, mode="hash", number_of_pegs: int = 3):
+    """
+    Crea la lista cerrada de una búsqueda.
+
+    Args:
+        number_of_disks (int): Cantidad de discos.
+        mode (str | BloomClosedSet): "hash" para un conjunto de códigos de estado, "dense" para un arreglo de bits
+            o "bloom" para un filtro de Bloom con el tamaño por defecto (la memoria de la lista abierta no queda
+            acotada; ver `BoundedCostTable`). Si las estructuras densas no entran en `DENSE_MEMORY_LIMIT` se usa un
+            conjunto de códigos. También se puede pasar un `BloomClosedSet` ya configurado.
+        number_of_pegs (int): Cantidad de varillas.
+
+    Returns:
+        CodeClosedSet | BitsetClosedSet | BloomClosedSet: Lista cerrada vacía.
+    """
+    if isinstance(mode, BloomClosedSet):
+        return mode
+    if mode not in MODES:
+        raise ValueError(f'Modo de almacenamiento desconocido: {mode}')
+    if mode == "bloom":
+        return BloomClosedSet()
+    if mode == "dense" and dense_fits(number_of_disks, number_of_pegs):
+        return BitsetClosedSet(number_of_disks, number_of_pegs)
+    return CodeClosedSet()
+
+
+def cost_table_for(number_of_disks: int, mode="hash", number_of_pegs: int = 3):
+    """
+    Crea la tabla de mejores costos de una búsqueda.
+
+    Args:
+        number_of_disks (int): Cantidad de discos.
+        mode (str | BloomClosedSet): "hash" para un diccionario por código de estado o "dense" para un arreglo de
+            enteros. Si las estructuras densas no entran en `DENSE_MEMORY_LIMIT` se usa un diccionario. Con un filtro
+            de Bloom se usa una `BoundedCostTable` de tamaño fijo.
+        number_of_pegs (int): Cantidad de varillas.
+
+    Returns:
+        CodeCostTable | DenseCostTable | BoundedCostTable: Tabla de costos vacía.
+    """
+    if isinstance(mode, BloomClosedSet) or mode == "bloom":
+        return BoundedCostTable()
+    if mode not in MODES:
+        raise ValueError(f'Modo de almacenamiento desconocido: {mode}')
+    if mode == "dense" and dense_fits(number_of_disks, number_of_pegs):
+        return DenseCostTable(number_of_disks, number_of_pegs)
+    return CodeCostTable()
@@ -0,0 +1,99 @@
+"""
+Algoritmo de Frame–Stewart para mover una torre con k varillas.
+
+Para mover una torre de n discos con k varillas se eligen t discos, se llevan los t más chicos a una varilla
+intermedia usando las k varillas, se mueven los n - t restantes al destino con las k - 1 varillas libres y se vuelven
+a poner los t discos encima usando otra vez las k varillas. Con el t que minimiza la cantidad de movimientos se
+obtiene una cota superior de la distancia óptima, que es exacta con tres varillas y se demostró exacta con cuatro.
+"""
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def _frame_stewart(number_of_disks: int, number_of_pegs: int) -> tuple:
+    """
+    Calcula la cantidad de movimientos de Frame–Stewart y la mejor división.
+
+    Args:
+        number_of_disks (int): Cantidad de discos de la torre.
+        number_of_pegs (int): Cantidad de varillas disponibles.
+
+    Returns:
+        tuple: Cantidad de movimientos (infinito si no se puede) y cantidad t de discos que van a la varilla
+        intermedia.
+    """
+    if number_of_disks == 0:
+        return 0, 0
+    if number_of_disks == 1:
+        return 1, 0
+    if number_of_pegs < 3:
+        return float("inf"), 0
+    best = (float("inf"), 0)
+    for split in range(number_of_disks - 1, 0, -1):
+        moves = 2 * _frame_stewart(split, number_of_pegs)[0] + _frame_stewart(number_of_disks - split,
+                                                                            number_of_pegs - 1)[0]
+        if moves < best[0]:
+            best = (moves, split)
+    return best
+
+
+def frame_stewart_number(number_of_disks: int, number_of_pegs: int) -> int:
+    """
+    Obtiene la cantidad de movimientos de Frame–Stewart para mover una torre.
+
+    Args:
+        number_of_disks (int): Cantidad de discos de la torre.
+        number_of_pegs (int): Cantidad de varillas, al menos 3.
+
+    Returns:
+        int: Cota superior de la distancia óptima entre dos torres.
+    """
+    if number_of_pegs < 3:
+        raise ValueError('Se necesitan al menos tres varillas')
+    return _frame_stewart(number_of_disks, number_of_pegs)[0]
+
+
+def _moves(smallest: int, number_of_disks: int, source: int, target: int, pegs: tuple):
+    """
+    Genera los movimientos de Frame–Stewart para los discos smallest + 1 .. smallest + number_of_disks.
+
+    Args:
+        smallest (int): Cantidad de discos más chicos que no participan.
+        number_of_disks (int): Cantidad de discos a mover.
+        source (int): Varilla donde está la torre.
+        target (int): Varilla destino.
+        pegs (tuple): Varillas que se pueden usar, incluidas source y target.
+
+    Yields:
+        tuple: (disco, varilla de entrada, varilla de salida).
+    """
+    if number_of_disks == 0:
+        return
+    if number_of_disks == 1:
+        yield smallest + 1, source, target
+        return
+    split = _frame_stewart(number_of_disks, len(pegs))[1]
+    intermediate = next(peg for peg in pegs if peg != source and peg != target)
+    yield from _moves(smallest, split, source, intermediate, pegs)
+    yield from _moves(smallest + split, number_of_disks - split, source, target,
+                      tuple(peg for peg in pegs if peg != intermediate))
+    yield from _moves(smallest, split, intermediate, target, pegs)
+
+
+def frame_stewart_moves(number_of_disks: int, source: int, target: int, number_of_pegs: int):
+    """
+    Genera los movimientos de Frame–Stewart para mover una torre completa entre dos varillas.
+
+    Args:
+        number_of_disks (int): Cantidad de discos de la torre.
+        source (int): Varilla donde está la torre.
+        target (int): Varilla destino.
+        number_of_pegs (int): Cantidad de varillas, al menos 3.
+
+    Yields:
+        tuple: (disco, varilla de entrada, varilla de salida).
+    """
+    if number_of_pegs < 3:
+        raise ValueError('Se necesitan al menos tres varillas')
+    if source != target:
+        yield from _moves(0, number_of_disks, source, target, tuple(range(number_of_pegs)))
@@ -0,0 +1,317 @@
+"""
+Búsqueda en anchura por fronteras con detección de duplicados en memoria externa.
+
+Como los movimientos de la Torre de Hanoi son reversibles, los vecinos de un estado de la capa k solo pueden estar
+en las capas k - 1, k o k + 1. Por eso alcanza con guardar las dos últimas capas para descartar duplicados, sin
+ningún conjunto de visitados.
+
+Cada capa es una secuencia de códigos int64 ordenados y sin repetidos, que pasa a un archivo en disco cuando no entra
+en su parte del presupuesto de memoria. La capa siguiente se arma en dos pasadas:
+
+1. La capa actual se expande por bloques. Los sucesores de cada bloque se ordenan y se guardan como una corrida.
+2. Las corridas se mezclan por ventanas de valores, quitando los estados de las capas k - 1 y k. Cada ventana lee
+   de cada secuencia solo los códigos menores a un corte elegido para que la ventana entre en el presupuesto.
+
+La memoria usada queda acotada por el presupuesto sin importar el tamaño de las capas.
+"""
+import collections
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from aima_libs import hanoi_numpy
+from aima_libs.hanoi_states import StatesHanoi
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Bytes por código en la mezcla: la ventana leída, su concatenación y la copia ordenada de np.unique
+_MERGE_BYTES_PER_RANK = 3 * 8
+
+FrontierSearchResult = collections.namedtuple(
+    "FrontierSearchResult", ["distance", "layer_sizes", "bytes_read", "bytes_written"])
+
+
+def _expansion_bytes_per_state(number_of_disks: int) -> int:
+    """
+    Estima la memoria que usa `successor_ranks` por cada estado expandido.
+
+    Args:
+        number_of_disks (int): Cantidad de discos.
+
+    Returns:
+        int: Bytes por estado, contando la decodificación, los sucesores y su copia ordenada.
+    """
+    return 10 * number_of_disks + 2 * 6 * 8 + 16
+
+
+class _SortedRanks:
+    """
+    Códigos int64 ordenados y sin repetidos, en memoria o en un archivo, que se leen por tramos.
+    """
+
+    def __init__(self, ranks: np.ndarray, on_disk: bool):
+        self.ranks = ranks
+        self.on_disk = on_disk
+        self.size = ranks.size
+        self.position = 0
+
+    def limit(self, count: int):
+        """
+        Obtiene el código que deja exactamente `count` códigos pendientes por debajo.
+
+        Args:
+            count (int): Cantidad máxima de códigos a leer.
+
+        Returns:
+            int: Código de corte, o None si quedan menos de `count` códigos.
+        """
+        if self.position + count < self.size:
+            return int(self.ranks[self.position + count])
+        return None
+
+    def read_below(self, cutoff: int) -> np.ndarray:
+        """
+        Lee los códigos pendientes menores a un corte.
+
+        Args:
+            cutoff (int): Código de corte.
+
+        Returns:
+            np.ndarray: Códigos leídos.
+        """
+        end = self.position + int(np.searchsorted(self.ranks[self.position:], cutoff))
+        block = np.array(self.ranks[self.position:end]) if self.on_disk else self.ranks[self.position:end]
+        self.position = end
+        return block
+
+
+class _Spool:
+    """
+    Secuencia de códigos que se guarda en memoria mientras es chica y pasa a un archivo cuando supera un tamaño.
+
+    En la Torre de Hanoi la mayoría de las capas tienen pocos estados, así que solo las capas grandes y sus corridas
+    llegan a disco.
+    """
+
+    def __init__(self, search: "FrontierSearch", path: str):
+        self.search = search
+        self.path = path
+        self.blocks = []
+        self.size = 0
+        self.on_disk = False
+
+    def append(self, ranks: np.ndarray):
+        """
+        Agrega códigos al final de la secuencia.
+        """
+        self.size += ranks.size
+        if not self.on_disk and self.size > self.search.spill_size:
+            self.blocks.append(ranks)
+            ranks = np.concatenate(self.blocks)
+            self.blocks = []
+            self.on_disk = True
+        if self.on_disk:
+            with open(self.path, "ab") as file:
+                ranks.tofile(file)
+            self.search.bytes_written += ranks.nbytes
+        else:
+            self.blocks.append(ranks)
+
+    def reader(self) -> _SortedRanks:
+        """
+        Abre la secuencia para leerla por tramos.
+        """
+        if self.on_disk:
+            ranks = np.memmap(self.path, dtype=np.int64, mode="r")
+        else:
+            ranks = np.concatenate(self.blocks) if self.blocks else np.empty(0, dtype=np.int64)
+        return _SortedRanks(ranks, self.on_disk)
+
+    def discard(self):
+        """
+        Libera la secuencia y borra su archivo.
+        """
+        self.blocks = []
+        if self.on_disk:
+            os.remove(self.path)
+            self.on_disk = False
+
+
+class FrontierSearch:
+    """
+    Búsqueda en anchura de un problema de Hanoi guardando solo las dos últimas capas.
+
+    Attributes:
+        number_of_disks (int): Cantidad de discos.
+        memory_budget (int): Memoria máxima en bytes.
+        directory (str): Directorio de trabajo de las capas y corridas.
+        bytes_read (int): Bytes leídos de disco.
+        bytes_written (int): Bytes escritos en disco.
+    """
+
+    def __init__(self, number_of_disks: int, memory_budget: int = DEFAULT_MEMORY_BUDGET, directory: str = None):
+        """
+        Prepara una búsqueda.
+
+        La mitad del presupuesto se reparte entre los bloques de expansión y las ventanas de mezcla, y la otra mitad
+        entre las cuatro secuencias que pueden estar en memoria a la vez: las dos capas anteriores, las corridas y
+        la capa nueva.
+
+        Args:
+            number_of_disks (int): Cantidad de discos.
+            memory_budget (int): Memoria máxima en bytes.
+            directory (str): Directorio de trabajo. Si no se indica se usa uno temporal que se borra al terminar.
+        """
+        if number_of_disks > hanoi_numpy.MAX_DISKS:
+            raise ValueError(f'No se pueden codificar más de {hanoi_numpy.MAX_DISKS} discos en int64')
+        self.number_of_disks = number_of_disks
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self.chunk_size = max(1, memory_budget // 2 // _expansion_bytes_per_state(number_of_disks))
+        self.window_size = max(1, memory_budget // 2 // _MERGE_BYTES_PER_RANK)
+        self.spill_size = max(1, memory_budget // 2 // 4 // 8)
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def _read(self, block: np.ndarray, source: _SortedRanks) -> np.ndarray:
+        """
+        Cuenta los bytes leídos de disco.
+        """
+        if source.on_disk:
+            self.bytes_read += block.nbytes
+        return block
+
+    def _expand(self, layer: _Spool, runs: _Spool) -> list:
+        """
+        Expande una capa por bloques, agregando los sucesores ordenados de cada bloque como una corrida.
+
+        Args:
+            layer (_Spool): Capa a expandir.
+            runs (_Spool): Secuencia donde se guardan las corridas una detrás de otra.
+
+        Returns:
+            list: Tamaño de cada corrida.
+        """
+        source = layer.reader()
+        run_sizes = []
+        for start in range(0, source.size, self.chunk_size):
+            block = self._read(np.array(source.ranks[start:start + self.chunk_size]), source)
+            successors = hanoi_numpy.successor_ranks(block, self.number_of_disks).ravel()
+            run = np.unique(successors[successors >= 0])
+            runs.append(run)
+            run_sizes.append(run.size)
+        return run_sizes
+
+    def _merge(self, runs: _Spool, run_sizes: list, exclude: list, layer: _Spool, goal_rank: int) -> bool:
+        """
+        Mezcla las corridas en la capa siguiente, sin repetidos y sin los estados de las capas excluidas.
+
+        Args:
+            runs (_Spool): Corridas, una detrás de otra.
+            run_sizes (list): Tamaño de cada corrida.
+            exclude (list): Capas anteriores.
+            layer (_Spool): Capa nueva.
+            goal_rank (int): Código del objetivo, o None.
+
+        Returns:
+            bool: Si la capa nueva contiene al objetivo.
+        """
+        all_runs = runs.reader()
+        sources = []
+        start = 0
+        for size in run_sizes:
+            sources.append(_SortedRanks(all_runs.ranks[start:start + size], all_runs.on_disk))
+            start += size
+        excluded_sources = [previous.reader() for previous in exclude]
+        share = max(1, self.window_size // (len(sources) + len(excluded_sources)))
+        found = False
+        while any(source.position < source.size for source in sources):
+            limits = [source.limit(share) for source in sources + excluded_sources]
+            limits = [limit for limit in limits if limit is not None]
+            cutoff = min(limits) if limits else 3 ** self.number_of_disks
+            window = [self._read(source.read_below(cutoff), source) for source in sources]
+            excluded = [self._read(source.read_below(cutoff), source) for source in excluded_sources]
+            merged = np.unique(np.concatenate(window))
+            if excluded:
+                merged = merged[~np.isin(merged, np.concatenate(excluded), assume_unique=True)]
+            if goal_rank is not None and not found:
+                position = np.searchsorted(merged, goal_rank)
+                found = bool(position < merged.size and merged[position] == goal_rank)
+            if merged.size:
+                layer.append(merged)
+        return found
+
+    def run(self, initial_state: StatesHanoi, goal_state: StatesHanoi = None) -> FrontierSearchResult:
+        """
+        Recorre el espacio de estados en anchura desde un estado inicial.
+
+        Args:
+            initial_state (StatesHanoi): Estado inicial.
+            goal_state (StatesHanoi): Estado objetivo. Si se indica, la búsqueda termina en la capa que lo contiene;
+                si no, recorre todos los estados alcanzables.
+
+        Returns:
+            FrontierSearchResult: Distancia al objetivo (None si no se indicó o no se alcanzó), tamaño de cada capa
+            y bytes leídos y escritos.
+        """
+        if initial_state.number_of_pegs != 3:
+            raise ValueError('La búsqueda por fronteras solo admite tres varillas')
+        directory = self.directory or tempfile.mkdtemp(prefix="hanoi_frontera_")
+        os.makedirs(directory, exist_ok=True)
+        goal_rank = goal_state.code if goal_state is not None else None
+        current = _Spool(self, os.path.join(directory, "capa_0.bin"))
+        current.append(np.array([initial_state.code], dtype=np.int64))
+        layers = [current]
+        layer_sizes = [1]
+        distance = 0 if goal_rank == initial_state.code else None
+        try:
+            while distance is None:
+                depth = len(layer_sizes)
+                start_time = time.perf_counter()
+                runs = _Spool(self, os.path.join(directory, f"corridas_{depth}.bin"))
+                run_sizes = self._expand(layers[-1], runs)
+                following = _Spool(self, os.path.join(directory, f"capa_{depth}.bin"))
+                found = self._merge(runs, run_sizes, layers, following, goal_rank)
+                runs.discard()
+                if len(layers) == 2:
+                    layers.pop(0).discard()
+                layers.append(following)
+                if not following.size:
+                    break
+                layer_sizes.append(following.size)
+                if following.on_disk:
+                    logger.info(f"Capa {depth}: {following.size} estados en {time.perf_counter() - start_time:.3f}s "
+                                f"({len(run_sizes)} corridas, {self.bytes_read} bytes leídos, "
+                                f"{self.bytes_written} bytes escritos)")
+                if found:
+                    distance = depth
+        finally:
+            for layer in layers:
+                layer.discard()
+            if self.directory is None:
+                shutil.rmtree(directory, ignore_errors=True)
+        return FrontierSearchResult(distance, layer_sizes, self.bytes_read, self.bytes_written)
+
+
+def frontier_search(initial_state: StatesHanoi, goal_state: StatesHanoi = None,
+                    memory_budget: int = DEFAULT_MEMORY_BUDGET, directory: str = None) -> FrontierSearchResult:
+    """
+    Búsqueda en anchura por fronteras con las capas en disco.
+
+    Args:
+        initial_state (StatesHanoi): Estado inicial.
+        goal_state (StatesHanoi): Estado objetivo, o None para recorrer todo el espacio.
+        memory_budget (int): Memoria máxima en bytes.
+        directory (str): Directorio de trabajo, o None para usar uno temporal.
+
+    Returns:
+        FrontierSearchResult: Distancia, tamaño de cada capa y volumen de entrada/salida.
+    """
+    search = FrontierSearch(initial_state.number_of_disks, memory_budget, directory)
+    return search.run(initial_state, goal_state)
@@ -0,0 +1,379 @@
+"""
+A* distribuido por hash (HDA*) entre varios procesos.
+
+Cada estado tiene un proceso dueño, elegido por su hash de Zobrist módulo la cantidad de procesos, que es el único que
+lo guarda en su lista abierta y en su tabla de mejores costos. Un proceso expande sus estados como un A* común y manda
+cada sucesor a su dueño; los sucesores se juntan en lotes por destino para no pagar un mensaje por estado.
+
+- Cota: el primer proceso que saca el objetivo de su lista abierta anuncia su costo a los demás, y desde ese momento
+  ningún proceso expande ni envía estados con f mayor o igual a la mejor solución conocida.
+- Terminación: un proceso está inactivo si no tiene estados con f menor a la cota ni lotes sin enviar. El coordinador
+  hace dos rondas de consultas a todos los procesos y declara terminada la búsqueda cuando en las dos todos están
+  inactivos, los lotes enviados y recibidos coinciden y los contadores no cambiaron entre una ronda y la otra (método
+  de los cuatro contadores). En ese momento no queda ningún estado con f menor a la cota, así que con una heurística
+  admisible la mejor solución encontrada es óptima.
+- Camino: cada proceso guarda el padre del mejor camino a cada uno de sus estados, y el coordinador reconstruye la
+  solución preguntándole al dueño de cada estado por su padre, desde el objetivo hasta el estado inicial.
+"""
+import collections
+import heapq
+import itertools
+import math
+import multiprocessing
+import os
+import queue
+import traceback
+
+from aima_libs.hanoi_states import StatesHanoi, legal_actions
+
+DEFAULT_BATCH_SIZE = 64
+
+# Segundos que el coordinador espera un mensaje antes de comprobar que los procesos sigan vivos
+POLL_INTERVAL = 0.5
+
+HDAResult = collections.namedtuple("HDAResult", ["cost", "moves", "expanded", "messages"])
+
+
+class HDAWorkerError(RuntimeError):
+    """
+    Error de un proceso de HDA*: una excepción dentro del proceso (por ejemplo de la heurística), con su traza, o
+    un proceso que terminó sin avisar.
+    """
+
+
+class _Worker:
+    """
+    Proceso de HDA*: dueño de una parte de los estados, con su propia lista abierta y tabla de costos.
+    """
+
+    def __init__(self, index: int, inboxes: list, status, goal_state: StatesHanoi, evaluator, batch_size: int):
+        self.index = index
+        self.inboxes = inboxes
+        self.inbox = inboxes[index]
+        self.status = status
+        self.processes = len(inboxes)
+        self.goal_state = goal_state
+        self.number_of_disks = goal_state.number_of_disks
+        self.number_of_pegs = goal_state.number_of_pegs
+        self.evaluator = evaluator
+        self.batch_size = batch_size
+        self.open = []
+        self.best_g = {}
+        self.parents = {}
+        self.closed = {}
+        self.bound = math.inf
+        self.outgoing = [[] for _ in inboxes]
+        self.sent = 0
+        self.received = 0
+        self.expanded = 0
+        self.reported_idle = False
+        self.counter = itertools.count()
+        self.running = True
+
+    def _add(self, entry: tuple):
+        """
+        Agrega un estado propio si mejora el costo conocido.
+
+        Args:
+            entry (tuple): (f, g, h, código, hash, código del padre, disco, varilla de entrada, varilla de salida).
+        """
+        f, g, h, code, hash_value = entry[:5]
+        if f >= self.bound:
+            return
+        state = StatesHanoi.from_code(code, self.number_of_disks, g, hash_value, self.number_of_pegs)
+        if g >= self.best_g.get(state, math.inf):
+            return
+        self.best_g[state] = g
+        self.parents[code] = entry[5:]
+        heapq.heappush(self.open, (f, -g, next(self.counter), h, state))
+
+    def _send(self, destination: int):
+        """
+        Envía el lote acumulado para un proceso.
+        """
+        batch = self.outgoing[destination]
+        if batch:
+            self.inboxes[destination].put(("lote", batch))
+            self.outgoing[destination] = []
+            self.sent += 1
+
+    def _handle(self, message: tuple):
+        """
+        Procesa un mensaje de otro proceso o del coordinador.
+        """
+        kind = message[0]
+        if kind == "lote":
+            self.received += 1
+            self.reported_idle = False
+            for entry in message[1]:
+                self._add(entry)
+        elif kind == "cota":
+            self.bound = min(self.bound, message[1])
+        elif kind == "ping":
+            # Vuelve a avisar cuando quede inactivo, por si la ronda no alcanza para terminar
+            self.reported_idle = False
+            self.status.put(("pong", self.index, message[1], self.sent, self.received, not self._has_work()))
+        elif kind == "padre":
+            self.status.put(("padre", message[1], self.parents.get(message[1])))
+        elif kind == "fin":
+            self.status.put(("fin", self.index, self.expanded))
+            self.running = False
+
+    def _has_work(self) -> bool:
+        """
+        Indica si quedan estados con f menor a la cota o lotes sin enviar.
+        """
+        while self.open and self.open[0][0] < self.bound:
+            f, negative_g, _, _, state = self.open[0]
+            if -negative_g > self.best_g[state] or self.closed.get(state, math.inf) <= -negative_g:
+                heapq.heappop(self.open)
+                continue
+            return True
+        return any(self.outgoing)
+
+    def _expand(self):
+        """
+        Expande hasta `batch_size` estados propios y envía los lotes pendientes.
+        """
+        for _ in range(self.batch_size):
+            if not self._has_work() or not self.open or self.open[0][0] >= self.bound:
+                break
+            f, negative_g, _, h, state = heapq.heappop(self.open)
+            g = -negative_g
+            self.closed[state] = g
+            self.expanded += 1
+            if state == self.goal_state:
+                if g < self.bound:
+                    self.bound = g
+                    for destination, inbox in enumerate(self.inboxes):
+                        if destination != self.index:
+                            inbox.put(("cota", g))
+                    self.status.put(("solucion", self.index, g, state.code))
+                continue
+            code = state.code
+            for action in legal_actions(state.top_disks()):
+                child = action.execute(state)
+                child_g = g + action.cost
+                child_h = self.evaluator.delta(h, state, action, child)
+                child_f = child_g + child_h
+                if child_f >= self.bound:
+                    continue
+                entry = (child_f, child_g, child_h, child.code, hash(child), code, action.disk, action.rod_input,
+                         action.rod_out)
+                destination = hash(child) % self.processes
+                if destination == self.index:
+                    self._add(entry)
+                else:
+                    batch = self.outgoing[destination]
+                    batch.append(entry)
+                    if len(batch) >= self.batch_size:
+                        self._send(destination)
+        for destination in range(self.processes):
+            self._send(destination)
+
+    def run(self):
+        """
+        Bucle del proceso: atiende los mensajes, expande y avisa al coordinador cuando queda inactivo.
+        """
+        while self.running:
+            try:
+                self._handle(self.inbox.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            if self._has_work():
+                self._expand()
+                continue
+            if not self.reported_idle:
+                self.status.put(("inactivo", self.index, self.sent, self.received))
+                self.reported_idle = True
+            self._handle(self.inbox.get())
+
+
+def _worker_main(index: int, inboxes: list, status, goal_state: StatesHanoi, evaluator, batch_size: int):
+    try:
+        _Worker(index, inboxes, status, goal_state, evaluator, batch_size).run()
+    except BaseException:
+        # Se envía la traza como texto, porque la excepción podría no poder serializarse
+        status.put(("error", index, traceback.format_exc()))
+    # Los lotes que quedaron sin leer ya no sirven, y esperar a que se escriban bloquearía la salida del proceso
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+
+
+class _Coordinator:
+    """
+    Proceso principal de HDA*: siembra el estado inicial, detecta la terminación y reconstruye el camino.
+    """
+
+    def __init__(self, inboxes: list, status, workers: list):
+        self.inboxes = inboxes
+        self.status = status
+        self.workers = workers
+        self.finished = set()
+        self.processes = len(inboxes)
+        self.sent = 0
+        self.idle = {}
+        self.solution = (math.inf, None)
+        self.wave = 0
+        self.pongs = {}
+
+    def receive(self) -> tuple:
+        """
+        Espera el próximo mensaje de estado, comprobando cada `POLL_INTERVAL` segundos que los procesos que todavía
+        no terminaron sigan vivos.
+
+        Raises:
+            HDAWorkerError: Si un proceso informó una excepción o terminó sin avisar.
+        """
+        while True:
+            try:
+                message = self.status.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                dead = [index for index, worker in enumerate(self.workers)
+                        if index not in self.finished and not worker.is_alive()]
+                if not dead:
+                    continue
+                # Lo último que escribió el proceso antes de terminar ya está en la cola
+                try:
+                    message = self.status.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    raise HDAWorkerError(f'El proceso {dead[0]} de HDA* terminó con código '
+                                         f'{self.workers[dead[0]].exitcode}') from None
+            if message[0] == "error":
+                raise HDAWorkerError(f'Falló el proceso {message[1]} de HDA*:\n{message[2]}')
+            return message
+
+    def _handle(self, message: tuple):
+        """
+        Procesa un mensaje de estado de un proceso.
+        """
+        kind = message[0]
+        if kind == "inactivo":
+            self.idle[message[1]] = message[2:]
+        elif kind == "solucion":
+            self.solution = min(self.solution, (message[2], message[3]))
+        elif kind == "pong":
+            if message[2] == self.wave:
+                self.pongs[message[1]] = message[3:]
+
+    def _wave(self) -> tuple:
+        """
+        Consulta a todos los procesos y espera sus respuestas.
+
+        Returns:
+            tuple: Si todos estaban inactivos, y los totales de lotes enviados (incluido el del coordinador) y
+            recibidos.
+        """
+        self.wave += 1
+        self.pongs = {}
+        for inbox in self.inboxes:
+            inbox.put(("ping", self.wave))
+        while len(self.pongs) < self.processes:
+            self._handle(self.receive())
+        sent = self.sent + sum(pong[0] for pong in self.pongs.values())
+        received = sum(pong[1] for pong in self.pongs.values())
+        return all(pong[2] for pong in self.pongs.values()), sent, received
+
+    def wait_for_termination(self):
+        """
+        Espera hasta que no quede trabajo en ningún proceso ni lotes en tránsito.
+        """
+        while True:
+            self._handle(self.receive())
+            if len(self.idle) < self.processes:
+                continue
+            sent = self.sent + sum(counts[0] for counts in self.idle.values())
+            if sent != sum(counts[1] for counts in self.idle.values()):
+                continue
+            self.idle = {}
+            first = self._wave()
+            if first[0] and first[1] == first[2]:
+                second = self._wave()
+                if second == first:
+                    return
+
+    def parent(self, owner: int, code: int):
+        """
+        Pregunta al dueño de un estado por el padre de su mejor camino.
+        """
+        self.inboxes[owner].put(("padre", code))
+        while True:
+            message = self.receive()
+            if message[0] == "padre" and message[1] == code:
+                return message[2]
+            self._handle(message)
+
+
+def hda_star_search(initial_state: StatesHanoi, goal_state: StatesHanoi, evaluator, processes: int = None,
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> HDAResult:
+    """
+    Busca un camino óptimo con A* distribuido por hash entre varios procesos.
+
+    Args:
+        initial_state (StatesHanoi): Estado inicial.
+        goal_state (StatesHanoi): Estado objetivo.
+        evaluator: Heurística incremental con los métodos `inicial(estado)` y `delta(h, estado, acción, hijo)`
+            (ver `main.preparar_heuristica`). Se copia en cada proceso.
+        processes (int): Cantidad de procesos. Por defecto, la cantidad de CPUs.
+        batch_size (int): Cantidad de sucesores por lote y de expansiones entre lecturas de mensajes.
+
+    Returns:
+        HDAResult: Costo de la solución (None si no hay), movimientos (disco, varilla de entrada, varilla de salida),
+        estados expandidos por cada proceso y lotes enviados entre procesos.
+
+    Raises:
+        HDAWorkerError: Si un proceso falla. Los demás procesos se terminan antes de propagar el error.
+    """
+    processes = processes or os.cpu_count() or 1
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(processes)]
+    status = context.Queue()
+    workers = [context.Process(target=_worker_main, args=(index, inboxes, status, goal_state, evaluator, batch_size),
+                               daemon=True)
+               for index in range(processes)]
+    for worker in workers:
+        worker.start()
+    coordinator = _Coordinator(inboxes, status, workers)
+    failed = True
+    try:
+        h = evaluator.inicial(initial_state)
+        g = initial_state.accumulated_cost
+        inboxes[hash(initial_state) % processes].put(
+            ("lote", [(g + h, g, h, initial_state.code, hash(initial_state), None, 0, 0, 0)]))
+        coordinator.sent += 1
+        coordinator.wait_for_termination()
+
+        cost, _ = coordinator.solution
+        moves = []
+        if cost != math.inf:
+            code = goal_state.code
+            hash_value = hash(goal_state)
+            while True:
+                parent_code, disk, rod_input, rod_out = coordinator.parent(hash_value % processes, code)
+                if parent_code is None:
+                    break
+                moves.append((disk, rod_input, rod_out))
+                parent = StatesHanoi.from_code(parent_code, goal_state.number_of_disks, 0.0, None,
+                                               goal_state.number_of_pegs)
+                code, hash_value = parent_code, hash(parent)
+            moves.reverse()
+
+        for inbox in inboxes:
+            inbox.put(("fin",))
+        expanded = [0] * processes
+        while len(coordinator.finished) < processes:
+            message = coordinator.receive()
+            if message[0] == "fin":
+                expanded[message[1]] = message[2]
+                coordinator.finished.add(message[1])
+        messages = coordinator.sent + sum(pong[0] for pong in coordinator.pongs.values())
+        failed = False
+    finally:
+        for worker in workers:
+            if failed:
+                worker.terminate()
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+    return HDAResult(cost if cost != math.inf else None, moves, expanded, messages)
@@ -0,0 +1,261 @@
+"""
+Operaciones vectorizadas con NumPy sobre lotes de estados de la Torre de Hanoi: conversión de códigos, generación
+de sucesores y heurísticas.
+
+Los estados se representan por lotes, ya sea como un arreglo (N, n) con la varilla de cada disco (la columna i
+corresponde al disco i + 1) o como un arreglo (N,) con los códigos de `hanoi_states.encode_rods`.
+"""
+import numpy as np
+
+from aima_libs.hanoi_states import StatesHanoi
+
+# Con int64 se pueden codificar hasta 39 discos (3^39 < 2^63)
+MAX_DISKS = 39
+
+# Movimientos (varilla de entrada, varilla de salida) en el mismo orden que genera ProblemHanoi.actions
+MOVES = ((0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1))
+
+# Marcas del arreglo de movimientos padre de `layered_bfs`
+UNVISITED = 255
+ROOT = len(MOVES)
+
+# Cantidad de estados de una capa que se expanden por vez
+_CHUNK_SIZE = 1 << 20
+
+
+def powers_of_three(number_of_disks: int) -> np.ndarray:
+    """
+    Obtiene el peso de cada disco dentro del código de un estado.
+
+    Args:
+        number_of_disks (int): Cantidad de discos.
+
+    Returns:
+        np.ndarray: Arreglo (n,) con 3^(d - 1) para cada disco d.
+    """
+    if number_of_disks > MAX_DISKS:
+        raise ValueError(f'No se pueden codificar más de {MAX_DISKS} discos en int64')
+    return 3 ** np.arange(number_of_disks, dtype=np.int64)
+
+
+def ranks_to_pegs(ranks: np.ndarray, number_of_disks: int) -> np.ndarray:
+    """
+    Decodifica un lote de códigos en la varilla de cada disco.
+
+    Args:
+        ranks (np.ndarray): Arreglo (N,) de códigos.
+        number_of_disks (int): Cantidad de discos.
+
+    Returns:
+        np.ndarray: Arreglo (N, n) de uint8 con la varilla de cada disco.
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    return ((ranks[:, None] // powers_of_three(number_of_disks)) % 3).astype(np.uint8)
+
+
+def pegs_to_ranks(pegs: np.ndarray) -> np.ndarray:
+    """
+    Codifica un lote de ubicaciones de discos.
+
+    Args:
+        pegs (np.ndarray): Arreglo (N, n) con la varilla de cada disco.
+
+    Returns:
+        np.ndarray: Arreglo (N,) de int64 con el código de cada estado.
+    """
+    pegs = np.asarray(pegs)
+    return pegs.astype(np.int64) @ powers_of_three(pegs.shape[1])
+
+
+def successor_ranks(ranks: np.ndarray, number_of_disks: int) -> np.ndarray:
+    """
+    Genera los sucesores de un lote de estados.
+
+    Args:
+        ranks (np.ndarray): Arreglo (N,) de códigos.
+        number_of_disks (int): Cantidad de discos.
+
+    Returns:
+        np.ndarray: Arreglo (N, 6) de int64 donde la columna m es el código obtenido con el movimiento `MOVES[m]`,
+        o -1 si el movimiento no es legal.
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    pegs = ranks_to_pegs(ranks, number_of_disks)
+    powers = powers_of_three(number_of_disks)
+    rows = np.arange(len(ranks))
+
+    # Índice del disco superior de cada varilla, o number_of_disks si la varilla está vacía
+    tops = np.empty((3, len(ranks)), dtype=np.int64)
+    for peg in range(3):
+        on_peg = pegs == peg
+        first = np.argmax(on_peg, axis=1)
+        tops[peg] = np.where(on_peg[rows, first], first, number_of_disks)
+
+    successors = np.full((len(ranks), len(MOVES)), -1, dtype=np.int64)
+    for move, (rod_input, rod_out) in enumerate(MOVES):
+        legal = tops[rod_input] < tops[rod_out]
+        successors[legal, move] = ranks[legal] + (rod_out - rod_input) * powers[tops[rod_input][legal]]
+    return successors
+
+
+def states_to_pegs(states: list) -> np.ndarray:
+    """
+    Convierte una lista de estados en un arreglo de ubicaciones.
+
+    Args:
+        states (list): Lista de `StatesHanoi` con la misma cantidad de discos.
+
+    Returns:
+        np.ndarray: Arreglo (N, n) de uint8 con la varilla de cada disco.
+    """
+    return np.array([state.get_disk_pegs() for state in states], dtype=np.uint8)
+
+
+def _as_pegs(states: np.ndarray, goal_state: StatesHanoi) -> tuple:
+    """
+    Normaliza un lote de estados y el objetivo al formato de ubicaciones.
+
+    Args:
+        states (np.ndarray): Arreglo (N, n) de ubicaciones o (N,) de códigos.
+        goal_state (StatesHanoi): Estado objetivo.
+
+    Returns:
+        tuple: Ubicaciones del lote (N, n) y del objetivo (n,).
+    """
+    goal_pegs = np.array(goal_state.get_disk_pegs(), dtype=np.uint8)
+    states = np.asarray(states)
+    if states.ndim == 1:
+        states = ranks_to_pegs(states, goal_state.number_of_disks)
+    return states, goal_pegs
+
+
+def hanoi_heuristic_batch(states: np.ndarray, goal_state: StatesHanoi) -> np.ndarray:
+    """
+    Evalúa `hanoi_heuristic` sobre un lote de estados.
+
+    Un disco d en la varilla x forma parte del prefijo correcto de la varilla si y solo si todo disco e >= d está
+    en x exactamente cuando su varilla objetivo es x. Con un OR acumulado desde el disco más grande se obtiene esa
+    condición para todos los discos a la vez.
+
+    Args:
+        states (np.ndarray): Arreglo (N, n) de ubicaciones o (N,) de códigos.
+        goal_state (StatesHanoi): Estado objetivo.
+
+    Returns:
+        np.ndarray: Arreglo (N,) con el valor de la heurística de cada estado.
+    """
+    pegs, goal_pegs = _as_pegs(states, goal_state)
+    number_of_states, number_of_disks = pegs.shape
+    broken = np.empty((3, number_of_states, number_of_disks), dtype=bool)
+    for peg in range(3):
+        mismatch = (pegs == peg) != (goal_pegs == peg)
+        broken[peg] = np.logical_or.accumulate(mismatch[:, ::-1], axis=1)[:, ::-1]
+    rows = np.arange(number_of_states)[:, None]
+    columns = np.arange(number_of_disks)[None, :]
+    correct_disks = np.count_nonzero(~broken[pegs, rows, columns], axis=1)
+    return number_of_disks - correct_disks
+
+
+def hanoi_heuristic_2_batch(states: np.ndarray, goal_state: StatesHanoi) -> np.ndarray:
+    """
+    Evalúa `hanoi_heuristic_2` sobre un lote de estados.
+
+    Un lote de ubicaciones solo puede representar estados legales, por lo que el término de desorden es siempre
+    cero y la heurística se reduce a contar los discos fuera de su varilla objetivo.
+
+    Args:
+        states (np.ndarray): Arreglo (N, n) de ubicaciones o (N,) de códigos.
+        goal_state (StatesHanoi): Estado objetivo.
+
+    Returns:
+        np.ndarray: Arreglo (N,) con el valor de la heurística de cada estado.
+    """
+    pegs, goal_pegs = _as_pegs(states, goal_state)
+    return np.count_nonzero(pegs != goal_pegs, axis=1)
+
+
+class RankMask:
+    """
+    Conjunto de estados representado por una máscara booleana indexada por código.
+
+    Ocupa un byte por estado del espacio y permite usar `len` y `in` como con un conjunto de `StatesHanoi`.
+    """
+
+    def __init__(self, mask: np.ndarray):
+        self.mask = mask
+        self._size = int(np.count_nonzero(mask))
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, state: StatesHanoi):
+        return bool(self.mask[state.code])
+
+
+def layered_bfs(initial_rank: int, goal_rank: int, number_of_disks: int) -> tuple:
+    """
+    Búsqueda en anchura por capas completas de códigos.
+
+    Cada capa es un arreglo de códigos y sus sucesores se generan juntos con `successor_ranks`. Un único arreglo
+    uint8 indexado por código guarda, para cada estado alcanzado, el índice en `MOVES` del movimiento con el que se
+    llegó a él, o `UNVISITED` si todavía no se alcanzó, así que sirve a la vez para descartar duplicados y para
+    reconstruir el camino con un byte por estado.
+
+    Args:
+        initial_rank (int): Código del estado inicial.
+        goal_rank (int): Código del estado objetivo.
+        number_of_disks (int): Cantidad de discos.
+
+    Returns:
+        tuple: Lista de movimientos (disco, varilla de entrada, varilla de salida) de un camino óptimo, o None si
+        el objetivo no es alcanzable, y un `RankMask` con los estados expandidos.
+    """
+    parent_moves = np.full(3 ** number_of_disks, UNVISITED, dtype=np.uint8)
+    parent_moves[initial_rank] = ROOT
+    frontier = np.array([initial_rank], dtype=np.int64)
+    while frontier.size and parent_moves[goal_rank] == UNVISITED:
+        layers = []
+        for start in range(0, frontier.size, _CHUNK_SIZE):
+            successors = successor_ranks(frontier[start:start + _CHUNK_SIZE], number_of_disks)
+            new = successors >= 0
+            new[new] = parent_moves[successors[new]] == UNVISITED
+            rows, moves = np.nonzero(new)
+            successors, moves = successors[rows, moves], moves.astype(np.uint8)
+            parent_moves[successors] = moves
+            # Un estado y el movimiento con el que se llegó determinan al padre, así que los repetidos de la capa
+            # tienen movimientos distintos y solo queda el que ganó la escritura
+            layers.append(successors[parent_moves[successors] == moves])
+        frontier = np.concatenate(layers)
+
+    expanded_mask = parent_moves != UNVISITED
+    expanded_mask[frontier] = False
+    if parent_moves[goal_rank] == UNVISITED:
+        return None, RankMask(expanded_mask)
+    return _parent_path(parent_moves, goal_rank, number_of_disks), RankMask(expanded_mask)
+
+
+def _parent_path(parent_moves: np.ndarray, goal_rank: int, number_of_disks: int) -> list:
+    """
+    Reconstruye el camino desde la raíz siguiendo los movimientos padre hacia atrás.
+
+    Si a un estado se llegó moviendo un disco de la varilla i a la j, ese disco es ahora el superior de la varilla j
+    y deshacer el movimiento solo cambia su dígito en el código.
+
+    Args:
+        parent_moves (np.ndarray): Movimiento padre de cada estado.
+        goal_rank (int): Código del estado objetivo.
+        number_of_disks (int): Cantidad de discos.
+
+    Returns:
+        list: Movimientos (disco, varilla de entrada, varilla de salida) desde la raíz hasta el objetivo.
+    """
+    powers = [3 ** disk for disk in range(number_of_disks)]
+    path = []
+    rank = goal_rank
+    while parent_moves[rank] != ROOT:
+        rod_input, rod_out = MOVES[parent_moves[rank]]
+        disk = next(disk for disk in range(number_of_disks) if rank // powers[disk] % 3 == rod_out)
+        path.append((disk + 1, rod_input, rod_out))
+        rank -= (rod_out - rod_input) * powers[disk]
+    path.reverse()
+    return path
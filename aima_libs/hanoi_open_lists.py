@@ -0,0 +1,228 @@
+"""
+Listas abiertas para las búsquedas A*.
+
+Los movimientos de la Torre de Hanoi cuestan 1 y las heurísticas dan enteros, así que los valores de f son enteros
+chicos. En lugar de un heap se puede usar un arreglo de cubetas indexado por f, con inserción y extracción en O(1):
+se extrae siempre de la cubeta no vacía de menor f y un puntero avanza sobre las cubetas vacías.
+
+Dentro de una cubeta los empates se rompen según el modo elegido:
+
+- "fifo": primero el que se insertó antes, como el contador global del heap.
+- "lifo": primero el último insertado.
+- "min_h": primero el de menor h, es decir el de mayor g, el más profundo. En la última capa de f llega al objetivo
+  sin expandir el resto de los estados de esa capa.
+- "max_h": primero el de mayor h.
+
+Con "min_h" y "max_h" cada cubeta está dividida a su vez por h, y los empates en h se rompen en orden LIFO.
+
+Las entradas son las tuplas (f, contador, enlace, estado) que usan los motores de `main.py`.
+"""
+import collections
+import heapq
+
+# Modos de desempate de BucketOpenList
+TIE_BREAKS = ("fifo", "lifo", "min_h", "max_h")
+
+
+def _bucket_key(value, name: str) -> int:
+    """
+    Convierte un valor de f o de h en el índice de su cubeta.
+
+    Raises:
+        ValueError: Si el valor no es un entero no negativo. Truncarlo cambiaría el orden de extracción sin aviso
+            (por ejemplo con una heurística ponderada), y con un heap no hace falta.
+    """
+    if value < 0 or not float(value).is_integer():
+        raise ValueError(f'La lista de cubetas necesita valores de {name} enteros no negativos, no {value!r}; '
+                         f'usar desempate=None para un heap')
+    return int(value)
+
+
+class HeapOpenList:
+    """
+    Lista abierta sobre un heap binario. Los empates en f se rompen por el contador de la entrada.
+    """
+
+    def __init__(self):
+        self.heap = []
+
+    def push(self, entry: tuple, h):
+        """
+        Agrega una entrada.
+
+        Args:
+            entry (tuple): Entrada (f, contador, enlace, estado).
+            h: Valor heurístico del estado (no se usa).
+        """
+        heapq.heappush(self.heap, entry)
+
+    def pop(self) -> tuple:
+        """
+        Extrae la entrada de menor f.
+        """
+        return heapq.heappop(self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        return iter(self.heap)
+
+
+class _FifoBucket(collections.deque):
+    """
+    Cubeta que devuelve primero la entrada más antigua.
+    """
+
+    def push(self, entry: tuple, h):
+        self.append(entry)
+
+    def pop(self) -> tuple:
+        return self.popleft()
+
+
+class _LifoBucket(list):
+    """
+    Cubeta que devuelve primero la entrada más reciente.
+    """
+
+    def push(self, entry: tuple, h):
+        self.append(entry)
+
+
+class _HeuristicBucket:
+    """
+    Cubeta dividida por h, que devuelve primero una entrada de menor (o mayor) h.
+
+    Attributes:
+        levels (list): Entradas de cada valor de h.
+        lowest (bool): Si se extrae primero el menor h.
+        best (int): Valor de h de la próxima entrada a extraer, None si la cubeta está vacía.
+    """
+
+    def __init__(self, lowest: bool):
+        self.levels = []
+        self.lowest = lowest
+        self.best = None
+        self._size = 0
+
+    def push(self, entry: tuple, h):
+        h = _bucket_key(h, "h")
+        levels = self.levels
+        if h >= len(levels):
+            levels.extend([] for _ in range(h + 1 - len(levels)))
+        levels[h].append(entry)
+        self._size += 1
+        if self.best is None or (h < self.best if self.lowest else h > self.best):
+            self.best = h
+
+    def pop(self) -> tuple:
+        levels = self.levels
+        best = self.best
+        entry = levels[best].pop()
+        self._size -= 1
+        if not self._size:
+            self.best = None
+        elif not levels[best]:
+            step = 1 if self.lowest else -1
+            while not levels[best]:
+                best += step
+            self.best = best
+        return entry
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for level in self.levels:
+            yield from level
+
+
+class BucketOpenList:
+    """
+    Lista abierta con una cubeta por valor de f.
+
+    Los valores de f y de h se usan como índices, así que tienen que ser enteros no negativos (o flotantes con valor
+    entero, como los costos acumulados de `StatesHanoi`); con otros valores `push` lanza ValueError.
+
+    Attributes:
+        tie_breaking (str): Modo de desempate dentro de cada cubeta, uno de `TIE_BREAKS`.
+        buckets (list): Cubeta de cada valor de f, o None si nunca se usó.
+        min_f (int): Cota inferior del menor f con entradas.
+    """
+
+    def __init__(self, tie_breaking: str = "fifo"):
+        if tie_breaking not in TIE_BREAKS:
+            raise ValueError(f'Modo de desempate desconocido: {tie_breaking}')
+        self.tie_breaking = tie_breaking
+        if tie_breaking == "fifo":
+            self._new_bucket = _FifoBucket
+        elif tie_breaking == "lifo":
+            self._new_bucket = _LifoBucket
+        else:
+            lowest = tie_breaking == "min_h"
+            self._new_bucket = lambda: _HeuristicBucket(lowest)
+        self.buckets = []
+        self.min_f = 0
+        self._size = 0
+
+    def push(self, entry: tuple, h):
+        """
+        Agrega una entrada a la cubeta de su f.
+
+        Args:
+            entry (tuple): Entrada (f, contador, enlace, estado).
+            h: Valor heurístico del estado, que se usa para desempatar.
+        """
+        f = _bucket_key(entry[0], "f")
+        buckets = self.buckets
+        if f >= len(buckets):
+            buckets.extend(None for _ in range(f + 1 - len(buckets)))
+        bucket = buckets[f]
+        if bucket is None:
+            bucket = buckets[f] = self._new_bucket()
+        bucket.push(entry, h)
+        self._size += 1
+        if f < self.min_f:
+            self.min_f = f
+
+    def pop(self) -> tuple:
+        """
+        Extrae una entrada de menor f, según el modo de desempate.
+
+        Returns:
+            tuple: Entrada (f, contador, enlace, estado).
+        """
+        if not self._size:
+            raise IndexError('pop from an empty open list')
+        buckets = self.buckets
+        f = self.min_f
+        while not buckets[f]:
+            f += 1
+        self.min_f = f
+        self._size -= 1
+        return buckets[f].pop()
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for bucket in self.buckets:
+            if bucket:
+                yield from bucket
+
+
+def open_list_for(tie_breaking: str = None):
+    """
+    Crea la lista abierta de una búsqueda.
+
+    Args:
+        tie_breaking (str): None para un heap con desempate FIFO, o uno de `TIE_BREAKS` para una lista de cubetas
+            con ese desempate.
+
+    Returns:
+        HeapOpenList | BucketOpenList: Lista abierta vacía.
+    """
+    if tie_breaking is None:
+        return HeapOpenList()
+    return BucketOpenList(tie_breaking)
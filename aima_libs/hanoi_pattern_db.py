@@ -0,0 +1,353 @@
+"""
+Bases de datos de patrones para la Torre de Hanoi.
+
+Una base de datos de patrones guarda la distancia exacta al objetivo del problema abstracto que solo tiene en cuenta
+un subconjunto de discos. Quitar discos de un problema de Hanoi deja otro problema de Hanoi con menos discos, por
+lo que la tabla de un subconjunto de k discos es la tabla de distancias del problema de k discos hacia la proyección
+del objetivo, y se puede compartir entre todos los subconjuntos con la misma proyección.
+
+Las tablas se construyen con una búsqueda en anchura hacia atrás desde el objetivo, se guardan en disco como
+arreglos de NumPy y se cargan con `mmap_mode`, de modo que varias ejecuciones o procesos comparten la misma copia.
+"""
+import logging
+import os
+import time
+
+import numpy as np
+
+from aima_libs import hanoi_numpy
+from aima_libs.hanoi_states import StatesHanoi, legal_actions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = "pattern_dbs"
+
+# Cantidad de estados de la frontera que se expanden por vez durante la construcción
+_CHUNK_SIZE = 1 << 20
+
+
+def distance_dtype(number_of_disks: int) -> np.dtype:
+    """
+    Obtiene el tipo entero más chico que alcanza para las distancias de un problema.
+
+    La distancia entre dos estados de n discos nunca supera 2^n - 1.
+
+    Args:
+        number_of_disks (int): Cantidad de discos.
+
+    Returns:
+        np.dtype: uint8, uint16 o uint32.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if 2 ** number_of_disks - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f'Demasiados discos para una tabla de distancias: {number_of_disks}')
+
+
+def build_distance_table(number_of_disks: int, goal_rank: int) -> np.ndarray:
+    """
+    Calcula la distancia de todos los estados a un objetivo con una búsqueda en anchura hacia atrás.
+
+    Los movimientos de la Torre de Hanoi son reversibles, así que los sucesores de un estado son también sus
+    predecesores.
+
+    Args:
+        number_of_disks (int): Cantidad de discos.
+        goal_rank (int): Código del estado objetivo.
+
+    Returns:
+        np.ndarray: Arreglo de 3^n distancias indexado por el código de cada estado.
+    """
+    size = 3 ** number_of_disks
+    distances = np.zeros(size, dtype=distance_dtype(number_of_disks))
+    visited = np.zeros(size, dtype=bool)
+    visited[goal_rank] = True
+    frontier = np.array([goal_rank], dtype=np.int64)
+    depth = 0
+    while True:
+        layers = []
+        for start in range(0, frontier.size, _CHUNK_SIZE):
+            successors = hanoi_numpy.successor_ranks(frontier[start:start + _CHUNK_SIZE], number_of_disks).ravel()
+            successors = successors[successors >= 0]
+            successors = np.unique(successors[~visited[successors]])
+            visited[successors] = True
+            layers.append(successors)
+        frontier = np.concatenate(layers)
+        if not frontier.size:
+            return distances
+        depth += 1
+        distances[frontier] = depth
+
+
+def table_path(number_of_disks: int, goal_rank: int, directory: str = DEFAULT_DIRECTORY) -> str:
+    """
+    Obtiene la ruta del archivo de una tabla de distancias.
+
+    Args:
+        number_of_disks (int): Cantidad de discos.
+        goal_rank (int): Código del estado objetivo.
+        directory (str): Directorio de las tablas.
+
+    Returns:
+        str: Ruta del archivo .npy.
+    """
+    return os.path.join(directory, f"hanoi_{number_of_disks}_discos_objetivo_{goal_rank}.npy")
+
+
+def load_or_build_table(number_of_disks: int, goal_rank: int, directory: str = DEFAULT_DIRECTORY) -> np.ndarray:
+    """
+    Carga una tabla de distancias desde disco, construyéndola si todavía no existe.
+
+    Args:
+        number_of_disks (int): Cantidad de discos.
+        goal_rank (int): Código del estado objetivo.
+        directory (str): Directorio de las tablas.
+
+    Returns:
+        np.ndarray: Tabla de distancias mapeada en memoria de solo lectura.
+    """
+    path = table_path(number_of_disks, goal_rank, directory)
+    if not os.path.exists(path):
+        start_time = time.perf_counter()
+        table = build_distance_table(number_of_disks, goal_rank)
+        build_time = time.perf_counter() - start_time
+        os.makedirs(directory, exist_ok=True)
+        # Se escribe en un archivo temporal para que otro proceso nunca lea una tabla a medio escribir
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            np.save(file, table)
+        os.replace(temporary_path, path)
+        logger.info(f"Tabla de distancias de {number_of_disks} discos (objetivo {goal_rank}) construida en "
+                    f"{build_time:.3f} segundos, {table.nbytes / 1024:.2f} KB")
+    return np.load(path, mmap_mode="r")
+
+
+def default_groups(number_of_disks: int, max_group_size: int = 12) -> list:
+    """
+    Divide los discos en grupos disjuntos de discos consecutivos, empezando por los más grandes.
+
+    Args:
+        number_of_disks (int): Cantidad de discos.
+        max_group_size (int): Máxima cantidad de discos por grupo.
+
+    Returns:
+        list: Lista de tuplas con los discos de cada grupo.
+    """
+    return [tuple(range(max(1, largest - max_group_size + 1), largest + 1))
+            for largest in range(number_of_disks, 0, -max_group_size)]
+
+
+class PatternDatabase:
+    """
+    Distancias exactas al objetivo del problema abstracto formado por un subconjunto de discos.
+    """
+
+    def __init__(self, disks: tuple, goal_state: StatesHanoi, directory: str = DEFAULT_DIRECTORY):
+        """
+        Carga o construye la base de datos de un subconjunto de discos.
+
+        Args:
+            disks (tuple): Discos del patrón.
+            goal_state (StatesHanoi): Estado objetivo.
+            directory (str): Directorio de las tablas.
+        """
+        self.disks = tuple(sorted(disks))
+        # En el problema abstracto el i-ésimo disco del patrón pasa a ser el disco i + 1
+        self.weights = [(disk - 1, 3 ** index) for index, disk in enumerate(self.disks)]
+        self.goal_rank = self.project(goal_state.get_disk_pegs())
+        self.table = load_or_build_table(len(self.disks), self.goal_rank, directory)
+        # Indexar un memoryview devuelve enteros de Python sin pasar por los escalares de NumPy
+        self._values = memoryview(self.table)
+
+    def project(self, disk_pegs: list) -> int:
+        """
+        Calcula el código del estado abstracto.
+
+        Args:
+            disk_pegs (list): Varilla de cada disco, como la devuelve `StatesHanoi.get_disk_pegs`.
+
+        Returns:
+            int: Código del estado abstracto.
+        """
+        return sum(disk_pegs[index] * weight for index, weight in self.weights)
+
+    def lookup(self, disk_pegs: list) -> int:
+        """
+        Obtiene la distancia del estado abstracto al objetivo.
+
+        Args:
+            disk_pegs (list): Varilla de cada disco, como la devuelve `StatesHanoi.get_disk_pegs`.
+
+        Returns:
+            int: Distancia del estado abstracto.
+        """
+        return self._values[self.project(disk_pegs)]
+
+
+class PatternDatabaseHeuristic:
+    """
+    Heurística que combina varias bases de datos de patrones.
+
+    Cada movimiento mueve un único disco, así que con grupos disjuntos la suma de las distancias abstractas sigue
+    siendo admisible. Con grupos que se solapan hay que usar el máximo.
+    """
+
+    def __init__(self, goal_state: StatesHanoi, groups: list = None, mode: str = "sum",
+                 directory: str = DEFAULT_DIRECTORY):
+        """
+        Carga o construye las bases de datos de todos los grupos.
+
+        Args:
+            goal_state (StatesHanoi): Estado objetivo.
+            groups (list): Lista de tuplas con los discos de cada patrón. Si es None se usa `default_groups`.
+            mode (str): 'sum' para patrones disjuntos, 'max' para cualquier conjunto de patrones.
+            directory (str): Directorio de las tablas.
+        """
+        if goal_state.number_of_pegs != 3:
+            raise ValueError('Las bases de datos de patrones solo admiten tres varillas')
+        if groups is None:
+            groups = default_groups(goal_state.number_of_disks)
+        if mode == "sum":
+            all_disks = [disk for group in groups for disk in group]
+            if len(all_disks) != len(set(all_disks)):
+                raise ValueError('Los patrones deben ser disjuntos para sumarlos')
+            self.combine = sum
+        elif mode == "max":
+            self.combine = max
+        else:
+            raise ValueError("El modo debe ser 'sum' o 'max'.")
+        if not all(0 < disk <= goal_state.number_of_disks for group in groups for disk in group):
+            raise ValueError('Valor de disco incorrecto')
+
+        self.goal_state = goal_state
+        self.mode = mode
+        self.databases = [PatternDatabase(group, goal_state, directory) for group in groups]
+        self.__name__ = f"pattern_db_{mode}"
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Tamaño total de las tablas en bytes.
+        """
+        return sum(database.table.nbytes for database in self.databases)
+
+    def __call__(self, current_state: StatesHanoi, goal_state: StatesHanoi = None) -> int:
+        """
+        Evalúa la heurística con la misma firma que `hanoi_heuristic`.
+
+        Args:
+            current_state (StatesHanoi): Estado a evaluar.
+            goal_state (StatesHanoi): Estado objetivo. Debe ser el mismo con el que se construyeron las tablas.
+
+        Returns:
+            int: Valor de la heurística.
+        """
+        if goal_state is not None and goal_state != self.goal_state:
+            raise ValueError('Las bases de datos de patrones se construyeron para otro objetivo')
+        disk_pegs = current_state.get_disk_pegs()
+        return self.combine(database.lookup(disk_pegs) for database in self.databases)
+
+
+class DistanceTable:
+    """
+    Distancia exacta de cada uno de los 3^n estados a un objetivo fijo.
+
+    Es la base de datos de patrones que incluye a todos los discos, así que comparte los archivos con
+    `PatternDatabase`. Una vez construida, cualquier estado inicial se resuelve con consultas O(1) a la tabla
+    bajando siempre hacia un vecino que esté un paso más cerca del objetivo.
+    """
+
+    # Tablas ya abiertas por objetivo, para atender muchas consultas con el mismo objetivo
+    _opened = {}
+
+    def __init__(self, goal_state: StatesHanoi, directory: str = DEFAULT_DIRECTORY):
+        """
+        Carga o construye la tabla de distancias de un objetivo.
+
+        Args:
+            goal_state (StatesHanoi): Estado objetivo.
+            directory (str): Directorio de las tablas.
+        """
+        if goal_state.number_of_pegs != 3:
+            raise ValueError('Las tablas de distancias solo admiten tres varillas')
+        self.goal_state = goal_state
+        self.table = load_or_build_table(goal_state.number_of_disks, goal_state.code, directory)
+        self._values = memoryview(self.table)
+
+    @classmethod
+    def for_goal(cls, goal_state: StatesHanoi, directory: str = DEFAULT_DIRECTORY) -> "DistanceTable":
+        """
+        Obtiene la tabla de un objetivo, reutilizando la que ya esté abierta en el proceso.
+
+        Args:
+            goal_state (StatesHanoi): Estado objetivo.
+            directory (str): Directorio de las tablas.
+
+        Returns:
+            DistanceTable: Tabla de distancias del objetivo.
+        """
+        key = (goal_state.number_of_disks, goal_state.code, directory)
+        table = cls._opened.get(key)
+        if table is None:
+            table = cls._opened[key] = cls(goal_state, directory)
+        return table
+
+    def distance(self, state: StatesHanoi) -> int:
+        """
+        Obtiene la distancia de un estado al objetivo.
+
+        Args:
+            state (StatesHanoi): Estado a consultar.
+
+        Returns:
+            int: Cantidad mínima de movimientos hasta el objetivo.
+        """
+        return self._values[state.code]
+
+    def distances(self, ranks: np.ndarray) -> np.ndarray:
+        """
+        Obtiene la distancia de un lote de estados al objetivo.
+
+        Args:
+            ranks (np.ndarray): Arreglo (N,) de códigos.
+
+        Returns:
+            np.ndarray: Arreglo (N,) de distancias.
+        """
+        return self.table[np.asarray(ranks, dtype=np.int64)]
+
+    def __call__(self, current_state: StatesHanoi, goal_state: StatesHanoi = None) -> int:
+        """
+        Usa la tabla como heurística perfecta, con la misma firma que `hanoi_heuristic`.
+
+        Args:
+            current_state (StatesHanoi): Estado a evaluar.
+            goal_state (StatesHanoi): Estado objetivo. Debe ser el mismo con el que se construyó la tabla.
+
+        Returns:
+            int: Distancia exacta al objetivo.
+        """
+        if goal_state is not None and goal_state != self.goal_state:
+            raise ValueError('La tabla de distancias se construyó para otro objetivo')
+        return self._values[current_state.code]
+
+    def descend(self, state: StatesHanoi):
+        """
+        Genera un camino óptimo hasta el objetivo eligiendo en cada paso un vecino a distancia uno menos.
+
+        Args:
+            state (StatesHanoi): Estado inicial.
+
+        Yields:
+            ActionHanoi: Acciones del camino.
+        """
+        values = self._values
+        distance = values[state.code]
+        while distance:
+            for action in legal_actions(state.top_disks()):
+                child = action.execute(state)
+                if values[child.code] == distance - 1:
+                    yield action
+                    state = child
+                    distance -= 1
+                    break
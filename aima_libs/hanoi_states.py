@@ -1,4 +1,5 @@
-import copy
+import random
+import types
 from typing import Optional
 
 import aima_libs.aima as aima
@@ -19,48 +20,267 @@ def is_sorted(test_list: list) -> bool:
     return False
 
 
+# Potencias de k precalculadas para cada cantidad k de varillas: el disco d aporta peg * k**(d - 1) al código del
+# estado. La tabla de 3 varillas es la del caso clásico y se usa directamente en los caminos más usados.
+_POWERS_OF_THREE = [1]
+_POWERS = {3: _POWERS_OF_THREE}
+
+
+def _ensure_powers(number_of_disks: int, number_of_pegs: int = 3) -> list:
+    """
+    Extiende la tabla de potencias de una base para cubrir la cantidad de discos indicada.
+
+    Args:
+        number_of_disks (int): Cantidad de discos a representar.
+        number_of_pegs (int): Cantidad de varillas, que es la base del código.
+
+    Returns:
+        list: Tabla de potencias de la base.
+    """
+    powers = _POWERS.get(number_of_pegs)
+    if powers is None:
+        powers = _POWERS[number_of_pegs] = [1]
+    while len(powers) <= number_of_disks:
+        powers.append(powers[-1] * number_of_pegs)
+    return powers
+
+
+def _ensure_powers_of_three(number_of_disks: int):
+    """
+    Extiende la tabla de potencias de 3 para cubrir la cantidad de discos indicada.
+
+    Args:
+        number_of_disks (int): Cantidad de discos a representar.
+    """
+    _ensure_powers(number_of_disks, 3)
+
+
+def encode_rods(rods: list) -> int:
+    """
+    Codifica la ubicación de los discos en un único entero.
+
+    Cada disco ocupa un dígito en base k (la cantidad de varillas) cuyo valor es el índice de su varilla, por lo
+    que el código es el rango del estado dentro de 0..k^n-1.
+
+    Args:
+        rods (list): Lista con los discos de cada varilla.
+
+    Returns:
+        int: Código del estado.
+    """
+    number_of_disks = sum(len(rod) for rod in rods)
+    powers = _ensure_powers(number_of_disks, len(rods))
+    code = 0
+    for peg, rod in enumerate(rods):
+        for disk in rod:
+            code += peg * powers[disk - 1]
+    return code
+
+
+def decode_rods(code: int, number_of_disks: int, number_of_pegs: int = 3) -> list:
+    """
+    Reconstruye las varillas a partir del código de un estado.
+
+    Args:
+        code (int): Código del estado.
+        number_of_disks (int): Cantidad de discos del estado.
+        number_of_pegs (int): Cantidad de varillas.
+
+    Returns:
+        list: Lista con los discos de cada varilla, ordenados de forma descendente.
+    """
+    powers = _ensure_powers(number_of_disks, number_of_pegs)
+    rods = [[] for _ in range(number_of_pegs)]
+    for disk in range(number_of_disks, 0, -1):
+        rods[(code // powers[disk - 1]) % number_of_pegs].append(disk)
+    return rods
+
+
+# Claves de Zobrist por (disco, varilla). Se generan con una semilla fija para que el hash de un estado sea el
+# mismo en todos los procesos.
+_ZOBRIST_KEYS = []
+_ZOBRIST_RANDOM = random.Random(0x4A2B)
+_ZOBRIST_PEGS = 3
+
+
+def _extra_zobrist_key(disk: int, peg: int) -> int:
+    """
+    Clave de Zobrist de las varillas a partir de la cuarta.
+
+    Se deriva solo del disco y la varilla, así que no depende del orden en que se pidan las claves.
+    """
+    return random.Random(0x4A2B ^ (disk << 16) ^ peg).getrandbits(60)
+
+
+def _ensure_zobrist_keys(number_of_disks: int, number_of_pegs: int = 3):
+    """
+    Extiende la tabla de claves de Zobrist para cubrir la cantidad de discos y varillas indicada.
+
+    Args:
+        number_of_disks (int): Cantidad de discos a representar.
+        number_of_pegs (int): Cantidad de varillas a representar.
+    """
+    global _ZOBRIST_PEGS
+    while len(_ZOBRIST_KEYS) < number_of_disks:
+        keys = tuple(_ZOBRIST_RANDOM.getrandbits(60) for _ in range(3))
+        disk = len(_ZOBRIST_KEYS) + 1
+        _ZOBRIST_KEYS.append(keys + tuple(_extra_zobrist_key(disk, peg) for peg in range(3, _ZOBRIST_PEGS)))
+    if number_of_pegs > _ZOBRIST_PEGS:
+        _ZOBRIST_PEGS = number_of_pegs
+        for index, keys in enumerate(_ZOBRIST_KEYS):
+            _ZOBRIST_KEYS[index] = keys + tuple(_extra_zobrist_key(index + 1, peg)
+                                                for peg in range(len(keys), number_of_pegs))
+
+
+def zobrist_hash(rods: list) -> int:
+    """
+    Calcula el hash de Zobrist de una ubicación de discos.
+
+    Args:
+        rods (list): Lista con los discos de cada varilla.
+
+    Returns:
+        int: XOR de las claves (disco, varilla) de todos los discos.
+    """
+    _ensure_zobrist_keys(sum(len(rod) for rod in rods), len(rods))
+    value = 0
+    for peg, rod in enumerate(rods):
+        for disk in rod:
+            value ^= _ZOBRIST_KEYS[disk - 1][peg]
+    return value
+
+
 class StatesHanoi:
     """
     Representa un estado posible de ubicación de discos de la Torre de Hanoi.
     """
 
-    def __init__(self, rod1: list, rod2: list, rod3: list, max_disks: int = 5, cost: float = 0.0):
+    def __init__(self, *rods: list, max_disks: int = 5, cost: float = 0.0):
         """
         Inicializa un estado posible de ubicación de discos de la Torre de Hanoi.
 
         Args:
-            rod1 (list): Discos en la primera varilla.
-            rod2 (list): Discos en la segunda varilla.
-            rod3 (list): Discos en la tercera varilla.
-            max_disks (int): Máximo número de discos permitidos.
+            *rods (list): Discos en cada varilla. Se necesitan al menos tres varillas; con más se obtiene el
+                problema de k varillas (con cuatro, el acertijo de Reve).
+            max_disks (int): Máximo número de discos permitidos. Con tres varillas también se puede pasar por
+                posición después de ellas, como en `StatesHanoi(rod1, rod2, rod3, max_disks, cost)`.
             cost (float): Costo asociado al estado.
         """
+        positional = [index for index, rod in enumerate(rods) if not isinstance(rod, (list, tuple))]
+        if positional:
+            # Forma original de tres varillas, con max_disks y cost por posición
+            if positional != list(range(3, len(rods))) or len(rods) > 5:
+                raise TypeError('Las varillas deben ser listas; con más de tres varillas max_disks y cost se pasan '
+                                'por nombre')
+            max_disks = rods[3]
+            if len(rods) == 5:
+                cost = rods[4]
+            rods = rods[:3]
+        if len(rods) < 3:
+            raise ValueError('Se necesitan al menos tres varillas')
+
         # Comprobamos si es un estado ilegal
-        if (set.intersection(set(rod1), set(rod2)) or
-                set.intersection(set(rod2), set(rod3)) or
-                set.intersection(set(rod1), set(rod3))):
-            raise ValueError('El mismo disco está en varillas diferentes')
+        all_values = set()
+        for rod in rods:
+            if all_values.intersection(rod):
+                raise ValueError('El mismo disco está en varillas diferentes')
+            all_values.update(rod)
 
-        all_values = set.union(set(rod1), set(rod2), set(rod3))
         if not all(0 < i < (max_disks + 1) for i in all_values):
             raise ValueError('Valor de disco incorrecto')
 
         if not all(i in all_values for i in range(1, max_disks + 1)):
             raise ValueError('No todos los discos están insertados')
 
-        for rod in [rod1, rod2, rod3]:
+        for rod in rods:
             if not is_sorted(rod):
                 raise ValueError('No es un estado de Hanoi válido')
 
-        self.rods = [rod1, rod2, rod3]
-        self.number_of_disks = sum([len(rod) for rod in self.rods])
-        self.number_of_pegs = 3
+        self._rods = list(rods)
+        self._code = encode_rods(self._rods)
+        self._hash = zobrist_hash(self._rods)
+        self.number_of_disks = sum([len(rod) for rod in self._rods])
+        self.number_of_pegs = len(rods)
         self.accumulated_cost = cost
 
         # Atributos y métodos privados
         self.__string_representation__ = ""
         self.__generate_representation__()
 
+    @classmethod
+    def from_code(cls, code: int, number_of_disks: int, cost: float = 0.0,
+                  hash_value: Optional[int] = None, number_of_pegs: int = 3) -> "StatesHanoi":
+        """
+        Crea un estado a partir de su código sin volver a validarlo.
+
+        Las varillas no se construyen hasta que alguien las pide, de modo que generar un sucesor cuesta unas pocas
+        operaciones enteras.
+
+        Args:
+            code (int): Código del estado (ver `encode_rods`).
+            number_of_disks (int): Cantidad de discos del estado.
+            cost (float): Costo asociado al estado.
+            hash_value (Optional[int]): Hash de Zobrist del estado si ya se conoce. Si es None se calcula a partir
+                del código.
+            number_of_pegs (int): Cantidad de varillas.
+
+        Returns:
+            StatesHanoi: Estado correspondiente al código.
+        """
+        if number_of_pegs != 3 or number_of_disks >= len(_POWERS_OF_THREE):
+            _ensure_powers(number_of_disks, number_of_pegs)
+        state = cls.__new__(cls)
+        state._rods = None
+        state._code = code
+        if hash_value is None:
+            hash_value = zobrist_hash(decode_rods(code, number_of_disks, number_of_pegs))
+        state._hash = hash_value
+        state.number_of_disks = number_of_disks
+        state.number_of_pegs = number_of_pegs
+        state.accumulated_cost = cost
+        state.__string_representation__ = ""
+        return state
+
+    @classmethod
+    def from_state_dict(cls, state_dict: dict, max_disks: int = None, cost: float = 0.0) -> "StatesHanoi":
+        """
+        Crea un estado a partir de un diccionario con el formato de `get_state_dict`.
+
+        Args:
+            state_dict (dict): Diccionario con las claves `peg_1`, `peg_2`, `peg_3`, etc. Se usan al menos tres
+                varillas, aunque falten claves.
+            max_disks (int): Máximo número de discos permitidos. Si es None se usa la cantidad de discos presentes.
+            cost (float): Costo asociado al estado.
+
+        Returns:
+            StatesHanoi: Estado validado.
+        """
+        number_of_pegs = 3
+        while f'peg_{number_of_pegs + 1}' in state_dict:
+            number_of_pegs += 1
+        rods = [list(state_dict.get(f'peg_{index + 1}', [])) for index in range(number_of_pegs)]
+        if max_disks is None:
+            max_disks = sum(len(rod) for rod in rods)
+        return cls(*rods, max_disks=max_disks, cost=cost)
+
+    @property
+    def rods(self) -> list:
+        """
+        Discos de cada varilla, construidos a partir del código si todavía no existen.
+        """
+        if self._rods is None:
+            self._rods = decode_rods(self._code, self.number_of_disks, self.number_of_pegs)
+        return self._rods
+
+    @property
+    def code(self) -> int:
+        """
+        Código entero del estado, en el rango 0..k^n-1.
+        """
+        if self._code is None:
+            self._code = encode_rods(self._rods)
+        return self._code
+
     def __generate_representation__(self):
         """
         Genera una representación en forma de string del estado de Hanoi.
@@ -75,7 +295,9 @@ class StatesHanoi:
         """
         Compara dos estados de Hanoi para verificar si son iguales.
 
-        Dos estados de Hanoi son iguales si tienen la misma cantidad de discos y la misma ubicación.
+        Dos estados de Hanoi son iguales si tienen la misma cantidad de discos y varillas y la misma ubicación.
+        Primero se comparan los hashes, que descartan casi todos los estados distintos sin mirar la ubicación de los
+        discos.
 
         Args:
             other: Otro estado de Hanoi a comparar.
@@ -83,8 +305,10 @@ class StatesHanoi:
         Returns:
             bool: True si los estados son iguales, False en caso contrario.
         """
-        if self.number_of_disks == other.number_of_disks:
-            if self.rods == other.rods:
+        if self._hash != other._hash:
+            return False
+        if self.number_of_disks == other.number_of_disks and self.number_of_pegs == other.number_of_pegs:
+            if self.code == other.code:
                 return True
 
         return False
@@ -127,11 +351,12 @@ class StatesHanoi:
         """
         Genera un hash para el objeto StatesHanoi.
 
+        El hash de Zobrist se calcula una sola vez al crear el estado y cada movimiento lo actualiza en O(1).
+
         Returns:
             int: Hash generado para el estado de Hanoi.
         """
-        self.__generate_representation__()
-        return hash(self.__string_representation__)
+        return self._hash
 
     def get_last_disk_rod(self, number_rod: int, peek: bool = False) -> Optional[int]:
         """
@@ -144,13 +369,55 @@ class StatesHanoi:
         Returns:
             Optional[int]: El último disco de la varilla si existe, None en caso contrario.
         """
+        if peek:
+            if self._code is not None:
+                return self.top_disks()[number_rod] or None
+            # Hay un disco en la mano: el código no refleja la ubicación y se leen las varillas
+            rod = self._rods[number_rod]
+            return rod[-1] if rod else None
         rod = self.rods[number_rod]
         if len(rod) != 0:
-            if peek:
-                return rod[-1]
-            return rod.pop()
+            self._code = None
+            disk = rod.pop()
+            self._hash ^= _ZOBRIST_KEYS[disk - 1][number_rod]
+            return disk
         return None
 
+    def top_disks(self) -> tuple:
+        """
+        Obtiene el disco superior de cada varilla leyendo el código del estado.
+
+        Returns:
+            tuple: Disco superior de cada varilla, 0 si la varilla está vacía.
+        """
+        number_of_pegs = self.number_of_pegs
+        tops = [0] * number_of_pegs
+        remaining = number_of_pegs
+        code = self.code
+        for disk in range(1, self.number_of_disks + 1):
+            code, peg = divmod(code, number_of_pegs)
+            if not tops[peg]:
+                tops[peg] = disk
+                remaining -= 1
+                if not remaining:
+                    break
+        return tuple(tops)
+
+    def get_disk_pegs(self) -> list:
+        """
+        Obtiene la varilla en la que se encuentra cada disco.
+
+        Returns:
+            list: Índice de la varilla de cada disco, donde la posición i corresponde al disco i + 1.
+        """
+        pegs = []
+        number_of_pegs = self.number_of_pegs
+        code = self.code
+        for _ in range(self.number_of_disks):
+            code, peg = divmod(code, number_of_pegs)
+            pegs.append(peg)
+        return pegs
+
     def check_valid_disk_in_rod(self, number_rod: int, disk: int) -> bool:
         """
         Comprueba si es válido colocar un disco en una varilla específica.
@@ -180,6 +447,8 @@ class StatesHanoi:
         """
         if self.check_valid_disk_in_rod(number_rod, disk):
             self.rods[number_rod].append(disk)
+            self._code = None
+            self._hash ^= _ZOBRIST_KEYS[disk - 1][number_rod]
 
     def accumulate_cost(self, cost):
         """
@@ -238,24 +507,70 @@ class ActionHanoi:
         self.disk = disk
         self.rod_input = rod_input
         self.rod_out = rod_out
+        self.cost = 1.0 if rod_input != rod_out else 0.0
 
-        if rod_input != rod_out:
-            self.action = f"Move disk {disk} from {rod_input + 1} to {rod_out + 1}"
-            self.action_dict = {
-                "type": "movement",
-                "disk": disk,
-                "peg_start": rod_input + 1,
-                "peg_end": rod_out + 1
-            }
-            self.cost = 1.0
-        else:
-            self.action = f"Maintain disk {disk} in {rod_input + 1}"
-            self.action_dict = {
-                "type": "maintain",
-                "disk": disk,
-                "peg": rod_input + 1
-            }
-            self.cost = 0.0
+        # La descripción y el diccionario para el simulador se construyen la primera vez que se piden
+        self._action = None
+        self._action_dict = None
+
+    @classmethod
+    def get(cls, disk: int, rod_input: int, rod_out: int) -> "ActionHanoi":
+        """
+        Obtiene la acción compartida para mover un disco entre dos varillas.
+
+        Las acciones no tienen estado propio, por lo que se crea una única instancia por combinación de disco y
+        varillas y se reutiliza en todas las expansiones.
+
+        Args:
+            disk (int): Número del disco.
+            rod_input (int): Índice de la varilla de entrada.
+            rod_out (int): Índice de la varilla de salida.
+
+        Returns:
+            ActionHanoi: Acción compartida.
+        """
+        key = (disk, rod_input, rod_out)
+        action = _ACTIONS.get(key)
+        if action is None:
+            action = _ACTIONS[key] = cls(disk, rod_input, rod_out)
+        return action
+
+    @property
+    def action(self) -> str:
+        """
+        Descripción legible de la acción.
+        """
+        if self._action is None:
+            if self.rod_input != self.rod_out:
+                self._action = f"Move disk {self.disk} from {self.rod_input + 1} to {self.rod_out + 1}"
+            else:
+                self._action = f"Maintain disk {self.disk} in {self.rod_input + 1}"
+        return self._action
+
+    @property
+    def action_dict(self) -> types.MappingProxyType:
+        """
+        Diccionario que describe la acción en el formato que lee el simulador.
+
+        La acción es compartida por todas las soluciones que la usan, así que se devuelve una vista de solo lectura
+        del mismo diccionario: no se crea un objeto por movimiento y nadie puede modificar las demás soluciones. Para
+        serializarla con `json` hay que convertirla con `dict(...)`.
+        """
+        if self._action_dict is None:
+            if self.rod_input != self.rod_out:
+                self._action_dict = types.MappingProxyType({
+                    "type": "movement",
+                    "disk": self.disk,
+                    "peg_start": self.rod_input + 1,
+                    "peg_end": self.rod_out + 1
+                })
+            else:
+                self._action_dict = types.MappingProxyType({
+                    "type": "maintain",
+                    "disk": self.disk,
+                    "peg": self.rod_input + 1
+                })
+        return self._action_dict
 
     def __repr__(self):
         """
@@ -285,16 +600,100 @@ class ActionHanoi:
         Returns:
             StatesHanoi: Nuevo estado de Hanoi después de ejecutar la acción.
         """
-        if "move" in self.action.lower():
-            state_out = copy.deepcopy(state_hanoi)
-
-            disk = state_out.get_last_disk_rod(self.rod_input)
-            state_out.put_disk_in_rod(self.rod_out, disk)
-            state_out.accumulate_cost(self.cost)
-            return state_out
+        if self.rod_input != self.rod_out:
+            # Mover el disco d de la varilla i a la j solo cambia su dígito en base k y dos claves de Zobrist
+            number_of_pegs = state_hanoi.number_of_pegs
+            powers = _POWERS_OF_THREE if number_of_pegs == 3 else _POWERS[number_of_pegs]
+            code = state_hanoi.code + (self.rod_out - self.rod_input) * powers[self.disk - 1]
+            keys = _ZOBRIST_KEYS[self.disk - 1]
+            hash_value = state_hanoi._hash ^ keys[self.rod_input] ^ keys[self.rod_out]
+            return StatesHanoi.from_code(code, state_hanoi.number_of_disks,
+                                         state_hanoi.accumulated_cost + self.cost, hash_value, number_of_pegs)
         return state_hanoi
 
 
+# Acciones compartidas por (disco, varilla de entrada, varilla de salida)
+_ACTIONS = {}
+
+# Acciones legales según el disco superior de cada varilla (0 si está vacía)
+_LEGAL_ACTIONS = {}
+
+# Tablas de la simetría de tres varillas por (varilla objetivo, primer disco, dígitos del bloque). El código se
+# procesa por bloques de `_SYMMETRY_CHUNK` dígitos para no recorrer los discos de a uno.
+_SYMMETRY_CHUNK = 8
+_SYMMETRY_CHUNK_SIZE = 3 ** _SYMMETRY_CHUNK
+_SYMMETRY_TABLES = {}
+
+
+def _three_peg_symmetry_tables(goal_peg: int, first_disk: int, width: int) -> tuple:
+    """
+    Obtiene las tablas para intercambiar las dos varillas libres en un bloque de dígitos de un código de tres
+    varillas.
+
+    Args:
+        goal_peg (int): Varilla donde está la torre en el objetivo.
+        first_disk (int): Cantidad de discos más chicos que el bloque.
+        width (int): Cantidad de dígitos del bloque.
+
+    Returns:
+        tuple: Para cada valor del bloque, la varilla del disco más grande del bloque que no está en la varilla
+        objetivo (-1 si no hay ninguno), el valor con las varillas libres intercambiadas y el cambio del hash de
+        Zobrist que produce el intercambio.
+    """
+    key = (goal_peg, first_disk, width)
+    tables = _SYMMETRY_TABLES.get(key)
+    if tables is None:
+        first_free, second_free = (peg for peg in range(3) if peg != goal_peg)
+        swap = {first_free: second_free, second_free: first_free, goal_peg: goal_peg}
+        _ensure_zobrist_keys(first_disk + width)
+        deltas = [_ZOBRIST_KEYS[first_disk + index][first_free] ^ _ZOBRIST_KEYS[first_disk + index][second_free]
+                  for index in range(width)]
+        top_pegs, swapped_values, hash_deltas = [], [], []
+        for value in range(3 ** width):
+            top_peg, swapped_value, hash_delta = -1, 0, 0
+            rest = value
+            for index in range(width):
+                rest, peg = divmod(rest, 3)
+                if peg != goal_peg:
+                    top_peg = peg
+                    hash_delta ^= deltas[index]
+                swapped_value += swap[peg] * _POWERS_OF_THREE[index]
+            top_pegs.append(top_peg)
+            swapped_values.append(swapped_value)
+            hash_deltas.append(hash_delta)
+        tables = _SYMMETRY_TABLES[key] = (tuple(top_pegs), tuple(swapped_values), tuple(hash_deltas))
+    return tables
+
+
+def legal_actions(tops: tuple) -> tuple:
+    """
+    Obtiene las acciones legales a partir del disco superior de cada varilla.
+
+    Las acciones legales solo dependen de los tres discos superiores, así que se calculan una vez por combinación
+    y se guardan en una tabla.
+
+    Args:
+        tops (tuple): Disco superior de cada varilla, 0 si la varilla está vacía. Su largo es la cantidad de
+            varillas.
+
+    Returns:
+        tuple: Acciones legales, en el orden varilla de entrada y luego varilla de salida.
+    """
+    actions = _LEGAL_ACTIONS.get(tops)
+    if actions is None:
+        actions_list = []
+        number_of_pegs = len(tops)
+        for i in range(number_of_pegs):
+            disk = tops[i]
+            if not disk:
+                continue
+            for j in range(number_of_pegs):
+                if j != i and (not tops[j] or tops[j] > disk):
+                    actions_list.append(ActionHanoi.get(disk, i, j))
+        actions = _LEGAL_ACTIONS[tops] = tuple(actions_list)
+    return actions
+
+
 class ProblemHanoi(aima.Problem):
     """
     Clase que define el problema de la Torre de Hanoi.
@@ -302,17 +701,117 @@ class ProblemHanoi(aima.Problem):
     Attributes:
         initial (hanoi_states.StatesHanoi): El estado inicial del problema.
         goal (hanoi_states.StatesHanoi): El estado objetivo del problema.
+        free_pegs (tuple): Varillas vacías en el objetivo, que son intercambiables entre sí.
+        symmetry (bool): Si las búsquedas identifican los estados que solo difieren en el orden de las varillas
+            intercambiables (ver `canonical`).
     """
 
-    def __init__(self, initial: StatesHanoi, goal: StatesHanoi):
+    def __init__(self, initial: StatesHanoi, goal: StatesHanoi, symmetry: bool = False):
         """
         Inicializa el problema de la Torre de Hanoi.
 
         Args:
             initial (StatesHanoi): El estado inicial del problema.
             goal (StatesHanoi): El estado objetivo del problema.
+            symmetry (bool): Activa la reducción por simetría de varillas. Solo tiene efecto si el objetivo deja al
+                menos dos varillas vacías.
         """
         super().__init__(initial=initial, goal=goal)
+        self.free_pegs = tuple(peg for peg, rod in enumerate(goal.rods) if not rod)
+        self._free_peg_set = frozenset(self.free_pegs)
+        self.symmetry = symmetry and len(self.free_pegs) > 1
+        self._symmetry_chunks = None
+        if self.symmetry and goal.number_of_pegs == 3:
+            _ensure_powers_of_three(_SYMMETRY_CHUNK)
+            goal_peg = 3 - sum(self.free_pegs)
+            number_of_disks = goal.number_of_disks
+            self._symmetry_chunks = [
+                _three_peg_symmetry_tables(goal_peg, first_disk, min(_SYMMETRY_CHUNK, number_of_disks - first_disk))
+                for first_disk in range(0, number_of_disks, _SYMMETRY_CHUNK)]
+
+    def canonical(self, state: StatesHanoi) -> StatesHanoi:
+        """
+        Obtiene el representante de un estado bajo las permutaciones de las varillas intercambiables.
+
+        Permutar las varillas vacías en el objetivo deja fijo al objetivo, así que no cambia la distancia de ningún
+        estado hasta él. El representante se obtiene renombrando esas varillas en el orden en que aparecen al
+        recorrer los discos del más grande al más chico, y las búsquedas lo usan como clave de la lista cerrada y
+        de los costos para guardar una sola vez cada clase de estados simétricos.
+
+        Como la búsqueda guarda en cada nodo el estado real y solo usa el representante como clave, el camino
+        reconstruido ya tiene los movimientos del problema original y no hace falta traducirlos.
+
+        Args:
+            state (StatesHanoi): Estado a normalizar.
+
+        Returns:
+            StatesHanoi: El mismo estado si ya es el representante, o uno nuevo con el mismo costo acumulado.
+        """
+        if self._symmetry_chunks is not None:
+            return self._canonical_three_pegs(state)
+        free_pegs = self.free_pegs
+        free_peg_set = self._free_peg_set
+        disk_pegs = state.get_disk_pegs()
+        relabel = {}
+        for disk in range(state.number_of_disks, 0, -1):
+            peg = disk_pegs[disk - 1]
+            if peg in free_peg_set and peg not in relabel:
+                relabel[peg] = free_pegs[len(relabel)]
+                if len(relabel) == len(free_pegs):
+                    break
+        if all(peg == label for peg, label in relabel.items()):
+            return state
+
+        powers = _POWERS[state.number_of_pegs]
+        code = state.code
+        hash_value = state._hash
+        for index, peg in enumerate(disk_pegs):
+            label = relabel.get(peg, peg)
+            if label != peg:
+                code += (label - peg) * powers[index]
+                keys = _ZOBRIST_KEYS[index]
+                hash_value ^= keys[peg] ^ keys[label]
+        return StatesHanoi.from_code(code, state.number_of_disks, state.accumulated_cost, hash_value,
+                                     state.number_of_pegs)
+
+    def _canonical_three_pegs(self, state: StatesHanoi) -> StatesHanoi:
+        """
+        Versión de `canonical` para tres varillas con la torre objetivo en una sola varilla.
+
+        Con dos varillas libres el representante es el estado en el que el disco más grande fuera de la varilla
+        objetivo está en la primera varilla libre. Ese disco y el estado con las varillas libres intercambiadas se
+        obtienen por bloques de dígitos del código con las tablas de `_three_peg_symmetry_tables`.
+
+        Args:
+            state (StatesHanoi): Estado a normalizar.
+
+        Returns:
+            StatesHanoi: El mismo estado si ya es el representante, o el estado con las varillas libres
+            intercambiadas.
+        """
+        chunks = self._symmetry_chunks
+        values = []
+        rest = state.code
+        for _ in chunks:
+            rest, value = divmod(rest, _SYMMETRY_CHUNK_SIZE)
+            values.append(value)
+        for index in range(len(chunks) - 1, -1, -1):
+            top_peg = chunks[index][0][values[index]]
+            if top_peg >= 0:
+                break
+        else:
+            return state
+        if top_peg == self.free_pegs[0]:
+            return state
+
+        code = 0
+        hash_value = state._hash
+        scale = 1
+        for (_, swapped_values, hash_deltas), value in zip(chunks, values):
+            code += swapped_values[value] * scale
+            hash_value ^= hash_deltas[value]
+            scale *= _SYMMETRY_CHUNK_SIZE
+        return StatesHanoi.from_code(code, state.number_of_disks, state.accumulated_cost, hash_value, 3)
 
     def actions(self, state: StatesHanoi):
         """
@@ -322,19 +821,9 @@ class ProblemHanoi(aima.Problem):
             state (StatesHanoi): Estado actual de la Torre de Hanoi.
 
         Returns:
-            list: Lista con todas las acciones posibles.
+            tuple: Tupla con todas las acciones posibles.
         """
-        actions_list = []
-        for i in range(3):
-            for j in range(3):
-                disk = state.get_last_disk_rod(i, peek=True)
-                if disk:
-                    if state.check_valid_disk_in_rod(j, disk):
-                        actions_list.append(ActionHanoi(disk, i, j))
-                else:
-                    break
-
-        return actions_list
+        return legal_actions(state.top_disks())
 
     def result(self, state: StatesHanoi, action: ActionHanoi):
         """
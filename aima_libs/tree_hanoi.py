@@ -1,4 +1,6 @@
 import json
+from array import array
+
 import aima_libs.aima as aima
 import aima_libs.hanoi_states as hanoi_states
 
@@ -51,5 +53,228 @@ class NodeHanoi(aima.Node):
             json.dump(initial_state, file)
 
         with open(sequence_file, "w") as file:
-            sequence = [node.action.action_dict for node in list_solution[1:]]
+            sequence = [dict(node.action.action_dict) for node in list_solution[1:]]
             json.dump(sequence, file, indent=2)
+
+
+class NodePool:
+    """
+    Árbol de búsqueda guardado en arreglos paralelos, con una posición por nodo.
+
+    Cada nodo ocupa unos 40 bytes repartidos entre el código y el hash de su estado, el índice de su padre, el código
+    de su acción, su costo y su profundidad, en lugar de un objeto con `__dict__` y un `StatesHanoi` propio. Los
+    nodos se usan a través de vistas `PooledNodeHanoi`, que se pueden descartar y volver a crear a partir del índice.
+
+    Attributes:
+        number_of_disks (int): Cantidad de discos de los estados.
+        number_of_pegs (int): Cantidad de varillas de los estados.
+        codes (array | list): Código del estado de cada nodo. Es una lista si los códigos no entran en 64 bits.
+        hashes (array): Hash de Zobrist del estado de cada nodo.
+        parents (array): Índice del padre de cada nodo, -1 en la raíz.
+        action_codes (array): Código de la acción de cada nodo, 0 en la raíz (ver `actions`).
+        costs (array): Costo del camino hasta cada nodo.
+        depths (array): Profundidad de cada nodo.
+        actions (list): Acciones usadas, indexadas por su código. La posición 0 es None.
+    """
+
+    def __init__(self, number_of_disks: int, number_of_pegs: int = 3):
+        self.number_of_disks = number_of_disks
+        self.number_of_pegs = number_of_pegs
+        self.codes = array("Q") if number_of_pegs ** number_of_disks <= 1 << 64 else []
+        self.hashes = array("Q")
+        self.parents = array("q")
+        self.action_codes = array("H")
+        self.costs = array("d")
+        self.depths = array("I")
+        self.actions = [None]
+        self._action_index = {}
+
+    def add(self, state: hanoi_states.StatesHanoi, parent: int = -1, action=None) -> int:
+        """
+        Agrega un nodo al árbol.
+
+        Args:
+            state (hanoi_states.StatesHanoi): Estado del nodo. Su costo acumulado es el costo del camino.
+            parent (int): Índice del nodo padre, -1 para la raíz.
+            action (hanoi_states.ActionHanoi | None): Acción realizada para llegar al nodo.
+
+        Returns:
+            int: Índice del nodo.
+        """
+        action_code = 0
+        if action is not None:
+            action_code = self._action_index.get(action)
+            if action_code is None:
+                action_code = self._action_index[action] = len(self.actions)
+                self.actions.append(action)
+        self.codes.append(state.code)
+        self.hashes.append(hash(state))
+        self.parents.append(parent)
+        self.action_codes.append(action_code)
+        self.costs.append(state.accumulated_cost)
+        self.depths.append(self.depths[parent] + 1 if parent >= 0 else 0)
+        return len(self.parents) - 1
+
+    def root(self, state: hanoi_states.StatesHanoi) -> "PooledNodeHanoi":
+        """
+        Agrega un nodo raíz y devuelve su vista.
+
+        Args:
+            state (hanoi_states.StatesHanoi): Estado inicial de la búsqueda.
+
+        Returns:
+            PooledNodeHanoi: Vista del nodo raíz.
+        """
+        return PooledNodeHanoi(self, self.add(state), state)
+
+    def state(self, index: int) -> hanoi_states.StatesHanoi:
+        """
+        Reconstruye el estado de un nodo, con su costo de camino como costo acumulado.
+        """
+        return hanoi_states.StatesHanoi.from_code(self.codes[index], self.number_of_disks, self.costs[index],
+                                                  self.hashes[index], self.number_of_pegs)
+
+    def __len__(self):
+        return len(self.parents)
+
+
+class PooledNodeHanoi:
+    """
+    Vista de un nodo de un `NodePool`, con la misma interfaz que `NodeHanoi`.
+
+    Un hijo recién generado todavía no ocupa lugar en el árbol: la vista guarda su estado, la vista de su padre y la
+    acción, y recién se agrega al árbol cuando se pide su índice (al expandirlo o al reconstruir el camino). Así el
+    árbol solo contiene los nodos expandidos y los hijos descartados como duplicados no dejan rastro.
+
+    Mientras un hijo está vivo conserva la vista de su padre, de modo que `parent` devuelve el mismo objeto y los
+    valores que las búsquedas guardan en él (como `f` y `h` de `aima.memoize`). Al expandir un nodo se suelta la
+    vista de su propio padre, así que las vistas vivas no forman cadenas hasta la raíz.
+    """
+
+    __slots__ = ("pool", "_index", "_state", "_parent_view", "_action", "f", "h")
+
+    def __init__(self, pool: NodePool, index: int = None, state: hanoi_states.StatesHanoi = None,
+                 parent_view: "PooledNodeHanoi" = None, action: hanoi_states.ActionHanoi = None):
+        """
+        Crea la vista de un nodo.
+
+        Args:
+            pool (NodePool): Árbol que contiene (o va a contener) al nodo.
+            index (int | None): Índice del nodo, o None si todavía no está en el árbol.
+            state (hanoi_states.StatesHanoi | None): Estado del nodo. Es obligatorio si index es None.
+            parent_view (PooledNodeHanoi | None): Vista del padre. Es obligatoria si index es None, salvo en la raíz.
+            action (hanoi_states.ActionHanoi | None): Acción que lleva del padre al nodo, si index es None.
+        """
+        self.pool = pool
+        self._index = index
+        self._state = state
+        self._parent_view = parent_view
+        self._action = action
+
+    @property
+    def index(self) -> int:
+        if self._index is None:
+            parent = self._parent_view.index if self._parent_view is not None else -1
+            self._index = self.pool.add(self._state, parent, self._action)
+        return self._index
+
+    @property
+    def state(self) -> hanoi_states.StatesHanoi:
+        if self._state is None:
+            self._state = self.pool.state(self._index)
+        return self._state
+
+    @property
+    def parent(self):
+        if self._parent_view is not None:
+            return self._parent_view
+        if self._index is None:
+            return None
+        parent = self.pool.parents[self._index]
+        return PooledNodeHanoi(self.pool, parent) if parent >= 0 else None
+
+    @property
+    def action(self):
+        if self._index is None:
+            return self._action
+        return self.pool.actions[self.pool.action_codes[self._index]]
+
+    @property
+    def path_cost(self) -> float:
+        if self._index is None:
+            return self._state.accumulated_cost
+        return self.pool.costs[self._index]
+
+    @property
+    def depth(self) -> int:
+        if self._index is None:
+            return self._parent_view.depth + 1 if self._parent_view is not None else 0
+        return self.pool.depths[self._index]
+
+    def __repr__(self):
+        return "<Node {}>".format(self.state)
+
+    def __lt__(self, node):
+        return self.state < node.state
+
+    def __eq__(self, other):
+        return isinstance(other, (PooledNodeHanoi, aima.Node)) and self.state == other.state
+
+    def __hash__(self):
+        return hash(self.state)
+
+    def expand(self, problem: hanoi_states.ProblemHanoi) -> list:
+        """
+        Genera los nodos alcanzables en un paso desde este nodo, agregando este nodo al árbol.
+
+        Args:
+            problem (hanoi_states.ProblemHanoi): Problema de la Torre de Hanoi.
+
+        Returns:
+            list: Vistas de los nodos hijos.
+        """
+        self.index  # el nodo entra al árbol antes de soltar la vista de su padre
+        self._parent_view = None
+        state = self.state
+        return [PooledNodeHanoi(self.pool, None, problem.result(state, action), self, action)
+                for action in problem.actions(state)]
+
+    def child_node(self, problem: hanoi_states.ProblemHanoi, action: hanoi_states.ActionHanoi):
+        """
+        Genera el nodo hijo a partir de una acción.
+
+        Args:
+            problem (hanoi_states.ProblemHanoi): Problema de la Torre de Hanoi.
+            action (hanoi_states.ActionHanoi): Acción a aplicar.
+
+        Returns:
+            PooledNodeHanoi: Vista del nodo hijo.
+        """
+        return PooledNodeHanoi(self.pool, None, problem.result(self.state, action), self, action)
+
+    def path(self) -> list:
+        """
+        Obtiene las vistas de los nodos del camino desde la raíz hasta este nodo.
+        """
+        pool = self.pool
+        indices = []
+        index = self.index
+        while index >= 0:
+            indices.append(index)
+            index = pool.parents[index]
+        return [PooledNodeHanoi(pool, index) for index in reversed(indices)]
+
+    def solution(self) -> list:
+        """
+        Obtiene la secuencia de acciones desde la raíz hasta este nodo.
+        """
+        pool = self.pool
+        actions = []
+        index = self.index
+        while pool.parents[index] >= 0:
+            actions.append(pool.actions[pool.action_codes[index]])
+            index = pool.parents[index]
+        actions.reverse()
+        return actions
+
+    generate_solution_for_simulator = NodeHanoi.generate_solution_for_simulator
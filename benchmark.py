@@ -0,0 +1,221 @@
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+from aima_libs import hanoi_frontier, hanoi_numpy, hanoi_pattern_db
+from aima_libs.hanoi_closed_form import optimal_distance
+from aima_libs.hanoi_states import ProblemHanoi, StatesHanoi
+from main import a_star, busqueda_bidireccional, hanoi_heuristic, hanoi_heuristic_2
+
+
+def benchmark_heuristicas(args):
+    """
+    Compara la evaluación estado por estado de las heurísticas con la versión por lotes de NumPy.
+    Ambas parten del mismo arreglo de códigos, así que los tiempos incluyen la decodificación.
+    """
+    rng = np.random.default_rng(args.seed)
+    n = args.discos
+    goal_state = StatesHanoi([], [], list(range(n, 0, -1)), max_disks=n)
+    pares = [
+        ("H1", hanoi_heuristic, hanoi_numpy.hanoi_heuristic_batch),
+        ("H2", hanoi_heuristic_2, hanoi_numpy.hanoi_heuristic_2_batch),
+    ]
+
+    print(f"== HEURÍSTICAS: ESTADO POR ESTADO VS LOTES ({n} discos) ==")
+    for cantidad in args.cantidades:
+        ranks = rng.integers(0, 3 ** n, size=cantidad, dtype=np.int64)
+        for nombre, heuristica, heuristica_lote in pares:
+            inicio = time.perf_counter()
+            individual = [heuristica(StatesHanoi.from_code(int(rank), n), goal_state) for rank in ranks]
+            tiempo_individual = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            lote = heuristica_lote(ranks, goal_state)
+            tiempo_lote = time.perf_counter() - inicio
+
+            if not np.array_equal(lote, individual):
+                raise AssertionError(f"{nombre}: la versión por lotes no coincide con la individual")
+            print(f"\n--- {nombre} con {cantidad} estados ---")
+            print(f"  → Estado por estado: {cantidad / tiempo_individual:,.0f} estados/s")
+            print(f"  → Por lotes: {cantidad / tiempo_lote:,.0f} estados/s")
+            print(f"  → Aceleración: {tiempo_individual / tiempo_lote:.1f}x")
+
+
+def problema_torre(n: int) -> ProblemHanoi:
+    """
+    Problema estándar: mover la torre completa de la primera a la tercera varilla.
+    """
+    initial_state = StatesHanoi(list(range(n, 0, -1)), [], [], max_disks=n)
+    goal_state = StatesHanoi([], [], list(range(n, 0, -1)), max_disks=n)
+    return ProblemHanoi(initial=initial_state, goal=goal_state)
+
+
+def benchmark_pdb(args):
+    """
+    Construye (o carga) las bases de datos de patrones y compara los nodos expandidos por a_star contra H1 y H2.
+    """
+    problem = problema_torre(args.discos)
+    grupos = hanoi_pattern_db.default_groups(args.discos, args.tamano_grupo)
+    varillas_objetivo = problem.goal.get_disk_pegs()
+    existentes = [hanoi_pattern_db.table_path(
+        len(grupo), sum(varillas_objetivo[disco - 1] * 3 ** i for i, disco in enumerate(sorted(grupo))),
+        args.directorio) for grupo in grupos]
+    cargadas = all(os.path.exists(path) for path in existentes)
+
+    inicio = time.perf_counter()
+    heuristica_pdb = hanoi_pattern_db.PatternDatabaseHeuristic(problem.goal, grupos, args.modo, args.directorio)
+    tiempo_pdb = time.perf_counter() - inicio
+
+    print(f"== BASES DE DATOS DE PATRONES ({args.discos} discos) ==")
+    print(f"  → Grupos: {[f'{min(grupo)}-{max(grupo)}' for grupo in grupos]} ({args.modo})")
+    print(f"  → {'Carga' if cargadas else 'Construcción'}: {tiempo_pdb:.3f}s")
+    print(f"  → Tamaño de las tablas: {heuristica_pdb.nbytes / 1024:.2f} KB")
+
+    expandidos = {}
+    for nombre, heuristica in (("H1", hanoi_heuristic), ("H2", hanoi_heuristic_2), ("PDB", heuristica_pdb)):
+        inicio = time.perf_counter()
+        _, movimientos, _, cerrada = a_star(problem, heuristica)
+        tiempo = time.perf_counter() - inicio
+        expandidos[nombre] = len(cerrada)
+        print(f"\n--- a_star con {nombre} ---")
+        print(f"  → Movimientos: {len(movimientos)}")
+        print(f"  → Nodos expandidos: {len(cerrada)}")
+        print(f"  → Tiempo: {tiempo:.3f}s")
+    mejor = min(expandidos["H1"], expandidos["H2"])
+    print(f"\n  → Reducción de nodos expandidos con PDB: {100 * (1 - expandidos['PDB'] / mejor):.1f}%")
+
+
+def benchmark_tabla(args):
+    """
+    Mide la carga (o construcción) de la tabla de distancias de un objetivo y el descenso desde estados iniciales al
+    azar, comprobando que cada camino tenga la longitud óptima.
+    """
+    rng = np.random.default_rng(args.seed)
+    n = args.discos
+    goal_state = problema_torre(n).goal
+    construida = not os.path.exists(hanoi_pattern_db.table_path(n, goal_state.code, args.directorio))
+
+    inicio = time.perf_counter()
+    tabla = hanoi_pattern_db.DistanceTable(goal_state, args.directorio)
+    tiempo_tabla = time.perf_counter() - inicio
+
+    iniciales = [StatesHanoi.from_code(int(rank), n) for rank in rng.integers(0, 3 ** n, size=args.consultas)]
+    movimientos = 0
+    inicio = time.perf_counter()
+    for inicial in iniciales:
+        movimientos += sum(1 for _ in tabla.descend(inicial))
+    tiempo_descenso = time.perf_counter() - inicio
+
+    esperados = sum(optimal_distance(inicial.get_disk_pegs(), goal_state.get_disk_pegs()) for inicial in iniciales)
+    if movimientos != esperados:
+        raise AssertionError("El descenso por la tabla no dio caminos óptimos")
+    print(f"== TABLA DE DISTANCIAS ({n} discos) ==")
+    print(f"  → {'Construcción' if construida else 'Carga'}: {tiempo_tabla:.3f}s")
+    print(f"  → Descenso: {args.consultas} consultas, {movimientos} movimientos en {tiempo_descenso:.3f}s")
+    print(f"  → {1e6 * tiempo_descenso / args.consultas:,.0f} µs por consulta, "
+          f"{movimientos / tiempo_descenso:,.0f} movimientos/s")
+
+
+def benchmark_bidireccional(args):
+    """
+    Compara los nodos expandidos y la memoria pico de a_star y de la búsqueda bidireccional en las mismas instancias:
+    la torre completa y pares de estados al azar.
+    """
+    rng = np.random.default_rng(args.seed)
+    n = args.discos
+    problemas = [("torre", problema_torre(n))]
+    for i, (inicial, objetivo) in enumerate(rng.integers(0, 3 ** n, size=(args.instancias, 2))):
+        problemas.append((f"azar {i + 1}", ProblemHanoi(initial=StatesHanoi.from_code(int(inicial), n),
+                                                         goal=StatesHanoi.from_code(int(objetivo), n))))
+    motores = (("a_star H1", a_star, hanoi_heuristic), ("a_star H2", a_star, hanoi_heuristic_2),
+               ("bidireccional", busqueda_bidireccional, None))
+
+    print(f"== BÚSQUEDA BIDIRECCIONAL VS A* ({n} discos) ==")
+    for nombre_problema, problem in problemas:
+        print(f"\n--- Instancia {nombre_problema} ---")
+        for nombre, motor, heuristica in motores:
+            tracemalloc.start()
+            inicio = time.perf_counter()
+            _, movimientos, _, cerrada = motor(problem, heuristica)
+            tiempo = time.perf_counter() - inicio
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  → {nombre}: {len(movimientos)} movimientos, {len(cerrada)} nodos expandidos, "
+                  f"{pico / 1024:.0f} KB pico, {tiempo:.3f}s")
+
+
+def benchmark_frontera(args):
+    """
+    Recorre en anchura el problema de la torre completa con las capas en disco y reporta la distancia al objetivo,
+    el tamaño de las capas y el volumen de entrada/salida.
+    """
+    problem = problema_torre(args.discos)
+    objetivo = None if args.exhaustiva else problem.goal
+    inicio = time.perf_counter()
+    resultado = hanoi_frontier.frontier_search(problem.initial, objetivo, args.memoria_mb * 1024 * 1024,
+                                               args.directorio)
+    tiempo = time.perf_counter() - inicio
+
+    print(f"== BÚSQUEDA POR FRONTERAS ({args.discos} discos, {args.memoria_mb} MB) ==")
+    if resultado.distance is not None:
+        print(f"  → Distancia al objetivo: {resultado.distance}")
+    print(f"  → Capas: {len(resultado.layer_sizes)}")
+    print(f"  → Estados recorridos: {sum(resultado.layer_sizes)}")
+    print(f"  → Capa más grande: {max(resultado.layer_sizes)} estados")
+    print(f"  → Leídos de disco: {resultado.bytes_read / 1024 ** 2:.1f} MB")
+    print(f"  → Escritos en disco: {resultado.bytes_written / 1024 ** 2:.1f} MB")
+    print(f"  → Tiempo: {tiempo:.3f}s")
+    if args.mostrar_capas:
+        for profundidad, tamano in enumerate(resultado.layer_sizes):
+            print(f"    capa {profundidad}: {tamano}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks del solver de la Torre de Hanoi")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    parser_heuristicas = subparsers.add_parser(
+        "heuristicas", help="Throughput de las heurísticas estado por estado y por lotes")
+    parser_heuristicas.add_argument("--discos", type=int, default=15)
+    parser_heuristicas.add_argument("--cantidades", type=int, nargs="+", default=[10**4, 10**5, 10**6])
+    parser_heuristicas.add_argument("--seed", type=int, default=0)
+    parser_heuristicas.set_defaults(func=benchmark_heuristicas)
+
+    parser_pdb = subparsers.add_parser(
+        "pdb", help="Construcción de bases de datos de patrones y nodos expandidos por a_star")
+    parser_pdb.add_argument("--discos", type=int, default=10)
+    parser_pdb.add_argument("--tamano-grupo", type=int, default=6)
+    parser_pdb.add_argument("--modo", choices=["sum", "max"], default="sum")
+    parser_pdb.add_argument("--directorio", default=hanoi_pattern_db.DEFAULT_DIRECTORY)
+    parser_pdb.set_defaults(func=benchmark_pdb)
+
+    parser_tabla = subparsers.add_parser(
+        "tabla", help="Carga de la tabla de distancias y descenso desde estados al azar")
+    parser_tabla.add_argument("--discos", type=int, default=12)
+    parser_tabla.add_argument("--consultas", type=int, default=1000)
+    parser_tabla.add_argument("--seed", type=int, default=0)
+    parser_tabla.add_argument("--directorio", default=hanoi_pattern_db.DEFAULT_DIRECTORY)
+    parser_tabla.set_defaults(func=benchmark_tabla)
+
+    parser_bidireccional = subparsers.add_parser(
+        "bidireccional", help="Nodos expandidos por la búsqueda bidireccional y por a_star")
+    parser_bidireccional.add_argument("--discos", type=int, default=8)
+    parser_bidireccional.add_argument("--instancias", type=int, default=3)
+    parser_bidireccional.add_argument("--seed", type=int, default=0)
+    parser_bidireccional.set_defaults(func=benchmark_bidireccional)
+
+    parser_frontera = subparsers.add_parser(
+        "frontera", help="Búsqueda en anchura por fronteras con detección de duplicados en disco")
+    parser_frontera.add_argument("--discos", type=int, default=12)
+    parser_frontera.add_argument("--memoria-mb", type=int, default=64)
+    parser_frontera.add_argument("--directorio", default=None)
+    parser_frontera.add_argument("--exhaustiva", action="store_true",
+                                 help="Recorre todos los estados en lugar de parar en el objetivo")
+    parser_frontera.add_argument("--mostrar-capas", action="store_true")
+    parser_frontera.set_defaults(func=benchmark_frontera)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -1,8 +1,15 @@
+from aima_libs import aima, hanoi_closed_sets, hanoi_hda, hanoi_numpy, hanoi_open_lists
+from aima_libs.hanoi_closed_form import optimal_distance, optimal_moves
+from aima_libs.hanoi_frame_stewart import frame_stewart_moves
+from aima_libs.hanoi_pattern_db import DistanceTable
 from aima_libs.hanoi_states import ProblemHanoi, StatesHanoi, ActionHanoi
+from aima_libs.tree_hanoi import NodeHanoi, NodePool
+import abc
 import heapq
 import json
 import itertools
 import logging
+import math
 import time
 import tracemalloc
 
@@ -17,95 +24,731 @@ logger = logging.getLogger(__name__)
 counter = itertools.count()
 
 
-def calc_f(problem: ProblemHanoi, accion: ActionHanoi, estado_actual: StatesHanoi, nuevo_estado: StatesHanoi, heuristic) -> tuple:
+def calc_f(problem: ProblemHanoi, accion: ActionHanoi, estado_actual: StatesHanoi, nuevo_estado: StatesHanoi,
+           evaluador, h_actual) -> tuple:
     """
     Calculate the f value for the A* algorithm.
-    :param estado: The current state of the Tower of Hanoi.
-    :param accion: The action taken to reach the current state.
-    :param inicial: The initial state of the Tower of Hanoi.
-    :return: The f value.
+    :param problem: The Tower of Hanoi problem instance.
+    :param accion: The action taken to reach the new state.
+    :param estado_actual: The state the action is applied to.
+    :param nuevo_estado: The state reached with the action.
+    :param evaluador: The heuristic evaluator returned by preparar_heuristica.
+    :param h_actual: The heuristic value of estado_actual.
+    :return: The g, h and f values of the new state.
     """
     g = problem.path_cost(estado_actual, accion)
-    h = heuristic(nuevo_estado, problem.goal)
+    h = evaluador.delta(h_actual, estado_actual, accion, nuevo_estado)
     return g, h, g + h
 
 
-def a_star(problem: ProblemHanoi, heuristic) -> tuple[StatesHanoi, list]:
+def reconstruir_movimientos(enlace) -> list:
+    """
+    Rebuild the list of movements from the parent links stored in the open list.
+    Each link is a tuple (action, parent link) and the root has no link, so the
+    frontier shares the common prefix of every path instead of copying it.
+    :param enlace: The link of the node that reached the goal.
+    :return: The list of movements, in the format read by the simulator.
+    """
+    acciones = []
+    while enlace is not None:
+        accion, enlace = enlace
+        acciones.append(accion)
+    acciones.reverse()
+    return [accion.action_dict for accion in acciones]
+
+
+def a_star(problem: ProblemHanoi, heuristic, almacenamiento="hash", desempate=None) -> tuple[StatesHanoi, list]:
     """
     A* search algorithm for the Tower of Hanoi problem.
     Profe segui pseudocódigo para este algoritmo, A* es un algoritmo que ya he usado en el pasado,
     para el path planning en robotica. Para la implementacion de este algoritmo, tuve activado el
     copilot.
     :param problem: The Tower of Hanoi problem instance.
+    :param almacenamiento: "hash" to keep the closed list and best costs in a set and a dict,
+    "dense" for a bit array and an integer array indexed by state code, or "bloom" (or a
+    configured BloomClosedSet) for an approximate closed list of fixed size (see hanoi_closed_sets).
+    With problem.symmetry the closed list and best costs are keyed by problem.canonical, so
+    states that only differ by interchangeable pegs are stored and expanded once. The path is
+    still rebuilt from the actual states, so no move has to be remapped.
+    :param desempate: None for a binary heap that breaks ties in f in FIFO order, or
+    "fifo", "lifo", "min_h" or "max_h" for an open list of per-f buckets that breaks
+    ties that way (see hanoi_open_lists).
     :return: A tuple containing the solution state and the list of movements.
     """
 
-    abierta = []
-    movimientos_previos = []
-    g_inicial, _, f_inicial = calc_f(problem, problem.actions(problem.initial)
-                                     [0], problem.initial, problem.initial, heuristic)
-    heapq.heappush(abierta, (f_inicial, next(counter), movimientos_previos,
-                   problem.initial))
-    cerrada = set()
-    mejores_costos = {problem.initial: g_inicial}
+    abierta = hanoi_open_lists.open_list_for(desempate)
+    evaluador = preparar_heuristica(heuristic, problem)
+    g_inicial = problem.initial.accumulated_cost
+    h_inicial = evaluador.inicial(problem.initial)
+    abierta.push((g_inicial + h_inicial, next(counter), None, problem.initial), h_inicial)
+    numero_discos = problem.initial.number_of_disks
+    varillas = problem.initial.number_of_pegs
+    cerrada = hanoi_closed_sets.closed_set_for(numero_discos, almacenamiento, varillas)
+    mejores_costos = hanoi_closed_sets.cost_table_for(numero_discos, almacenamiento, varillas)
+    canonica = problem.canonical if problem.symmetry else None
+    mejores_costos[canonica(problem.initial) if canonica else problem.initial] = g_inicial
     while abierta:
 
-        f, _, movimientos_previos, actual = heapq.heappop(abierta)
+        f, _, enlace, actual = abierta.pop()
 
         if actual == problem.goal:
-            return actual, movimientos_previos, abierta, cerrada
-        if actual in cerrada:
+            return actual, reconstruir_movimientos(enlace), abierta, cerrada
+        clave = canonica(actual) if canonica else actual
+        if clave in cerrada:
             continue
-        cerrada.add(actual)
+        cerrada.add(clave)
+        h_actual = f - actual.accumulated_cost
         for accion in problem.actions(actual):
-            nuevo_movimiento = {
-                "type": "movement",
-                "disk": accion.disk,
-                "peg_start": accion.rod_input+1,
-                "peg_end": accion.rod_out+1,
-            }
             nuevo_estado = problem.result(actual, accion)
             nuevo_g, nuevo_h, nuevo_f = calc_f(
-                problem, accion, actual, nuevo_estado, heuristic)
-            if nuevo_estado not in mejores_costos or nuevo_g < mejores_costos[nuevo_estado]:
-                mejores_costos[nuevo_estado] = nuevo_g
-                heapq.heappush(abierta, (nuevo_f, next(counter), movimientos_previos + [nuevo_movimiento],
-                               nuevo_estado))
-    return None, []
-
-
-def basic_a_star(problem: ProblemHanoi, heuristic) -> tuple[StatesHanoi, list]:
-    abierta = []
-    movimientos_previos = []
-    g_inicial, _, f_inicial = calc_f(problem, problem.actions(problem.initial)
-                                     [0], problem.initial, problem.initial, heuristic)
-    heapq.heappush(abierta, (f_inicial, next(counter), movimientos_previos,
-                   problem.initial))
-    cerrada = set()
+                problem, accion, actual, nuevo_estado, evaluador, h_actual)
+            clave = canonica(nuevo_estado) if canonica else nuevo_estado
+            if clave not in mejores_costos or nuevo_g < mejores_costos[clave]:
+                mejores_costos[clave] = nuevo_g
+                abierta.push((nuevo_f, next(counter), (accion, enlace), nuevo_estado), nuevo_h)
+    return None, [], abierta, cerrada
+
+
+def basic_a_star(problem: ProblemHanoi, heuristic, almacenamiento="hash", desempate=None) -> tuple[StatesHanoi, list]:
+    abierta = hanoi_open_lists.open_list_for(desempate)
+    evaluador = preparar_heuristica(heuristic, problem)
+    g_inicial = problem.initial.accumulated_cost
+    h_inicial = evaluador.inicial(problem.initial)
+    abierta.push((g_inicial + h_inicial, next(counter), None, problem.initial), h_inicial)
+    cerrada = hanoi_closed_sets.closed_set_for(problem.initial.number_of_disks, almacenamiento,
+                                               problem.initial.number_of_pegs)
+    canonica = problem.canonical if problem.symmetry else None
     while abierta:
-        f, _, movimientos_previos, actual = heapq.heappop(abierta)
+        f, _, enlace, actual = abierta.pop()
 
         if actual == problem.goal:
-            return actual, movimientos_previos, abierta, cerrada
+            return actual, reconstruir_movimientos(enlace), abierta, cerrada
 
-        if actual in cerrada:
+        clave = canonica(actual) if canonica else actual
+        if clave in cerrada:
             continue
-        cerrada.add(actual)
+        cerrada.add(clave)
+        h_actual = f - actual.accumulated_cost
         for accion in problem.actions(actual):
             nuevo_estado = problem.result(actual, accion)
-            nuevo_movimiento = {
-                "type": "movement",
-                "disk": accion.disk,
-                "peg_start": accion.rod_input+1,
-                "peg_end": accion.rod_out+1,
-            }
-            _, _, nuevo_f = calc_f(
-                problem, accion, actual, nuevo_estado, heuristic)
-            if nuevo_estado not in cerrada:
-                heapq.heappush(abierta, (nuevo_f, next(counter), movimientos_previos + [nuevo_movimiento],
-                               nuevo_estado))
+            _, nuevo_h, nuevo_f = calc_f(
+                problem, accion, actual, nuevo_estado, evaluador, h_actual)
+            if (canonica(nuevo_estado) if canonica else nuevo_estado) not in cerrada:
+                abierta.push((nuevo_f, next(counter), (accion, enlace), nuevo_estado), nuevo_h)
+
+    return None, [], abierta, cerrada
+
+
+class Expandidos:
+    """
+    Closed-list stand-in for engines that do not keep their expanded states.
+    It only holds how many states were expanded, so len() reports them like the
+    closed list of the other engines.
+    """
+    __slots__ = ("cantidad",)
+
+    def __init__(self, cantidad: int):
+        self.cantidad = cantidad
+
+    def __len__(self):
+        return self.cantidad
+
+
+def ida_star(problem: ProblemHanoi, heuristic, max_transposiciones: int = 10**6) -> tuple:
+    """
+    Iterative-deepening A* for instances whose open and closed lists do not fit in memory.
+    Each iteration is a depth-first search bounded by f = g + h, and the next bound is the
+    smallest f that went over the current one. Only the current path is kept, on an explicit
+    stack, so memory grows with the depth of the solution and not with the frontier. States
+    already on the path are not expanded again.
+    A transposition table keeps the lowest g at which each state was expanded during the
+    iteration, keyed by the integer code of the state, and a state reached again with no
+    lower g is skipped. Once the table holds max_transposiciones states no new ones are
+    added. Each entry costs about 100 bytes, so the default cap of 10^6 states bounds the
+    table at roughly 100 MB. Without it the search is exponential in this graph full of
+    cycles: the 5-disk tower takes millions of expansions. With problem.symmetry the table
+    is keyed by the code of problem.canonical.
+    :param problem: The Tower of Hanoi problem instance.
+    :param heuristic: The heuristic, as accepted by preparar_heuristica.
+    :param max_transposiciones: Size cap of the transposition table, 0 to disable it.
+    :return: A tuple containing the solution state, the list of movements, an empty open list
+    and an Expandidos with the number of expansions over all iterations.
+    """
+    evaluador = preparar_heuristica(heuristic, problem)
+    inicial = problem.initial
+    transposiciones = {}
+    if inicial == problem.goal:
+        return inicial, [], [], Expandidos(0)
+    h_inicial = evaluador.inicial(inicial)
+    limite = inicial.accumulated_cost + h_inicial
+    canonica = problem.canonical if problem.symmetry else None
+    expandidos = 0
+    while True:
+        siguiente_limite = math.inf
+        transposiciones.clear()
+        # Each frame is (state, h, pending actions); acciones[i] leads from frame i to frame i + 1
+        pila = [(inicial, h_inicial, iter(problem.actions(inicial)))]
+        acciones = []
+        en_camino = {inicial}
+        expandidos += 1
+        while pila:
+            actual, h_actual, pendientes = pila[-1]
+            accion = next(pendientes, None)
+            if accion is None:
+                pila.pop()
+                en_camino.discard(actual)
+                if acciones:
+                    acciones.pop()
+                continue
+            nuevo_estado = problem.result(actual, accion)
+            if nuevo_estado in en_camino:
+                continue
+            nuevo_g, nuevo_h, nuevo_f = calc_f(
+                problem, accion, actual, nuevo_estado, evaluador, h_actual)
+            if nuevo_f > limite:
+                siguiente_limite = min(siguiente_limite, nuevo_f)
+                continue
+            if nuevo_estado == problem.goal:
+                acciones.append(accion)
+                logger.info(f"IDA* expanded {expandidos} nodes, final bound {limite}")
+                return nuevo_estado, [accion.action_dict for accion in acciones], [], Expandidos(expandidos)
+            if max_transposiciones:
+                clave = (canonica(nuevo_estado) if canonica else nuevo_estado).code
+                mejor_g = transposiciones.get(clave)
+                if mejor_g is not None and mejor_g <= nuevo_g:
+                    continue
+                if mejor_g is not None or len(transposiciones) < max_transposiciones:
+                    transposiciones[clave] = nuevo_g
+            expandidos += 1
+            acciones.append(accion)
+            en_camino.add(nuevo_estado)
+            pila.append((nuevo_estado, nuevo_h, iter(problem.actions(nuevo_estado))))
+        if siguiente_limite == math.inf:
+            logger.info(f"IDA* expanded {expandidos} nodes without reaching the goal")
+            return None, [], [], Expandidos(expandidos)
+        limite = siguiente_limite
+
+
+def ara_star(problem: ProblemHanoi, heuristic, peso_inicial: float = 3.0, paso_peso: float = 0.5,
+             tiempo_limite: float = None, al_mejorar=None) -> tuple:
+    """
+    Anytime Repairing A* (ARA*): weighted A* searches with a decreasing weight that reuse
+    the previous search effort.
+    Each search orders the open list by g + peso * h and stops as soon as no open state can
+    improve the current solution. States whose g improves after they were closed wait in an
+    inconsistent list; before the next search the weight is lowered, those states go back to
+    the open list and the open list is reordered, so only the changed part of the space is
+    expanded again. With an admissible and consistent heuristic each solution costs at most
+    cota times the optimum, where cota = min(peso, g(goal) / min(g + h) over the open and
+    inconsistent states), and the search ends when the bound reaches 1.
+    :param problem: The Tower of Hanoi problem instance.
+    :param heuristic: The heuristic, as accepted by preparar_heuristica.
+    :param peso_inicial: Weight of the first search.
+    :param paso_peso: How much the weight is lowered between searches, down to 1.
+    :param tiempo_limite: Time limit in seconds, or None to run until the solution is optimal.
+    The best solution found so far is returned when it runs out.
+    :param al_mejorar: Called as al_mejorar(movimientos, cota) with every improved solution.
+    By default the solution is written to simulator/sequenceara_star.json and logged.
+    :return: A tuple containing the solution state, the list of movements of the best solution,
+    the open list and the closed list of the last search.
+    """
+    if al_mejorar is None:
+        al_mejorar = escribir_mejor_solucion
+    limite = time.perf_counter() + tiempo_limite if tiempo_limite is not None else math.inf
+    evaluador = preparar_heuristica(heuristic, problem)
+    inicial, objetivo = problem.initial, problem.goal
+    # Each reached state maps to [g, h, action, parent state] of the best path found to it
+    nodos = {inicial: [0, evaluador.inicial(inicial), None, None]}
+    peso = max(peso_inicial, 1.0)
+    abierta = [(peso * nodos[inicial][1], next(counter), 0, inicial)]
+    cerrada = set()
+    inconsistentes = set()
+    mejor_costo = math.inf
+    movimientos = []
+    expandidos = 0
+
+    while True:
+        # Improve the path: weighted A* until the goal is better than every open state
+        completa = True
+        while abierta:
+            f, _, g, actual = abierta[0]
+            nodo = nodos[actual]
+            if actual in cerrada or g > nodo[0]:
+                heapq.heappop(abierta)
+                continue
+            if objetivo in nodos and nodos[objetivo][0] <= f:
+                break
+            if time.perf_counter() > limite:
+                completa = False
+                break
+            heapq.heappop(abierta)
+            cerrada.add(actual)
+            expandidos += 1
+            for accion in problem.actions(actual):
+                nuevo_estado = problem.result(actual, accion)
+                nuevo_g = g + accion.cost
+                nuevo_nodo = nodos.get(nuevo_estado)
+                if nuevo_nodo is None:
+                    nuevo_h = evaluador.delta(nodo[1], actual, accion, nuevo_estado)
+                    nuevo_nodo = nodos[nuevo_estado] = [nuevo_g, nuevo_h, accion, actual]
+                elif nuevo_g < nuevo_nodo[0]:
+                    nuevo_nodo[0], nuevo_nodo[2], nuevo_nodo[3] = nuevo_g, accion, actual
+                else:
+                    continue
+                if nuevo_estado in cerrada:
+                    inconsistentes.add(nuevo_estado)
+                else:
+                    heapq.heappush(abierta, (nuevo_g + peso * nuevo_nodo[1], next(counter), nuevo_g, nuevo_estado))
+
+        pendientes = {estado for _, _, g, estado in abierta if estado not in cerrada and g == nodos[estado][0]}
+        pendientes |= inconsistentes
+        costo = nodos[objetivo][0] if objetivo in nodos else math.inf
+        cota_inferior = min((nodos[estado][0] + nodos[estado][1] for estado in pendientes), default=math.inf)
+        if costo <= cota_inferior:
+            cota = 1.0
+        else:
+            cota = min(peso, costo / cota_inferior) if cota_inferior > 0 else peso
+        logger.info(f"ARA* search with weight {peso}: cost {costo}, suboptimality bound {cota:.3f} "
+                    f"after {expandidos} expansions")
+        if costo < mejor_costo:
+            mejor_costo = costo
+            movimientos = reconstruir_camino(nodos, objetivo)
+            al_mejorar(movimientos, cota)
+        if not completa or cota <= 1 or peso <= 1 or not pendientes:
+            break
+
+        # Lower the weight and reorder the open list, including the inconsistent states
+        peso = max(1.0, peso - paso_peso)
+        abierta = [(nodos[estado][0] + peso * nodos[estado][1], next(counter), nodos[estado][0], estado)
+                   for estado in pendientes]
+        heapq.heapify(abierta)
+        inconsistentes = set()
+        cerrada = set()
+
+    if mejor_costo == math.inf:
+        return None, [], abierta, cerrada
+    return objetivo, movimientos, abierta, cerrada
+
+
+def reconstruir_camino(nodos: dict, estado: StatesHanoi) -> list:
+    """
+    Rebuild the list of movements from the parent of each state.
+    :param nodos: Maps each state to [g, h, action, parent state], with None as the parent of the root.
+    :param estado: The last state of the path.
+    :return: The list of movements, in the format read by the simulator.
+    """
+    acciones = []
+    _, _, accion, padre = nodos[estado]
+    while padre is not None:
+        acciones.append(accion)
+        _, _, accion, padre = nodos[padre]
+    acciones.reverse()
+    return [accion.action_dict for accion in acciones]
+
+
+def escribir_mejor_solucion(movimientos: list, cota: float):
+    """
+    Write the best solution found so far by ara_star to the simulator file.
+    :param movimientos: The list of movements.
+    :param cota: The proven suboptimality bound of the solution.
+    """
+    escribir_secuencia(movimientos, f"simulator/sequence{ara_star.__name__}.json")
 
-    return None, []
+
+class NodoSMA:
+    """
+    Node of the SMA* search tree.
+    Children are kept by action. The actions never generated are in sin_generar and the
+    children dropped to free memory leave their backed-up f in olvidados, so they can be
+    generated again later.
+    """
+
+    __slots__ = ("estado", "g", "h", "f", "padre", "accion", "profundidad", "hijos", "sin_generar",
+                 "olvidados", "en_abierta", "version")
+
+    def __init__(self, estado: StatesHanoi, g, h, f, padre=None, accion: ActionHanoi = None):
+        self.estado = estado
+        self.g = g
+        self.h = h
+        self.f = f
+        self.padre = padre
+        self.accion = accion
+        self.profundidad = padre.profundidad + 1 if padre is not None else 0
+        self.hijos = {}
+        self.sin_generar = None
+        self.olvidados = {}
+        self.en_abierta = False
+        self.version = 0
+
+
+def sma_star(problem: ProblemHanoi, heuristic, max_nodes: int = 100000) -> tuple:
+    """
+    Simplified memory-bounded A* (SMA*) with a hard cap on the nodes kept in memory.
+    Successors are generated one at a time from the deepest open node with the lowest f.
+    When the tree holds more than max_nodes nodes, the shallowest open leaf with the highest
+    f is dropped and its f is backed up into its parent, which remembers it and can regenerate
+    the child later. Once every successor of a node has been generated, its f is raised to the
+    lowest f among its children and forgotten children, and the change is propagated up.
+    Successors that undo the last move, or reach a state already in memory with a g no higher
+    (which covers the other cycles along the path), are not generated. The search is optimal whenever the optimal path fits,
+    that is max_nodes is larger than its number of moves; otherwise the nodes at depth
+    max_nodes - 1 get f = inf and the search may fail. Besides the tree, the open lists keep
+    lazily deleted entries that are compacted to O(max_nodes), so memory stays bounded.
+    :param problem: The Tower of Hanoi problem instance.
+    :param heuristic: The heuristic, as accepted by preparar_heuristica.
+    :param max_nodes: Maximum number of nodes in memory, at least 2.
+    :return: A tuple containing the solution state, the list of movements, an empty open list
+    and the nodes in memory at the end, by state.
+    """
+    if max_nodes < 2:
+        raise ValueError("sma_star needs room for at least two nodes")
+    evaluador = preparar_heuristica(heuristic, problem)
+    h_inicial = evaluador.inicial(problem.initial)
+    raiz = NodoSMA(problem.initial, 0, h_inicial, h_inicial)
+    # Lowest-g node in memory for each state, used to skip dominated successors
+    en_memoria = {problem.initial: raiz}
+    # Best open node first: lowest f, then deepest. Worst open leaf first: highest f, then shallowest
+    mejores = []
+    peores = []
+
+    def encolar(nodo: NodoSMA):
+        nodo.en_abierta = True
+        nodo.version += 1
+        heapq.heappush(mejores, (nodo.f, -nodo.profundidad, next(counter), nodo.version, nodo))
+        if not nodo.hijos:
+            heapq.heappush(peores, (-nodo.f, nodo.profundidad, next(counter), nodo.version, nodo))
+
+    def actualizar_f(nodo: NodoSMA):
+        # Back the lowest f of the children up through the fully generated ancestors
+        while nodo is not None and not nodo.sin_generar:
+            f = min(itertools.chain((hijo.f for hijo in nodo.hijos.values()), nodo.olvidados.values()),
+                    default=math.inf)
+            if f == nodo.f:
+                break
+            nodo.f = f
+            if nodo.en_abierta:
+                encolar(nodo)
+            nodo = nodo.padre
+
+    def quitar(nodo: NodoSMA, recordar: bool):
+        # Remove a leaf from the tree, remembering its f in the parent unless it is a dead end
+        nonlocal nodos
+        nodos -= 1
+        padre = nodo.padre
+        del padre.hijos[nodo.accion]
+        if recordar:
+            padre.olvidados[nodo.accion] = nodo.f
+        nodo.en_abierta = False
+        if en_memoria.get(nodo.estado) is nodo:
+            del en_memoria[nodo.estado]
+        if padre.hijos or padre.sin_generar or padre.olvidados or padre is raiz:
+            if padre.sin_generar or padre.olvidados:
+                encolar(padre)
+            actualizar_f(padre)
+        else:
+            quitar(padre, False)
+
+    def compactar():
+        abiertos = list({id(entrada[4]): entrada[4] for entrada in mejores if entrada[4].en_abierta}.values())
+        mejores[:] = [(nodo.f, -nodo.profundidad, next(counter), nodo.version, nodo) for nodo in abiertos]
+        peores[:] = [(-nodo.f, nodo.profundidad, next(counter), nodo.version, nodo) for nodo in abiertos
+                     if not nodo.hijos]
+        heapq.heapify(mejores)
+        heapq.heapify(peores)
+
+    encolar(raiz)
+    nodos = 1
+    generados = 0
+    while mejores:
+        if len(mejores) + len(peores) > 4 * max_nodes:
+            compactar()
+        _, _, _, version, mejor = mejores[0]
+        if not mejor.en_abierta or version != mejor.version:
+            heapq.heappop(mejores)
+            continue
+        if mejor.estado == problem.goal:
+            logger.info(f"SMA* generated {generados} nodes with at most {max_nodes} in memory")
+            return mejor.estado, reconstruir_movimientos_sma(mejor), [], en_memoria
+        if mejor.f == math.inf:
+            break
+
+        if mejor.sin_generar is None:
+            # Undoing the last move is never useful; longer cycles reach a state in memory with a lower g
+            deshacer = mejor.accion and ActionHanoi.get(mejor.accion.disk, mejor.accion.rod_out,
+                                                        mejor.accion.rod_input)
+            mejor.sin_generar = [accion for accion in reversed(problem.actions(mejor.estado))
+                                 if accion is not deshacer]
+        hijo = None
+        if mejor.sin_generar:
+            accion = mejor.sin_generar.pop()
+            f_olvidado = 0
+        elif mejor.olvidados:
+            accion = min(mejor.olvidados, key=mejor.olvidados.get)
+            f_olvidado = mejor.olvidados.pop(accion)
+        else:
+            accion = None
+        if accion is not None:
+            nuevo_estado = problem.result(mejor.estado, accion)
+            nuevo_g = mejor.g + accion.cost
+            existente = en_memoria.get(nuevo_estado)
+            if existente is None or nuevo_g < existente.g:
+                nuevo_h = evaluador.delta(mejor.h, mejor.estado, accion, nuevo_estado)
+                if nuevo_estado != problem.goal and mejor.profundidad + 1 >= max_nodes - 1:
+                    nuevo_f = math.inf
+                else:
+                    nuevo_f = max(mejor.f, nuevo_g + nuevo_h, f_olvidado)
+                hijo = mejor.hijos[accion] = NodoSMA(nuevo_estado, nuevo_g, nuevo_h, nuevo_f, mejor, accion)
+                en_memoria[nuevo_estado] = hijo
+                nodos += 1
+                generados += 1
+
+        if mejor.sin_generar or mejor.olvidados:
+            encolar(mejor)
+        else:
+            mejor.en_abierta = False
+            if not mejor.hijos:
+                # Every successor was a cycle or dominated: a dead end
+                if mejor is raiz:
+                    break
+                quitar(mejor, False)
+                continue
+        actualizar_f(mejor)
+        if hijo is not None:
+            encolar(hijo)
+
+        while nodos > max_nodes:
+            _, _, _, version, peor = heapq.heappop(peores)
+            if not peor.en_abierta or version != peor.version or peor.hijos or peor is raiz:
+                continue
+            quitar(peor, True)
+    logger.info(f"SMA* generated {generados} nodes without reaching the goal within {max_nodes} nodes")
+    return None, [], [], en_memoria
+
+
+def reconstruir_movimientos_sma(nodo: NodoSMA) -> list:
+    """
+    Rebuild the list of movements from the parents of an SMA* node.
+    :param nodo: The node that reached the goal.
+    :return: The list of movements, in the format read by the simulator.
+    """
+    acciones = []
+    while nodo.padre is not None:
+        acciones.append(nodo.accion)
+        nodo = nodo.padre
+    acciones.reverse()
+    return [accion.action_dict for accion in acciones]
+
+
+def busqueda_bidireccional(problem: ProblemHanoi, heuristic=None) -> tuple:
+    """
+    Bidirectional breadth-first search for the Tower of Hanoi problem.
+    Searches forward from the initial state and backward from the goal, always expanding a
+    whole layer of the side with the smaller frontier. Every move can be undone with the
+    opposite move, so the backward side uses the same problem.actions. When a layer reaches
+    states already seen by the other side, the shortest path through any of them is returned.
+    Each side only goes about half the solution depth.
+    :param problem: The Tower of Hanoi problem instance.
+    :param heuristic: Unused, kept so the engine has the same signature as the search engines.
+    :return: A tuple containing the solution state, the list of movements, an empty open list
+    and the set of expanded states of both sides.
+    """
+    cerrada = set()
+    if problem.initial == problem.goal:
+        return problem.initial, [], [], cerrada
+    # Forward links are (action into the state, previous state); backward links are
+    # (action out of the state, next state towards the goal). Both store the depth too.
+    enlaces = ({problem.initial: (None, None, 0)}, {problem.goal: (None, None, 0)})
+    fronteras = ([problem.initial], [problem.goal])
+    while fronteras[0] and fronteras[1]:
+        lado = 0 if len(fronteras[0]) <= len(fronteras[1]) else 1
+        propios, ajenos = enlaces[lado], enlaces[1 - lado]
+        siguiente = []
+        encuentro, mejor_longitud = None, math.inf
+        for estado in fronteras[lado]:
+            cerrada.add(estado)
+            profundidad = propios[estado][2] + 1
+            for accion in problem.actions(estado):
+                vecino = problem.result(estado, accion)
+                if vecino in propios:
+                    continue
+                if lado:
+                    accion = ActionHanoi.get(accion.disk, accion.rod_out, accion.rod_input)
+                propios[vecino] = (accion, estado, profundidad)
+                siguiente.append(vecino)
+                if vecino in ajenos and profundidad + ajenos[vecino][2] < mejor_longitud:
+                    encuentro, mejor_longitud = vecino, profundidad + ajenos[vecino][2]
+        if encuentro is not None:
+            return problem.goal, unir_caminos(enlaces, encuentro), [], cerrada
+        fronteras[lado][:] = siguiente
+    return None, [], [], cerrada
+
+
+def unir_caminos(enlaces: tuple, encuentro: StatesHanoi) -> list:
+    """
+    Join the forward and backward halves of a bidirectional search at the meeting state.
+    :param enlaces: The forward and backward link dictionaries.
+    :param encuentro: A state reached by both sides.
+    :return: The list of movements, in the format read by the simulator.
+    """
+    acciones = []
+    accion, estado, _ = enlaces[0][encuentro]
+    while accion is not None:
+        acciones.append(accion)
+        accion, estado, _ = enlaces[0][estado]
+    acciones.reverse()
+    accion, estado, _ = enlaces[1][encuentro]
+    while accion is not None:
+        acciones.append(accion)
+        accion, estado, _ = enlaces[1][estado]
+    return [accion.action_dict for accion in acciones]
+
+
+def a_star_aima(problem: ProblemHanoi, heuristic=None, almacenamiento="hash", pool_nodos: bool = False) -> tuple:
+    """
+    A* through the AIMA library: aima.astar_search over NodeHanoi nodes.
+    The frontier is the indexed heap of aima.PriorityQueue, so the duplicate check
+    and the decrease-key of a better path are O(1) and O(log n). The h of each child
+    is computed from the h its parent keeps in node.h, with the same incremental
+    evaluators as a_star. Without a heuristic it runs aima.uniform_cost_search.
+    :param problem: The Tower of Hanoi problem instance.
+    :param heuristic: A heuristic function, an HeuristicaIncremental or None.
+    :param almacenamiento: Closed list mode, as in a_star.
+    :param pool_nodos: Keep the search tree in the parallel arrays of a NodePool, with
+    slotted views as nodes, instead of one NodeHanoi object per node.
+    :return: A tuple containing the solution state, the list of movements, an empty
+    open list and the expanded states.
+    """
+    if pool_nodos:
+        raiz = NodePool(problem.initial.number_of_disks, problem.initial.number_of_pegs).root(problem.initial)
+    else:
+        raiz = NodeHanoi(problem.initial)
+    cerrada = hanoi_closed_sets.closed_set_for(problem.initial.number_of_disks, almacenamiento,
+                                               problem.initial.number_of_pegs)
+    if heuristic is None:
+        nodo = aima.uniform_cost_search(problem, node=raiz, explored=cerrada)
+    else:
+        evaluador = preparar_heuristica(heuristic, problem)
+
+        def h(node: NodeHanoi):
+            if node.parent is None:
+                return evaluador.inicial(node.state)
+            return evaluador.delta(node.parent.h, node.parent.state, node.action, node.state)
+
+        nodo = aima.astar_search(problem, h, node=raiz, explored=cerrada)
+    if nodo is None:
+        return None, [], [], cerrada
+    return nodo.state, [accion.action_dict for accion in nodo.solution()], [], cerrada
+
+
+def hda_star(problem: ProblemHanoi, heuristic, procesos: int = None, lote: int = hanoi_hda.DEFAULT_BATCH_SIZE) -> tuple:
+    """
+    Hash-distributed A* (HDA*) across worker processes.
+    Every state belongs to the process given by its Zobrist hash modulo the number of
+    processes, which keeps it in its own open list and best-g table. Successors are sent
+    to their owners in batches, the cost of the first goal found prunes every process,
+    and the search stops when all processes are idle with no batch in flight, so the
+    solution is optimal for an admissible heuristic.
+    :param problem: The Tower of Hanoi problem instance.
+    :param heuristic: The heuristic, as accepted by preparar_heuristica. It is copied into
+    every process.
+    :param procesos: Number of worker processes, by default the number of CPUs.
+    :param lote: Successors per batch and expansions between inbox reads.
+    :return: A tuple containing the solution state, the list of movements, an empty open
+    list and an empty closed list, since both are spread across the processes.
+    """
+    evaluador = preparar_heuristica(heuristic, problem)
+    resultado = hanoi_hda.hda_star_search(problem.initial, problem.goal, evaluador, procesos, lote)
+    logger.info(f"Expanded states per process: {resultado.expanded}")
+    logger.info(f"Batches sent: {resultado.messages}")
+    if resultado.cost is None:
+        return None, [], [], set()
+    movimientos = [ActionHanoi.get(disco, entrada, salida).action_dict for disco, entrada, salida in resultado.moves]
+    return problem.goal, movimientos, [], set()
+
+
+def exigir_tres_varillas(problem: ProblemHanoi, motor: str):
+    """
+    Reject problems with more than three pegs in the engines built on three-peg results.
+    :param problem: The Tower of Hanoi problem instance.
+    :param motor: Name of the engine, for the error message.
+    """
+    if problem.initial.number_of_pegs != 3 or problem.goal.number_of_pegs != 3:
+        raise ValueError(f"{motor} only supports three pegs")
+
+
+def bfs_numpy(problem: ProblemHanoi, heuristic=None) -> tuple:
+    """
+    Breadth-first search over whole layers of packed states with NumPy.
+    Every move costs the same, so the first layer that reaches the goal gives an optimal
+    solution. Successors of a layer are generated together and duplicates are dropped by
+    indexing a byte-per-state array of parent moves, which also rebuilds the path.
+    Needs 3^n bytes, so it is meant for up to about 18 disks.
+    :param problem: The Tower of Hanoi problem instance.
+    :param heuristic: Unused, kept so the engine has the same signature as the search engines.
+    :return: A tuple containing the solution state, the list of movements, an empty open list
+    and the expanded states.
+    """
+    exigir_tres_varillas(problem, "bfs_numpy")
+    camino, cerrada = hanoi_numpy.layered_bfs(problem.initial.code, problem.goal.code,
+                                              problem.initial.number_of_disks)
+    if camino is None:
+        return None, [], [], cerrada
+    movimientos = [ActionHanoi.get(disk, rod_input, rod_out).action_dict for disk, rod_input, rod_out in camino]
+    return problem.goal, movimientos, [], cerrada
+
+
+def solucion_cerrada(problem: ProblemHanoi, heuristic=None) -> tuple:
+    """
+    Closed-form solver for the three-peg Tower of Hanoi.
+    Produces an optimal move sequence between any two legal states without
+    searching. The moves are yielded lazily, using O(n) memory however long the
+    sequence is, so run_search streams them straight to the simulator file.
+    :param problem: The Tower of Hanoi problem instance.
+    :param heuristic: Unused, kept so the solver has the same signature as the search engines.
+    :return: A tuple containing the goal state, a generator of movements, and an empty open and closed list.
+    """
+    exigir_tres_varillas(problem, "solucion_cerrada")
+    movimientos = (ActionHanoi.get(disk, rod_input, rod_out).action_dict
+                   for disk, rod_input, rod_out in optimal_moves(problem.initial.get_disk_pegs(),
+                                                                 problem.goal.get_disk_pegs()))
+    return problem.goal, movimientos, [], set()
+
+
+def solucion_frame_stewart(problem: ProblemHanoi, heuristic=None) -> tuple:
+    """
+    Frame-Stewart solver for moving a whole tower with any number of pegs.
+    Optimal with three and four pegs and an upper bound on the optimum otherwise, so it
+    also gives a reference length for the searches on k-peg instances.
+    :param problem: The Tower of Hanoi problem instance. Both states must have every disk on a single peg.
+    :param heuristic: Unused, kept so the solver has the same signature as the search engines.
+    :return: A tuple containing the goal state, a generator of movements, and an empty open and closed list.
+    """
+    varillas_torre = []
+    for estado in (problem.initial, problem.goal):
+        ocupadas = [varilla for varilla, rod in enumerate(estado.rods) if rod]
+        if len(ocupadas) > 1:
+            raise ValueError("solucion_frame_stewart needs every disk on a single peg")
+        varillas_torre.append(ocupadas[0] if ocupadas else 0)
+    movimientos = (ActionHanoi.get(disk, rod_input, rod_out).action_dict
+                   for disk, rod_input, rod_out in frame_stewart_moves(
+                       problem.initial.number_of_disks, varillas_torre[0], varillas_torre[1],
+                       problem.initial.number_of_pegs))
+    return problem.goal, movimientos, [], set()
+
+
+def solucion_tabla(problem: ProblemHanoi, heuristic=None) -> tuple:
+    """
+    Solver backed by a goal-rooted distance table.
+    The first call for a goal runs one backward BFS over the 3^n states and saves the
+    exact distances to disk; later calls (and later runs) memory-map that file. Each
+    start state is then answered by greedy descent over O(1) table lookups.
+    :param problem: The Tower of Hanoi problem instance.
+    :param heuristic: Unused, kept so the solver has the same signature as the search engines.
+    :return: A tuple containing the goal state, a generator of movements, and an empty open and closed list.
+    """
+    tabla = DistanceTable.for_goal(problem.goal)
+    movimientos = (accion.action_dict for accion in tabla.descend(problem.initial))
+    return problem.goal, movimientos, [], set()
 
 
 def hanoi_heuristic_2(current_state: StatesHanoi, goal_state: StatesHanoi) -> int:
@@ -165,6 +808,170 @@ def hanoi_heuristic(current_state: StatesHanoi, goal_state: StatesHanoi) -> int:
     return total_disks - correct_disks
 
 
+def hanoi_heuristic_exacta(current_state: StatesHanoi, goal_state: StatesHanoi) -> int:
+    """
+    Exact distance oracle for the three-peg Tower of Hanoi.
+    The distance is computed in O(n) from the rod of each disk, starting with the
+    largest disk, for any legal start and goal. With it a_star only expands states
+    on an optimal path, and it doubles as a correctness reference.
+    :param current_state: The current state of the Tower of Hanoi.
+    :param goal_state: The goal state of the Tower of Hanoi.
+    :return: The optimal number of moves from current_state to goal_state.
+    Only valid for three pegs: with more pegs it is not a lower bound.
+    """
+    return optimal_distance(current_state.get_disk_pegs(), goal_state.get_disk_pegs())
+
+
+class HeuristicaIncremental(abc.ABC):
+    """
+    Heuristic evaluated along the edges of the search tree.
+    The tables derived from the goal are built once per problem, the initial
+    state is scored with a full scan and every child reuses the h value of its
+    parent and the move taken to reach it.
+    """
+
+    def __init__(self, goal_state: StatesHanoi):
+        """
+        Build the goal-derived tables.
+        :param goal_state: The goal state of the problem.
+        """
+        self.goal_state = goal_state
+
+    @abc.abstractmethod
+    def inicial(self, estado: StatesHanoi) -> int:
+        """
+        Full evaluation, used for the root of the search.
+        :param estado: The state to evaluate.
+        :return: The heuristic value.
+        """
+
+    @abc.abstractmethod
+    def delta(self, h_padre, estado_padre: StatesHanoi, accion: ActionHanoi, nuevo_estado: StatesHanoi):
+        """
+        Evaluate a child from the value of its parent.
+        :param h_padre: The heuristic value of estado_padre.
+        :param estado_padre: The expanded state.
+        :param accion: The action that leads from estado_padre to nuevo_estado.
+        :param nuevo_estado: The state to evaluate.
+        :return: The heuristic value of nuevo_estado.
+        """
+
+
+class HeuristicaCompleta(HeuristicaIncremental):
+    """
+    Adapter for plain heuristic functions: every state is scored from scratch.
+    """
+
+    def __init__(self, goal_state: StatesHanoi, heuristic):
+        super().__init__(goal_state)
+        self.heuristic = heuristic
+
+    def inicial(self, estado: StatesHanoi) -> int:
+        return self.heuristic(estado, self.goal_state)
+
+    def delta(self, h_padre, estado_padre: StatesHanoi, accion: ActionHanoi, nuevo_estado: StatesHanoi):
+        return self.heuristic(nuevo_estado, self.goal_state)
+
+
+class HeuristicaIncrementalH1(HeuristicaIncremental):
+    """
+    Incremental version of hanoi_heuristic.
+    In a legal state a disk d on rod x belongs to the matching prefix of the rod
+    if and only if every disk e >= d is on x exactly when its goal rod is x. A
+    move of disk d only changes the status of d itself, so the delta only looks
+    at the disks larger than d.
+    """
+
+    def __init__(self, goal_state: StatesHanoi):
+        super().__init__(goal_state)
+        self.varilla_objetivo = goal_state.get_disk_pegs()
+
+    def inicial(self, estado: StatesHanoi) -> int:
+        return hanoi_heuristic(estado, self.goal_state)
+
+    def _base_correcta(self, estado: StatesHanoi, disk: int, varilla: int) -> bool:
+        """
+        Check that the disks larger than disk are on varilla exactly when their goal rod is varilla.
+        """
+        varillas = estado.number_of_pegs
+        codigo = estado.code // varillas ** disk
+        varilla_objetivo = self.varilla_objetivo
+        for indice in range(disk, estado.number_of_disks):
+            codigo, peg = divmod(codigo, varillas)
+            if (peg == varilla) != (varilla_objetivo[indice] == varilla):
+                return False
+        return True
+
+    def delta(self, h_padre, estado_padre: StatesHanoi, accion: ActionHanoi, nuevo_estado: StatesHanoi):
+        objetivo = self.varilla_objetivo[accion.disk - 1]
+        if objetivo == accion.rod_input:
+            if self._base_correcta(estado_padre, accion.disk, accion.rod_input):
+                return h_padre + 1
+        elif objetivo == accion.rod_out:
+            if self._base_correcta(estado_padre, accion.disk, accion.rod_out):
+                return h_padre - 1
+        return h_padre
+
+
+class HeuristicaIncrementalH2(HeuristicaIncremental):
+    """
+    Incremental version of hanoi_heuristic_2.
+    Legal moves never put a larger disk on a smaller one, so the disorder term
+    stays constant and only the misplaced term of the moved disk changes.
+    """
+
+    def __init__(self, goal_state: StatesHanoi):
+        super().__init__(goal_state)
+        self.varilla_objetivo = goal_state.get_disk_pegs()
+
+    def inicial(self, estado: StatesHanoi) -> int:
+        return hanoi_heuristic_2(estado, self.goal_state)
+
+    def delta(self, h_padre, estado_padre: StatesHanoi, accion: ActionHanoi, nuevo_estado: StatesHanoi):
+        objetivo = self.varilla_objetivo[accion.disk - 1]
+        return h_padre + (objetivo == accion.rod_input) - (objetivo == accion.rod_out)
+
+
+class HeuristicaExacta(HeuristicaIncremental):
+    """
+    Evaluator for hanoi_heuristic_exacta that decodes the goal only once.
+    """
+
+    def __init__(self, goal_state: StatesHanoi):
+        if goal_state.number_of_pegs != 3:
+            raise ValueError("hanoi_heuristic_exacta only applies to three pegs")
+        super().__init__(goal_state)
+        self.varilla_objetivo = goal_state.get_disk_pegs()
+
+    def inicial(self, estado: StatesHanoi) -> int:
+        return optimal_distance(estado.get_disk_pegs(), self.varilla_objetivo)
+
+    def delta(self, h_padre, estado_padre: StatesHanoi, accion: ActionHanoi, nuevo_estado: StatesHanoi):
+        return optimal_distance(nuevo_estado.get_disk_pegs(), self.varilla_objetivo)
+
+
+HEURISTICAS_INCREMENTALES = {
+    hanoi_heuristic: HeuristicaIncrementalH1,
+    hanoi_heuristic_2: HeuristicaIncrementalH2,
+    hanoi_heuristic_exacta: HeuristicaExacta,
+}
+
+
+def preparar_heuristica(heuristic, problem: ProblemHanoi) -> HeuristicaIncremental:
+    """
+    Get the evaluator the search engines use for a heuristic.
+    :param heuristic: A heuristic function, or an already built HeuristicaIncremental.
+    :param problem: The Tower of Hanoi problem instance.
+    :return: The incremental version of the heuristic when there is one, otherwise
+             an adapter that recomputes it for every state.
+    """
+    if isinstance(heuristic, HeuristicaIncremental):
+        return heuristic
+    if heuristic in HEURISTICAS_INCREMENTALES:
+        return HEURISTICAS_INCREMENTALES[heuristic](problem.goal)
+    return HeuristicaCompleta(problem.goal, heuristic)
+
+
 def is_valid_hanoi_state(peg_1, peg_2, peg_3, max_disks):
     # Combine all disks from the three pegs
     all_disks = peg_1 + peg_2 + peg_3
@@ -214,6 +1021,31 @@ def define_problem() -> ProblemHanoi:
     return problem
 
 
+def escribir_secuencia(movimientos, ruta: str) -> int:
+    """
+    Write a sequence of movements with the same layout as json.dump(..., indent=4),
+    one movement at a time, so lazily generated sequences never live in memory.
+    :param movimientos: An iterable of movement dicts.
+    :param ruta: The path of the JSON file.
+    :return: The number of movements written.
+    """
+    # Hay a lo sumo 3n movimientos distintos (disco y varillas), así que cada uno se serializa una sola vez y el
+    # caché, indexado por el contenido del movimiento, no crece con el largo de la secuencia
+    serializados = {}
+    cantidad = 0
+    with open(ruta, "w") as f:
+        for movimiento in movimientos:
+            clave = tuple(movimiento.items())
+            texto = serializados.get(clave)
+            if texto is None:
+                texto = serializados[clave] = json.dumps(dict(movimiento), indent=4).replace("\n", "\n    ")
+            f.write(",\n    " if cantidad else "[\n    ")
+            f.write(texto)
+            cantidad += 1
+        f.write("\n]" if cantidad else "[]")
+    return cantidad
+
+
 def run_search(problem: ProblemHanoi, algorithm, heuristic) -> None:
     logger.info(
         "#################### Starting search algorithm ####################")
@@ -228,8 +1060,9 @@ def run_search(problem: ProblemHanoi, algorithm, heuristic) -> None:
     tracemalloc.stop()  # Stop measuring memory
     logger.info(f"Execution time: {end_time - start_time:.6f} seconds")
     logger.info(f"Peak memory usage: {peak / 1024:.2f} KB")
-    with open(f"simulator/sequence{algorithm.__name__}.json", "w") as f:
-        json.dump(movimientos, f, indent=4)
+    start_time = time.perf_counter()
+    cantidad_movimientos = escribir_secuencia(movimientos, f"simulator/sequence{algorithm.__name__}.json")
+    logger.info(f"Sequence written in {time.perf_counter() - start_time:.6f} seconds")
     abierta_serializable = []
     for f_val, count, _, estado in abierta:
         abierta_serializable.append({
@@ -242,14 +1075,17 @@ def run_search(problem: ProblemHanoi, algorithm, heuristic) -> None:
         json.dump(abierta_serializable, f, indent=4)
     if solution:
         logger.info(f"Cantidad de nodos abiertos: {len(abierta)}")
-        logger.info(f"Cantidad de nodos movimientos: {len(movimientos)}")
+        logger.info(f"Cantidad de nodos movimientos: {cantidad_movimientos}")
         logger.info(f"Cantidad de nodos cerrados: {len(exploration)}")
-        optimal_moves = 2**problem.initial.number_of_disks - 1
-        logger.info(f"Solicion optima es 2^n - 1 = {optimal_moves}")
-        if len(movimientos) == optimal_moves:
-            logger.info("Solution is optimal")
-        else:
-            logger.info("Solution is not optimal")
+        if isinstance(exploration, hanoi_closed_sets.BloomClosedSet):
+            logger.info(f"Probabilidad estimada de omisión: {exploration.omission_probability():.3e}")
+        if problem.initial.number_of_pegs == 3:
+            movimientos_optimos = optimal_distance(problem.initial.get_disk_pegs(), problem.goal.get_disk_pegs())
+            logger.info(f"Solicion optima es d(inicial, objetivo) = {movimientos_optimos}")
+            if cantidad_movimientos == movimientos_optimos:
+                logger.info("Solution is optimal")
+            else:
+                logger.info("Solution is not optimal")
         logger.info(f"Solution found: {solution}")
 
     else:
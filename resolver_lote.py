@@ -0,0 +1,237 @@
+import argparse
+import collections
+import concurrent.futures
+import functools
+import itertools
+import json
+import os
+import sys
+import time
+
+from aima_libs import hanoi_pattern_db
+from aima_libs.hanoi_closed_form import optimal_distance
+from aima_libs.hanoi_states import ProblemHanoi, StatesHanoi
+import main
+
+MOTORES = {
+    "a_star": main.a_star,
+    "basic_a_star": main.basic_a_star,
+    "ida_star": main.ida_star,
+    "a_star_aima": main.a_star_aima,
+    "sma_star": main.sma_star,
+    "bidireccional": main.busqueda_bidireccional,
+    "bfs_numpy": main.bfs_numpy,
+    "cerrada": main.solucion_cerrada,
+    "frame_stewart": main.solucion_frame_stewart,
+    "tabla": main.solucion_tabla,
+}
+
+HEURISTICAS = {
+    "h1": main.hanoi_heuristic,
+    "h2": main.hanoi_heuristic_2,
+    "exacta": main.hanoi_heuristic_exacta,
+    "pdb": None,
+}
+
+# Motores que no usan la heurística, para los que no se construye el evaluador
+SIN_HEURISTICA = {"bfs_numpy", "cerrada", "frame_stewart", "tabla"}
+
+# Configuración de cada proceso del pool, fijada una sola vez por `inicializar_proceso`
+_motor = None
+_usa_heuristica = True
+_heuristica = None
+_directorio_pdb = None
+
+
+def leer_problemas(ruta: str):
+    """
+    Lee los problemas de un archivo JSONL, con un problema por línea, o de un directorio con un archivo JSON por
+    problema. Los archivos del directorio se recorren en orden alfabético.
+
+    Cada problema tiene la forma {"id": ..., "initial": {"peg_1": [...], ...}, "goal": {"peg_1": [...], ...}}, con
+    las varillas en el mismo formato que `simulator/initial_state.json`. Si falta "id" se usa el número de línea o el
+    nombre del archivo. Las líneas o archivos que no son un objeto JSON se informan como error.
+
+    Yields:
+        tuple: (id, datos del problema o None, error de lectura o None).
+    """
+    if os.path.isdir(ruta):
+        for nombre in sorted(os.listdir(ruta)):
+            if not nombre.endswith(".json"):
+                continue
+            identificador = os.path.splitext(nombre)[0]
+            try:
+                with open(os.path.join(ruta, nombre), "r") as f:
+                    datos = json.load(f)
+            except (OSError, json.JSONDecodeError) as error:
+                yield identificador, None, str(error)
+                continue
+            if not isinstance(datos, dict):
+                yield identificador, None, "not an object"
+                continue
+            yield datos.get("id", identificador), datos, None
+    else:
+        with open(ruta, "r") as f:
+            for numero, linea in enumerate(f, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    datos = json.loads(linea)
+                except json.JSONDecodeError as error:
+                    yield numero, None, str(error)
+                    continue
+                if not isinstance(datos, dict):
+                    yield numero, None, "not an object"
+                    continue
+                yield datos.get("id", numero), datos, None
+
+
+def leer_varillas(datos: dict) -> list:
+    """
+    Convierte un estado en formato {"peg_1": [...], "peg_2": [...], ...} en la lista de varillas. Las varillas que
+    faltan se consideran vacías, y siempre hay al menos tres.
+    """
+    cantidad = max([3] + [int(clave[4:]) for clave in datos if clave.startswith("peg_")])
+    return [list(datos.get(f"peg_{i}", [])) for i in range(1, cantidad + 1)]
+
+
+def crear_problema(datos: dict) -> ProblemHanoi:
+    """
+    Crea el problema de un par (inicial, objetivo). Los dos estados usan la misma cantidad de varillas.
+    """
+    inicial = leer_varillas(datos["initial"])
+    objetivo = leer_varillas(datos["goal"])
+    varillas = max(len(inicial), len(objetivo))
+    inicial += [[] for _ in range(varillas - len(inicial))]
+    objetivo += [[] for _ in range(varillas - len(objetivo))]
+    discos = sum(len(varilla) for varilla in inicial)
+    return ProblemHanoi(initial=StatesHanoi(*inicial, max_disks=discos),
+                        goal=StatesHanoi(*objetivo, max_disks=discos))
+
+
+def inicializar_proceso(motor: str, heuristica: str, directorio_pdb: str):
+    """
+    Configura un proceso del pool. Las tablas que dependen del objetivo (las de las heurísticas incrementales y las
+    bases de datos de patrones) se construyen la primera vez que el proceso ve cada objetivo y se reutilizan en los
+    problemas siguientes, igual que las tablas de códigos y de Zobrist de `hanoi_states`.
+    """
+    global _motor, _usa_heuristica, _heuristica, _directorio_pdb
+    _motor = MOTORES[motor]
+    _usa_heuristica = motor not in SIN_HEURISTICA
+    _heuristica = heuristica
+    _directorio_pdb = directorio_pdb
+
+
+@functools.lru_cache(maxsize=64)
+def evaluador_para(codigo_objetivo: int, discos: int, varillas: int):
+    """
+    Obtiene el evaluador de la heurística del proceso para un objetivo, construyéndolo solo la primera vez.
+    """
+    objetivo = StatesHanoi.from_code(codigo_objetivo, discos, number_of_pegs=varillas)
+    problema = ProblemHanoi(initial=objetivo, goal=objetivo)
+    if _heuristica == "pdb":
+        heuristica = hanoi_pattern_db.PatternDatabaseHeuristic(objetivo, directory=_directorio_pdb)
+    else:
+        heuristica = HEURISTICAS[_heuristica]
+    return main.preparar_heuristica(heuristica, problema)
+
+
+def resolver(identificador, datos: dict, secuencia: bool) -> dict:
+    """
+    Resuelve un problema con el motor y la heurística del proceso.
+
+    Returns:
+        dict: Resultado con la cantidad de movimientos, los estados expandidos y el tiempo de búsqueda, o con el
+        error si el problema no es válido, el motor no lo admite o falla. Un error nunca corta el resto del lote.
+    """
+    resultado = {"id": identificador}
+    try:
+        problema = crear_problema(datos)
+        objetivo = problema.goal
+        evaluador = None
+        if _usa_heuristica:
+            evaluador = evaluador_para(objetivo.code, objetivo.number_of_disks, objetivo.number_of_pegs)
+        inicio = time.perf_counter()
+        solucion, movimientos, _, cerrada = _motor(problema, evaluador)
+        # Los solvers sin búsqueda devuelven un generador, que se consume dentro del tiempo medido
+        movimientos = list(movimientos)
+        resultado["tiempo"] = time.perf_counter() - inicio
+    except Exception as error:
+        resultado["error"] = f"{type(error).__name__}: {error}"
+        return resultado
+    resultado["discos"] = objetivo.number_of_disks
+    resultado["varillas"] = objetivo.number_of_pegs
+    resultado["resuelto"] = solucion is not None
+    resultado["movimientos"] = len(movimientos)
+    resultado["expandidos"] = len(cerrada)
+    if solucion is not None and objetivo.number_of_pegs == 3:
+        resultado["optimo"] = len(movimientos) == optimal_distance(problema.initial.get_disk_pegs(),
+                                                                   objetivo.get_disk_pegs())
+    if secuencia:
+        resultado["secuencia"] = [dict(movimiento) for movimiento in movimientos]
+    return resultado
+
+
+def resolver_bloque(bloque: list, secuencia: bool) -> list:
+    """
+    Resuelve un bloque de problemas en un proceso del pool.
+    """
+    return [resolver(identificador, datos, secuencia) if error is None else {"id": identificador, "error": error}
+            for identificador, datos, error in bloque]
+
+
+def resolver_lote(ruta: str, motor: str = "a_star", heuristica: str = "h1", procesos: int = None,
+                  tamano_bloque: int = 16, secuencia: bool = False,
+                  directorio_pdb: str = hanoi_pattern_db.DEFAULT_DIRECTORY):
+    """
+    Resuelve los problemas de un archivo JSONL o de un directorio en un pool de procesos.
+
+    Los problemas se leen a medida que hace falta y se envían en bloques de `tamano_bloque`, con a lo sumo dos
+    bloques por proceso en vuelo, así que la memoria no depende de la cantidad de problemas. Los resultados se
+    devuelven en el mismo orden de la entrada.
+
+    Yields:
+        dict: Resultado de cada problema (ver `resolver`).
+    """
+    procesos = procesos or os.cpu_count() or 1
+    problemas = leer_problemas(ruta)
+    bloques = iter(lambda: list(itertools.islice(problemas, tamano_bloque)), [])
+    with concurrent.futures.ProcessPoolExecutor(procesos, initializer=inicializar_proceso,
+                                                initargs=(motor, heuristica, directorio_pdb)) as pool:
+        pendientes = collections.deque(pool.submit(resolver_bloque, bloque, secuencia)
+                                       for bloque in itertools.islice(bloques, 2 * procesos))
+        while pendientes:
+            resultados = pendientes.popleft().result()
+            for bloque in itertools.islice(bloques, 1):
+                pendientes.append(pool.submit(resolver_bloque, bloque, secuencia))
+            yield from resultados
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Resuelve muchos problemas de la Torre de Hanoi en paralelo")
+    parser.add_argument("entrada", help="Archivo JSONL con un problema por línea, o directorio de archivos JSON")
+    parser.add_argument("--salida", default=None, help="Archivo JSONL de resultados (por defecto, la salida estándar)")
+    parser.add_argument("--motor", choices=sorted(MOTORES), default="a_star")
+    parser.add_argument("--heuristica", choices=sorted(HEURISTICAS), default="h1")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--tamano-bloque", type=int, default=16)
+    parser.add_argument("--secuencia", action="store_true", help="Incluye los movimientos de cada solución")
+    parser.add_argument("--directorio-pdb", default=hanoi_pattern_db.DEFAULT_DIRECTORY)
+    args = parser.parse_args()
+
+    salida = open(args.salida, "w") if args.salida else sys.stdout
+    inicio = time.perf_counter()
+    cantidad = errores = 0
+    try:
+        for resultado in resolver_lote(args.entrada, args.motor, args.heuristica, args.procesos, args.tamano_bloque,
+                                       args.secuencia, args.directorio_pdb):
+            salida.write(json.dumps(resultado) + "\n")
+            salida.flush()
+            cantidad += 1
+            errores += "error" in resultado
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+    tiempo = time.perf_counter() - inicio
+    print(f"{cantidad} problemas ({errores} con error) en {tiempo:.3f}s: {cantidad / tiempo:,.1f} problemas/s",
+          file=sys.stderr)
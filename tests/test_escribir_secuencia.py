@@ -0,0 +1,29 @@
+import json
+import tracemalloc
+
+import main
+from aima_libs.hanoi_states import ProblemHanoi, StatesHanoi
+
+
+def problema_torre(discos: int) -> ProblemHanoi:
+    return ProblemHanoi(initial=StatesHanoi(list(range(discos, 0, -1)), [], [], max_disks=discos),
+                        goal=StatesHanoi([], [], list(range(discos, 0, -1)), max_disks=discos))
+
+
+def test_mismo_formato_que_json_dump(tmp_path):
+    _, movimientos, _, _ = main.a_star(problema_torre(4), main.hanoi_heuristic)
+    ruta = tmp_path / "secuencia.json"
+    assert main.escribir_secuencia(movimientos, str(ruta)) == 15
+    assert ruta.read_text() == json.dumps([dict(movimiento) for movimiento in movimientos], indent=4)
+
+
+def test_memoria_acotada_con_una_secuencia_larga(tmp_path):
+    _, movimientos, _, _ = main.solucion_cerrada(problema_torre(20))
+    tracemalloc.start()
+    try:
+        cantidad = main.escribir_secuencia(movimientos, str(tmp_path / "secuencia.json"))
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert cantidad == 2 ** 20 - 1
+    assert pico < 1024 * 1024
@@ -0,0 +1,48 @@
+import main
+from aima_libs.hanoi_closed_sets import BloomClosedSet, BoundedCostTable
+from aima_libs.hanoi_states import ProblemHanoi, StatesHanoi
+
+
+def test_tabla_de_costos_acotada():
+    estados = [StatesHanoi.from_code(codigo, 4) for codigo in range(3 ** 4)]
+    tabla = BoundedCostTable(16)
+    for costo, estado in enumerate(estados):
+        tabla[estado] = costo
+    assert len(tabla) <= 16
+    for costo, estado in enumerate(estados):
+        if estado in tabla:
+            assert tabla[estado] == costo
+    assert estados[-1] in tabla
+
+
+def test_bloom_no_repite_estados_en_la_lista_abierta():
+    problem = ProblemHanoi(initial=StatesHanoi([6, 5, 4, 3, 2, 1], [], [], max_disks=6),
+                           goal=StatesHanoi([], [], [6, 5, 4, 3, 2, 1], max_disks=6))
+    _, movimientos_hash, abierta_hash, _ = main.a_star(problem, main.hanoi_heuristic)
+    _, movimientos_bloom, abierta_bloom, _ = main.a_star(problem, main.hanoi_heuristic, almacenamiento="bloom")
+    assert len(movimientos_bloom) == len(movimientos_hash) == 63
+    assert len(abierta_bloom) == len(abierta_hash)
+
+
+class HashFijo:
+    def __init__(self, valor: int):
+        self.valor = valor
+
+    def __hash__(self):
+        return self.valor
+
+
+def test_bloom_usa_el_hash_completo():
+    filtro = BloomClosedSet(number_of_bits=1 << 20, number_of_hashes=4)
+    # Los hashes coinciden en los 30 bits bajos y difieren solo en los altos
+    bajo = 0x12345678
+    posiciones = {tuple(filtro._positions(HashFijo(bajo | alto << 30))) for alto in range(1, 65)}
+    assert len(posiciones) == 64
+
+
+def test_bloom_con_cantidad_de_bits_impar():
+    filtro = BloomClosedSet(number_of_bits=7, number_of_hashes=3)
+    for valor in range(7 * 7):
+        posiciones = list(filtro._positions(HashFijo(valor)))
+        assert len(set(posiciones)) == 3
+        assert all(0 <= posicion < 7 for posicion in posiciones)
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from aima_libs.hanoi_closed_form import optimal_distance
+from aima_libs.hanoi_frontier import frontier_search
+from aima_libs.hanoi_states import ProblemHanoi, StatesHanoi
+
+
+def capas_bfs(inicial: StatesHanoi) -> list:
+    """
+    Búsqueda en anchura de referencia sobre `StatesHanoi`: tamaño de cada capa desde el estado inicial.
+    """
+    problema = ProblemHanoi(initial=inicial, goal=inicial)
+    vistos = {inicial}
+    capa = [inicial]
+    tamanos = []
+    while capa:
+        tamanos.append(len(capa))
+        siguiente = []
+        for estado in capa:
+            for accion in problema.actions(estado):
+                nuevo = problema.result(estado, accion)
+                if nuevo not in vistos:
+                    vistos.add(nuevo)
+                    siguiente.append(nuevo)
+        capa = siguiente
+    return tamanos
+
+
+# Un presupuesto de 4 KB obliga a pasar las capas y las corridas a disco
+@pytest.mark.parametrize("presupuesto", [1 << 20, 4096])
+@pytest.mark.parametrize("discos", [1, 4, 6])
+def test_frontera_recorre_todo_el_espacio(tmp_path, discos, presupuesto):
+    inicial = StatesHanoi.from_code(random.Random(discos).randrange(3 ** discos), discos)
+    resultado = frontier_search(inicial, memory_budget=presupuesto, directory=str(tmp_path))
+    assert resultado.distance is None
+    assert resultado.layer_sizes == capas_bfs(inicial)
+    assert sum(resultado.layer_sizes) == 3 ** discos
+
+
+@pytest.mark.parametrize("presupuesto", [1 << 20, 4096])
+def test_frontera_distancia_al_objetivo(tmp_path, presupuesto):
+    generador = random.Random(0)
+    for _ in range(10):
+        inicial, objetivo = (StatesHanoi.from_code(generador.randrange(3 ** 6), 6) for _ in range(2))
+        resultado = frontier_search(inicial, objetivo, memory_budget=presupuesto, directory=str(tmp_path))
+        distancia = optimal_distance(inicial.get_disk_pegs(), objetivo.get_disk_pegs())
+        assert resultado.distance == distancia
+        assert resultado.layer_sizes == capas_bfs(inicial)[:distancia + 1]
+
+
+def test_frontera_escribe_en_disco_con_poca_memoria(tmp_path):
+    resultado = frontier_search(StatesHanoi.from_code(0, 6), memory_budget=4096, directory=str(tmp_path))
+    assert resultado.bytes_written > 0
+    assert resultado.bytes_read > 0
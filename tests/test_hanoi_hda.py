@@ -0,0 +1,57 @@
+import os
+import random
+import time
+
+import pytest
+
+import main
+from aima_libs.hanoi_closed_form import optimal_distance
+from aima_libs.hanoi_hda import HDAWorkerError, hda_star_search
+from aima_libs.hanoi_states import ProblemHanoi, StatesHanoi
+
+
+class HeuristicaQueFalla(main.HeuristicaIncremental):
+    """
+    Evalúa bien la raíz y falla en el primer hijo, que ya se evalúa dentro de un proceso.
+    """
+
+    def inicial(self, estado: StatesHanoi) -> int:
+        return 0
+
+    def delta(self, h_padre, estado_padre, accion, nuevo_estado):
+        raise ValueError("heurística rota")
+
+
+class HeuristicaQueTerminaElProceso(HeuristicaQueFalla):
+    """
+    Termina el proceso sin pasar por el manejo de excepciones.
+    """
+
+    def delta(self, h_padre, estado_padre, accion, nuevo_estado):
+        os._exit(3)
+
+
+def problema_aleatorio(generador: random.Random, discos: int) -> ProblemHanoi:
+    inicial, objetivo = (StatesHanoi.from_code(generador.randrange(3 ** discos), discos) for _ in range(2))
+    return ProblemHanoi(initial=inicial, goal=objetivo)
+
+
+@pytest.mark.parametrize("discos", [3, 4, 5])
+def test_hda_star_optimo_con_dos_procesos(discos):
+    generador = random.Random(discos)
+    for _ in range(3):
+        problema = problema_aleatorio(generador, discos)
+        solucion, movimientos, _, _ = main.hda_star(problema, main.hanoi_heuristic, procesos=2, lote=4)
+        assert solucion is not None
+        assert len(movimientos) == optimal_distance(problema.initial.get_disk_pegs(), problema.goal.get_disk_pegs())
+
+
+@pytest.mark.parametrize("heuristica, mensaje", [(HeuristicaQueFalla, "heurística rota"),
+                                                 (HeuristicaQueTerminaElProceso, "código 3")])
+def test_hda_star_propaga_la_falla_de_un_proceso(heuristica, mensaje):
+    problema = ProblemHanoi(initial=StatesHanoi.from_code(0, 4), goal=StatesHanoi.from_code(3 ** 4 - 1, 4))
+    evaluador = heuristica(problema.goal)
+    inicio = time.perf_counter()
+    with pytest.raises(HDAWorkerError, match=mensaje):
+        hda_star_search(problema.initial, problema.goal, evaluador, processes=2, batch_size=4)
+    assert time.perf_counter() - inicio < 10
@@ -0,0 +1,20 @@
+import math
+
+import pytest
+
+from aima_libs.hanoi_open_lists import TIE_BREAKS, BucketOpenList
+
+
+@pytest.mark.parametrize("tie_breaking", TIE_BREAKS)
+def test_extrae_por_f(tie_breaking):
+    open_list = BucketOpenList(tie_breaking)
+    for count, (f, h) in enumerate([(5, 2), (3.0, 1), (4, 0), (3, 3)]):
+        open_list.push((f, count, None, None), h)
+    assert [open_list.pop()[0] for _ in range(4)] == [3, 3, 4, 5]
+
+
+@pytest.mark.parametrize("f, h", [(3.5, 1), (3, 1.5), (-1, 0), (math.inf, 0), (math.nan, 0)])
+def test_rechaza_claves_no_enteras(f, h):
+    open_list = BucketOpenList("min_h")
+    with pytest.raises(ValueError):
+        open_list.push((f, 0, None, None), h)
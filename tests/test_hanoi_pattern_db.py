@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from aima_libs.hanoi_closed_form import optimal_distance
+from aima_libs.hanoi_pattern_db import DistanceTable, PatternDatabaseHeuristic
+from aima_libs.hanoi_states import StatesHanoi, legal_actions
+
+DISCOS = 6
+
+# (grupos, modo): patrones disjuntos sumados, solapados con máximo y un único patrón con todos los discos
+CASOS = [
+    ([(6, 5, 4), (3, 2, 1)], "sum"),
+    ([(6, 5), (4, 3), (2, 1)], "sum"),
+    ([(6, 5, 4, 3), (4, 3, 2, 1)], "max"),
+    ([(6, 5, 4, 3, 2, 1)], "sum"),
+]
+
+
+@pytest.mark.parametrize("grupos, modo", CASOS, ids=[f"{modo}-{len(grupos)}grupos" for grupos, modo in CASOS])
+def test_pdb_admisible(tmp_path, grupos, modo):
+    generador = random.Random(0)
+    estados = [StatesHanoi.from_code(codigo, DISCOS) for codigo in range(3 ** DISCOS)]
+    for objetivo in generador.sample(estados, 4):
+        heuristica = PatternDatabaseHeuristic(objetivo, grupos, modo, directory=str(tmp_path))
+        varillas_objetivo = objetivo.get_disk_pegs()
+        for estado in estados:
+            h = heuristica(estado, objetivo)
+            distancia = optimal_distance(estado.get_disk_pegs(), varillas_objetivo)
+            assert 0 <= h <= distancia
+            if len(grupos) == 1:
+                assert h == distancia
+        assert heuristica(objetivo) == 0
+
+
+@pytest.mark.parametrize("discos", [1, 4, 7])
+def test_descenso_de_la_tabla(tmp_path, discos):
+    generador = random.Random(discos)
+    for _ in range(3):
+        objetivo = StatesHanoi.from_code(generador.randrange(3 ** discos), discos)
+        tabla = DistanceTable(objetivo, directory=str(tmp_path))
+        for codigo in generador.sample(range(3 ** discos), min(50, 3 ** discos)):
+            estado = StatesHanoi.from_code(codigo, discos)
+            distancia = tabla.distance(estado)
+            assert distancia == optimal_distance(estado.get_disk_pegs(), objetivo.get_disk_pegs())
+            acciones = list(tabla.descend(estado))
+            assert len(acciones) == distancia
+            for accion in acciones:
+                assert accion in legal_actions(estado.top_disks())
+                estado = accion.execute(estado)
+            assert estado == objetivo
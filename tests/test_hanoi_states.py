@@ -0,0 +1,42 @@
+import tracemalloc
+
+import pytest
+
+import main
+from aima_libs.hanoi_states import ActionHanoi, ProblemHanoi, StatesHanoi
+
+
+def test_action_dict_compartido_y_de_solo_lectura():
+    accion = ActionHanoi.get(1, 0, 2)
+    assert accion.action_dict is ActionHanoi.get(1, 0, 2).action_dict
+    with pytest.raises(TypeError):
+        accion.action_dict["disk"] = 99
+    assert accion.action_dict == {"type": "movement", "disk": 1, "peg_start": 1, "peg_end": 3}
+
+
+def test_memoria_acotada_al_recorrer_una_solucion(tmp_path):
+    discos = 16
+    problem = ProblemHanoi(initial=StatesHanoi(list(range(discos, 0, -1)), [], [], max_disks=discos),
+                           goal=StatesHanoi([], [], list(range(discos, 0, -1)), max_disks=discos))
+    _, movimientos, _, _ = main.solucion_cerrada(problem)
+    tracemalloc.start()
+    try:
+        main.escribir_secuencia(movimientos, str(tmp_path / "secuencia.json"))
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert pico < 512 * 1024
+
+
+def test_max_disks_por_posicion_con_tres_varillas():
+    estado = StatesHanoi([2, 1], [], [], 2)
+    assert estado.number_of_pegs == 3
+    assert estado == StatesHanoi([2, 1], [], [], max_disks=2)
+    assert StatesHanoi([2, 1], [], [], 2, 3.0).accumulated_cost == 3.0
+
+
+def test_varillas_que_no_son_listas():
+    with pytest.raises(TypeError):
+        StatesHanoi([2, 1], [], [], [], 2)
+    with pytest.raises(TypeError):
+        StatesHanoi([2, 1], 2, [])
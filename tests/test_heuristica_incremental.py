@@ -0,0 +1,45 @@
+import pytest
+
+import main
+from aima_libs.hanoi_states import ProblemHanoi, StatesHanoi, legal_actions
+
+# (heurística, varillas, discos): todos los objetivos y todos los estados de cada caso
+CASOS = [
+    (main.hanoi_heuristic, 3, 4),
+    (main.hanoi_heuristic_2, 3, 4),
+    (main.hanoi_heuristic_exacta, 3, 4),
+    (main.hanoi_heuristic, 4, 3),
+    (main.hanoi_heuristic_2, 4, 3),
+]
+
+
+def todos_los_estados(discos: int, varillas: int) -> list:
+    return [StatesHanoi.from_code(codigo, discos, number_of_pegs=varillas) for codigo in range(varillas ** discos)]
+
+
+@pytest.mark.parametrize("heuristica, varillas, discos", CASOS,
+                         ids=[f"{h.__name__}-{k}varillas-{n}discos" for h, k, n in CASOS])
+def test_delta_igual_a_evaluacion_completa(heuristica, varillas, discos):
+    estados = todos_los_estados(discos, varillas)
+    for objetivo in estados:
+        evaluador = main.preparar_heuristica(heuristica, ProblemHanoi(initial=objetivo, goal=objetivo))
+        assert isinstance(evaluador, main.HEURISTICAS_INCREMENTALES[heuristica])
+        for estado in estados:
+            h = evaluador.inicial(estado)
+            assert h == heuristica(estado, objetivo)
+            for accion in legal_actions(estado.top_disks()):
+                hijo = accion.execute(estado)
+                assert evaluador.delta(h, estado, accion, hijo) == heuristica(hijo, objetivo), (estado, accion)
+
+
+def test_base_abstracta():
+    objetivo = StatesHanoi([], [], [2, 1], max_disks=2)
+    with pytest.raises(TypeError):
+        main.HeuristicaIncremental(objetivo)
+
+    class SoloInicial(main.HeuristicaIncremental):
+        def inicial(self, estado):
+            return 0
+
+    with pytest.raises(TypeError):
+        SoloInicial(objetivo)
@@ -0,0 +1,159 @@
+import random
+
+import pytest
+
+import main
+from aima_libs.hanoi_closed_form import optimal_distance
+from aima_libs.hanoi_states import ProblemHanoi, StatesHanoi
+
+
+def problemas_aleatorios(discos: int, cantidad: int = 5, semilla: int = 0) -> list:
+    generador = random.Random(semilla + discos)
+    return [ProblemHanoi(initial=StatesHanoi.from_code(generador.randrange(3 ** discos), discos),
+                         goal=StatesHanoi.from_code(generador.randrange(3 ** discos), discos))
+            for _ in range(cantidad)]
+
+
+def distancia(problema: ProblemHanoi) -> int:
+    return optimal_distance(problema.initial.get_disk_pegs(), problema.goal.get_disk_pegs())
+
+
+def capas_bfs(problema: ProblemHanoi) -> list:
+    """
+    Búsqueda en anchura de referencia sobre `StatesHanoi`: tamaño de cada capa desde el estado inicial.
+    """
+    vistos = {problema.initial}
+    capa = [problema.initial]
+    tamanos = []
+    while capa:
+        tamanos.append(len(capa))
+        siguiente = []
+        for estado in capa:
+            for accion in problema.actions(estado):
+                nuevo = problema.result(estado, accion)
+                if nuevo not in vistos:
+                    vistos.add(nuevo)
+                    siguiente.append(nuevo)
+        capa = siguiente
+    return tamanos
+
+
+def llega_al_objetivo(problema: ProblemHanoi, movimientos: list) -> bool:
+    """
+    Aplica los movimientos al estado inicial comprobando que cada uno sea legal.
+    """
+    varillas = problema.initial.get_disk_pegs()
+    for movimiento in movimientos:
+        disco, inicio, fin = movimiento["disk"], movimiento["peg_start"] - 1, movimiento["peg_end"] - 1
+        if varillas[disco - 1] != inicio or any(varillas[menor] in (inicio, fin) for menor in range(disco - 1)):
+            return False
+        varillas[disco - 1] = fin
+    return varillas == problema.goal.get_disk_pegs()
+
+
+@pytest.mark.parametrize("discos", [3, 5])
+@pytest.mark.parametrize("max_transposiciones", [10 ** 6, 50])
+def test_ida_star_optimo(discos, max_transposiciones):
+    for problema in problemas_aleatorios(discos):
+        solucion, movimientos, _, _ = main.ida_star(problema, main.hanoi_heuristic, max_transposiciones)
+        assert solucion == problema.goal
+        assert len(movimientos) == distancia(problema)
+
+
+def test_ida_star_con_simetria():
+    torre = [5, 4, 3, 2, 1]
+    problema = ProblemHanoi(initial=StatesHanoi(torre, [], [], max_disks=5),
+                            goal=StatesHanoi([], [], torre, max_disks=5), symmetry=True)
+    _, movimientos, _, _ = main.ida_star(problema, main.hanoi_heuristic)
+    assert len(movimientos) == 31
+
+
+@pytest.mark.parametrize("discos", [3, 4])
+def test_sma_star_con_memoria_justa(discos):
+    for problema in problemas_aleatorios(discos, cantidad=8):
+        optimo = distancia(problema)
+        # Con lugar para el camino óptimo la solución es óptima
+        for max_nodes in (max(optimo + 1, 2), optimo + 3, 2 * optimo + 2):
+            solucion, movimientos, _, _ = main.sma_star(problema, main.hanoi_heuristic, max_nodes)
+            assert solucion == problema.goal
+            assert len(movimientos) == optimo
+            assert llega_al_objetivo(problema, movimientos)
+        # Sin lugar para el camino óptimo puede fallar, pero nunca devuelve uno peor
+        for max_nodes in range(2, optimo + 1):
+            solucion, movimientos, _, _ = main.sma_star(problema, main.hanoi_heuristic, max_nodes)
+            assert solucion is None or (len(movimientos) == optimo and llega_al_objetivo(problema, movimientos))
+
+
+@pytest.mark.parametrize("heuristica", [main.hanoi_heuristic, main.hanoi_heuristic_2])
+def test_ara_star_mejora_hasta_el_optimo(heuristica):
+    for problema in problemas_aleatorios(5, cantidad=8):
+        optimo = distancia(problema)
+        soluciones = []
+        solucion, movimientos, _, _ = main.ara_star(problema, heuristica, peso_inicial=5.0, paso_peso=1.0,
+                                                    al_mejorar=lambda movs, cota: soluciones.append((movs, cota)))
+        assert solucion == problema.goal
+        costos = [len(movs) for movs, _ in soluciones]
+        assert costos == sorted(costos, reverse=True)
+        for movs, cota in soluciones:
+            assert llega_al_objetivo(problema, movs)
+            assert optimo <= len(movs) <= cota * optimo + 1e-9
+        assert len(movimientos) == costos[-1] == optimo
+
+
+@pytest.mark.parametrize("discos", [1, 4, 6])
+def test_busqueda_bidireccional_optima(discos):
+    for problema in problemas_aleatorios(discos, cantidad=10):
+        solucion, movimientos, _, _ = main.busqueda_bidireccional(problema)
+        assert solucion == problema.goal
+        assert len(movimientos) == distancia(problema)
+        assert llega_al_objetivo(problema, movimientos)
+
+
+def test_busqueda_bidireccional_estado_inicial_igual_al_objetivo():
+    estado = StatesHanoi([3, 2, 1], [], [], max_disks=3)
+    solucion, movimientos, _, _ = main.busqueda_bidireccional(ProblemHanoi(initial=estado, goal=estado))
+    assert solucion == estado
+    assert movimientos == []
+
+
+@pytest.mark.parametrize("discos", [1, 3, 6])
+def test_bfs_numpy_igual_a_bfs(discos):
+    for problema in problemas_aleatorios(discos, cantidad=10):
+        optimo = distancia(problema)
+        solucion, movimientos, _, expandidos = main.bfs_numpy(problema)
+        assert solucion == problema.goal
+        assert len(movimientos) == optimo
+        assert llega_al_objetivo(problema, movimientos)
+        # Se expanden exactamente las capas anteriores a la del objetivo
+        assert len(expandidos) == sum(capas_bfs(problema)[:optimo])
+
+
+def problemas_con_varillas_libres(discos: int, varillas: int, cantidad: int = 6) -> list:
+    """
+    Problemas cuyo objetivo deja al menos dos varillas vacías, que son las que permite permutar la simetría.
+    """
+    generador = random.Random(discos * varillas)
+    problemas = []
+    for _ in range(cantidad):
+        inicial = StatesHanoi.from_code(generador.randrange(varillas ** discos), discos, number_of_pegs=varillas)
+        ocupadas = generador.sample(range(varillas), varillas - 2)
+        codigo = sum(generador.choice(ocupadas) * varillas ** disco for disco in range(discos))
+        objetivo = StatesHanoi.from_code(codigo, discos, number_of_pegs=varillas)
+        problemas.append((inicial, objetivo))
+    return problemas
+
+
+@pytest.mark.parametrize("motor", [main.a_star, main.ida_star])
+@pytest.mark.parametrize("discos, varillas", [(5, 3), (4, 4)])
+def test_simetria_no_cambia_la_longitud(motor, discos, varillas):
+    for inicial, objetivo in problemas_con_varillas_libres(discos, varillas):
+        longitudes = []
+        for simetria in (False, True):
+            problema = ProblemHanoi(initial=inicial, goal=objetivo, symmetry=simetria)
+            assert problema.symmetry == simetria
+            solucion, movimientos, _, _ = motor(problema, main.hanoi_heuristic)
+            assert solucion == objetivo
+            longitudes.append(len(movimientos))
+        assert longitudes[0] == longitudes[1]
+        if varillas == 3:
+            assert longitudes[0] == optimal_distance(inicial.get_disk_pegs(), objetivo.get_disk_pegs())
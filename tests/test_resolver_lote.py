@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+import resolver_lote
+from aima_libs.hanoi_closed_form import optimal_distance
+
+
+def escribir_problemas(ruta, discos: int = 4) -> list:
+    """
+    Escribe problemas de torre completa, que admiten todos los motores, y devuelve sus distancias óptimas.
+    """
+    torre = list(range(discos, 0, -1))
+    pares = [((0, torre), (2, torre)), ((1, torre), (0, torre)), ((2, torre), (2, torre))]
+    distancias = []
+    with open(ruta, "w") as f:
+        for i, ((inicial, discos_inicial), (objetivo, discos_objetivo)) in enumerate(pares):
+            estado_inicial = {f"peg_{varilla + 1}": discos_inicial if varilla == inicial else [] for varilla in range(3)}
+            estado_objetivo = {f"peg_{varilla + 1}": discos_objetivo if varilla == objetivo else []
+                               for varilla in range(3)}
+            f.write(json.dumps({"id": f"p{i}", "initial": estado_inicial, "goal": estado_objetivo}) + "\n")
+            distancias.append(optimal_distance([inicial] * discos, [objetivo] * discos))
+    return distancias
+
+
+@pytest.mark.parametrize("motor", sorted(resolver_lote.MOTORES))
+def test_lote_con_cada_motor(tmp_path, motor):
+    ruta = tmp_path / "problemas.jsonl"
+    distancias = escribir_problemas(ruta)
+    resultados = list(resolver_lote.resolver_lote(str(ruta), motor, "h1", procesos=2, tamano_bloque=2,
+                                                  secuencia=True))
+    assert [resultado["id"] for resultado in resultados] == ["p0", "p1", "p2"]
+    for resultado, distancia in zip(resultados, distancias):
+        assert "error" not in resultado, resultado
+        assert resultado["movimientos"] == distancia
+        assert len(resultado["secuencia"]) == distancia
+        assert resultado["optimo"]
+        json.dumps(resultado)
+
+
+def test_lineas_que_no_son_objetos(tmp_path):
+    ruta = tmp_path / "problemas.jsonl"
+    escribir_problemas(ruta)
+    with open(ruta, "a") as f:
+        f.write("[1, 2]\n\"x\"\n")
+    resultados = list(resolver_lote.resolver_lote(str(ruta), "cerrada", procesos=1))
+    assert [resultado["id"] for resultado in resultados] == ["p0", "p1", "p2", 4, 5]
+    assert all(resultado["error"] == "not an object" for resultado in resultados[3:])
+
+
+def test_falla_del_motor_no_corta_el_lote(tmp_path, monkeypatch):
+    ruta = tmp_path / "problemas.jsonl"
+    escribir_problemas(ruta)
+
+    def motor_roto(problema, heuristica):
+        raise RuntimeError("motor roto")
+
+    resolver_lote.inicializar_proceso("a_star", "h1", None)
+    monkeypatch.setattr(resolver_lote, "_motor", motor_roto)
+    resultados = [resolver_lote.resolver(identificador, datos, False)
+                  for identificador, datos, _ in resolver_lote.leer_problemas(str(ruta))]
+    assert [resultado["error"] for resultado in resultados] == ["RuntimeError: motor roto"] * 3
+
+
+@pytest.mark.parametrize("motor", sorted(resolver_lote.SIN_HEURISTICA))
+def test_motores_sin_heuristica_no_construyen_el_evaluador(tmp_path, monkeypatch, motor):
+    ruta = tmp_path / "problemas.jsonl"
+    distancias = escribir_problemas(ruta)
+
+    def evaluador_para(*args):
+        raise AssertionError("no debería construirse el evaluador")
+
+    resolver_lote.inicializar_proceso(motor, "pdb", None)
+    monkeypatch.setattr(resolver_lote, "evaluador_para", evaluador_para)
+    resultados = [resolver_lote.resolver(identificador, datos, False)
+                  for identificador, datos, _ in resolver_lote.leer_problemas(str(ruta))]
+    assert [resultado["movimientos"] for resultado in resultados] == distancias
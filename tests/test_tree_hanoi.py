@@ -0,0 +1,18 @@
+from aima_libs.hanoi_states import ProblemHanoi, StatesHanoi
+from aima_libs.tree_hanoi import NodePool
+
+
+def test_leer_una_vista_no_la_agrega_al_arbol():
+    problem = ProblemHanoi(initial=StatesHanoi([3, 2, 1], [], [], max_disks=3),
+                           goal=StatesHanoi([], [], [3, 2, 1], max_disks=3))
+    pool = NodePool(3, 3)
+    raiz = pool.root(problem.initial)
+    hijos = raiz.expand(problem)
+    nietos = hijos[0].expand(problem)
+    tamano = len(pool)
+    assert [nieto.depth for nieto in nietos] == [2] * len(nietos)
+    assert [(nieto.path_cost, nieto.action, nieto.state) for nieto in nietos]
+    assert [hijo.depth for hijo in hijos[1:]] == [1] * (len(hijos) - 1)
+    assert len(pool) == tamano
+    assert nietos[0].index == tamano
+    assert len(pool) == tamano + 1